@@ -1,376 +1,228 @@
 # -*- coding: utf-8 -*-
 """
-Streamlit 八字排盘（完整单文件）
+Streamlit 八字排盘（界面；计算核心见 bazi 包）
 - 月份手动输入（数字）
 - 出生时分精确到分钟，支持“时辰未知”
 - 日柱使用锚点法（anchor）计算（1984-01-01 甲午）
 - 时柱默认使用你提供的五鼠遁规则；可启用 sxtwl（若安装）做对比或覆盖
-- 恢复并使用吉凶计算（天干地支合/冲、双合进一/双冲退一）
+- 恢复并使用吉凶计算（天干地支合/冲、双合进一/双冲退一）；可切换吉凶规则集（戊己冲、三合三会等流派，见 bazi.rules）
+- 群体统计：上传 CSV / JSONL，逐块流式统计（进度条），结果可下载（见 bazi.cohort）
+- 每次交互 Streamlit 都会重跑本脚本：排盘、吉凶、农历转换等按输入用 st.cache_data 缓存，
+  输入不变时不再重算；sxtwl 适配器为进程内单例，首次渲染后由后台预热线程加载（st.cache_resource 保证只启动一次）
 """
 import datetime
-from datetime import date, timedelta
+import io
+import json
+import os
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
 import streamlit as st
 
-# 尝试导入 sxtwl（兼容不同实现），但不依赖于它的特定类名
-try:
-    import sxtwl
-    HAVE_SXTWL = True
-except Exception:
-    sxtwl = None
-    HAVE_SXTWL = False
-
-# ---------- 干支基础数据 ----------
-tiangan = ["甲","乙","丙","丁","戊","己","庚","辛","壬","癸"]
-dizhi = ["子","丑","寅","卯","辰","巳","午","未","申","酉","戌","亥"]
-GZS_LIST = [tiangan[i%10] + dizhi[i%12] for i in range(60)]
-
-# 天干合（五合）
-gan_he = {"甲":"己","己":"甲","乙":"庚","庚":"乙","丙":"辛","辛":"丙","丁":"壬","壬":"丁","戊":"癸","癸":"戊"}
-# 仅四冲（用户要求，去掉戊己）
-gan_chong = {"甲":"庚","庚":"甲","乙":"辛","辛":"乙","丙":"壬","壬":"丙","丁":"癸","癸":"丁"}
-# 地支合（六合）
-zhi_he = {"子":"丑","丑":"子","寅":"亥","亥":"寅","卯":"戌","戌":"卯","辰":"酉","酉":"辰","巳":"申","申":"巳","午":"未","未":"午"}
-# 地支冲（对冲）
-zhi_chong = {dz: dizhi[(i+6)%12] for i, dz in enumerate(dizhi)}
-
-def zhi_next(z): return dizhi[(dizhi.index(z)+1)%12]
-def zhi_prev(z): return dizhi[(dizhi.index(z)-1)%12]
-
-def year_ganzhi_map(start=1900, end=2100):
-    base_year = 1984
-    return {y: GZS_LIST[(y-base_year)%60] for y in range(start, end+1)}
-
-# ---------- 吉凶计算（保持你原规则） ----------
-def calc_jixiong(gz):
-    if not gz or len(gz) < 2:
-        return {"吉": [], "凶": []}
-    tg, dz = gz[0], gz[1]
-    res = {"吉": [], "凶": []}
-    tg_he = gan_he.get(tg, ""); dz_he = zhi_he.get(dz, "")
-    tg_ch = gan_chong.get(tg, ""); dz_ch = zhi_chong.get(dz, "")
-    if tg_he and dz_he:
-        res["吉"].append(tg_he + dz_he)
-        res["吉"].append(tg_he + zhi_next(dz_he))
-    if tg_ch and dz_ch:
-        res["凶"].append(tg_ch + dz_ch)
-        res["凶"].append(tg_ch + zhi_prev(dz_ch))
-    return res
-
-def analyze_bazi(nianzhu, yuezhu, rizhu, shizhu):
-    pillars = [p for p in (nianzhu, yuezhu, rizhu) if p]
-    if shizhu and str(shizhu).strip() and str(shizhu).strip() != "不知道":
-        pillars.append(shizhu)
-    all_ji = []
-    all_xiong = []
-    for p in pillars:
-        r = calc_jixiong(p)
-        all_ji.extend(r["吉"]); all_xiong.extend(r["凶"])
-    # 去重但保序
-    seen = set()
-    ji = []
-    for s in all_ji:
-        if s not in seen:
-            seen.add(s); ji.append(s)
-    seen = set()
-    xiong = []
-    for s in all_xiong:
-        if s not in seen:
-            seen.add(s); xiong.append(s)
-    return ji, xiong
-
-# ---------- 日柱（锚点法） ----------
-ANCHOR_DATE = date(1984,1,1)
-ANCHOR_GZ = "甲午"
-ANCHOR_INDEX = GZS_LIST.index(ANCHOR_GZ)
-
-def day_ganzhi_by_anchor(y, m, d, hour=None, minute=None):
-    # 23:00 及以后归入次日
-    if hour is not None and hour >= 23:
-        target = date(y,m,d) + timedelta(days=1)
-    else:
-        target = date(y,m,d)
-    delta = (target - ANCHOR_DATE).days
-    idx = (ANCHOR_INDEX + delta) % 60
-    return GZS_LIST[idx]
-
-# ---------- 月柱（手动输入优先 / 否则近似节气分月 + 五虎遁） ----------
-# 五虎遁起始天干（寅月起点）
-def month_stem_by_fihu_dun(year_tg, month_branch):
-    if year_tg in ("甲","己"): start = "丙"
-    elif year_tg in ("乙","庚"): start = "戊"
-    elif year_tg in ("丙","辛"): start = "庚"
-    elif year_tg in ("丁","壬"): start = "壬"
-    elif year_tg in ("戊","癸"): start = "甲"
-    else: start = "丙"
-    start_idx = tiangan.index(start)
-    offset = (dizhi.index(month_branch) - dizhi.index("寅")) % 12
-    stem_idx = (start_idx + offset) % 10
-    return tiangan[stem_idx] + month_branch
-
-APPROX_JIEQI = {
-    "立春": (2,4), "惊蛰": (3,6), "清明": (4,5), "立夏": (5,6),
-    "芒种": (6,6), "小暑": (7,7), "立秋": (8,7), "白露": (9,7),
-    "寒露": (10,8), "立冬": (11,7), "大雪": (12,7), "小寒": (1,6)
-}
-def get_month_branch_approx(year, month, day):
-    bd = date(year, month, day)
-    keys = ["立春","惊蛰","清明","立夏","芒种","小暑","立秋","白露","寒露","立冬","大雪","小寒"]
-    seq=[]
-    for k in keys:
-        m,d = APPROX_JIEQI[k]
-        yr = year if not (k=="小寒" and m==1) else year+1
-        seq.append((k, date(yr,m,d)))
-    for i in range(len(seq)):
-        s = seq[i][1]
-        e = seq[i+1][1] if i+1 < len(seq) else seq[0][1].replace(year=seq[0][1].year+1)
-        if s <= bd < e:
-            return ["寅","卯","辰","巳","午","未","申","酉","戌","亥","子","丑"][i]
-    return dizhi[(month+10)%12]
-
-# ---------- 时柱（分钟精确） 五鼠遁规则 ----------
-# 时辰地支区间（采用说明中的区间）
-# 子时：23:00-00:59, 丑:01:00-02:59, 寅:03:00-04:59 ... 以此类推
-def get_hour_branch_by_minute(hour, minute):
-    if hour is None:
-        return None
-    tot = hour*60 + (minute or 0)
-    # 子时：23:00-23:59 and 0:00-0:59 => we map these to index 0
-    if tot >= 23*60 or tot < 1*60:
-        return "子", 0
-    # else compute ((tot - 60) // 120) -> 0..11 mapping to 丑..亥? We'll just build boundaries:
-    intervals = [
-        (1*60, 3*60, "丑"),
-        (3*60, 5*60, "寅"),
-        (5*60, 7*60, "卯"),
-        (7*60, 9*60, "辰"),
-        (9*60, 11*60, "巳"),
-        (11*60, 13*60, "午"),
-        (13*60, 15*60, "未"),
-        (15*60, 17*60, "申"),
-        (17*60, 19*60, "酉"),
-        (19*60, 21*60, "戌"),
-        (21*60, 23*60, "亥"),
-    ]
-    for i, (s,e,name) in enumerate(intervals):
-        if s <= tot < e:
-            return name, i+1  # i+1 because 0 reserved for 子
-    return "子", 0
-
-def time_ganzhi_by_rule(day_gz, hour, minute):
-    if hour is None:
-        return "不知道"
-    branch, idx = get_hour_branch_by_minute(hour, minute)
-    # day_gz is like '丙午', day_gan = day_gz[0]
-    day_gan = day_gz[0]
-    # 起始映射（五鼠遁）
-    if day_gan in ("甲","己"): start = tiangan.index("甲")
-    elif day_gan in ("乙","庚"): start = tiangan.index("丙")
-    elif day_gan in ("丙","辛"): start = tiangan.index("戊")
-    elif day_gan in ("丁","壬"): start = tiangan.index("庚")
-    elif day_gan in ("戊","癸"): start = tiangan.index("壬")
-    else: start = 0
-    tg_idx = (start + idx) % 10
-    return tiangan[tg_idx] + branch
-
-# ---------- sxtwl 兼容性包装（尽力尝试多种api） ----------
-def try_sxtwl_from_solar(y,m,d):
-    """尝试用 sxtwl 提取 dayobj（返回 None 则不可用）"""
-    if not HAVE_SXTWL:
-        return None
-    # 尝试常见接口 fromSolar
-    try:
-        if hasattr(sxtwl, "fromSolar"):
-            return sxtwl.fromSolar(int(y), int(m), int(d))
-    except Exception:
-        pass
-    # 尝试 Calendar().getLunarBySolar 或 getDayBySolar
-    try:
-        if hasattr(sxtwl, "Calendar"):
-            cal = sxtwl.Calendar()
-            # some sxtwl have iterYearDays or getDayBySolar
-            if hasattr(cal, "getDayBySolar"):
-                try:
-                    return cal.getDayBySolar(sxtwl.Solar(int(y), int(m), int(d)))
-                except Exception:
-                    pass
-            if hasattr(cal, "getLunarBySolar"):
-                try:
-                    return cal.getLunarBySolar(sxtwl.Solar(int(y), int(m), int(d)))
-                except Exception:
-                    pass
-    except Exception:
-        pass
-    return None
-
-def extract_gz_from_dayobj_day(dayobj):
-    """从 dayobj 尝试提取 year/month/day gz（返回 tuple 或 (None,None,None)）"""
-    if dayobj is None:
-        return None, None, None
-    # 尝试 getYearGZ/getMonthGZ/getDayGZ
-    def get_gz(fn):
-        try:
-            val = fn()
-            # val 有可能是对象有 .tg/.dz，也可能是 tuple/list
-            if hasattr(val, "tg") and hasattr(val, "dz"):
-                return tiangan[int(val.tg)] + dizhi[int(val.dz)]
-            elif isinstance(val, (list,tuple)) and len(val) >= 2:
-                return tiangan[int(val[0])] + dizhi[int(val[1])]
-        except Exception:
-            pass
-        return None
-    yg = get_gz(getattr(dayobj, "getYearGZ", lambda: None))
-    mg = get_gz(getattr(dayobj, "getMonthGZ", lambda: None))
-    dg = get_gz(getattr(dayobj, "getDayGZ", lambda: None))
-    return yg, mg, dg
-
-def extract_hour_from_dayobj(dayobj, hour):
-    """尝试从 dayobj 中提取时柱，返回字符串或 None"""
-    if dayobj is None:
-        return None
-    # 尝试 dayobj.getHourGZ(hour)
-    try:
-        if hasattr(dayobj, "getHourGZ"):
-            val = dayobj.getHourGZ(int(hour))
-            if hasattr(val, "tg") and hasattr(val, "dz"):
-                return tiangan[int(val.tg)] + dizhi[int(val.dz)]
-            elif isinstance(val, (list,tuple)) and len(val) >=2:
-                return tiangan[int(val[0])] + dizhi[int(val[1])]
-    except Exception:
-        pass
-    # 尝试 sxtwl.getShiGz (some libs)
-    try:
-        if hasattr(sxtwl, "getShiGz"):
-            # need day_tg index
-            try:
-                daygz = extract_gz_from_dayobj_day(dayobj)[2]
-                if daygz:
-                    day_tg_idx = tiangan.index(daygz[0])
-                    val = sxtwl.getShiGz(day_tg_idx, int(hour))
-                    if hasattr(val, "tg") and hasattr(val, "dz"):
-                        return tiangan[int(val.tg)] + dizhi[int(val.dz)]
-                    elif isinstance(val, (list,tuple)) and len(val)>=2:
-                        return tiangan[int(val[0])] + dizhi[int(val[1])]
-            except Exception:
-                pass
-    except Exception:
-        pass
-    return None
-
-# ---------- 合并推算流程 ----------
-def calc_bazi(year, month, day, hour=None, minute=None, manual_month_branch=None, use_sxtwl_for_compare=False, prefer_sxtwl=False):
-    """
-    返回 dict:
-    {
-      "year": year_pillar,
-      "month": month_pillar,
-      "day": day_pillar,           # 默认使用锚点法（anchor）
-      "hour": hour_pillar,         # 默认使用规则（五鼠遁），但如果 prefer_sxtwl=True 且 sxtwl可用会覆盖
-      "sxtwl": {"year":..., "month":..., "day":..., "hour":...}  # 若能从sxtwl提取
-      "source": "anchor/approx/sxtwl"  # 简单说明
-    }
-    """
-    res = {"year": None, "month": None, "day": None, "hour": None, "sxtwl": {}, "source": ""}
-    # 1) 日柱：采用锚点法（用户要求）
-    day_p = day_ganzhi_by_anchor(year, month, day, hour, minute)
-    res["day"] = day_p
-
-    # 2) 通过 sxtwl 尝试获取年/月/日/时（用于对比或覆盖）
-    s_dayobj = try_sxtwl_from_solar(year, month, day)
-    s_year = s_month = s_day = s_hour = None
-    if s_dayobj is not None:
-        yg, mg, dg = extract_gz_from_dayobj_day(s_dayobj)
-        s_year, s_month, s_day = yg, mg, dg
-        if hour is not None and hour >= 0:
-            s_hour = extract_hour_from_dayobj(s_dayobj, hour)
-        res["sxtwl"] = {"year": s_year, "month": s_month, "day": s_day, "hour": s_hour}
-    # 3) 年柱、月柱：如果用户手动指定月支（地支），用五虎遁确定月柱；否则优先使用 sxtwl（若有），否则近似
-    # 年柱
-    if s_year:
-        year_p = s_year
-        res["source"] += "sxtwl_year;"
-    else:
-        # 近似年柱，以立春 2/4 作为边界（fallback）
-        birth_dt = datetime.datetime(year, month, day, hour or 0, minute or 0)
-        lichun = datetime.datetime(year, 2, 4, 0, 0)
-        adj_year = year if birth_dt >= lichun else year - 1
-        year_p = GZS_LIST[(adj_year - 1984) % 60]
-        res["source"] += "approx_year;"
-    res["year"] = year_p
-
-    # 月柱
-    if manual_month_branch:
-        month_p = month_stem_by_fihu_dun(res["year"][0], manual_month_branch)
-        res["source"] += "manual_month;"
-    else:
-        if s_month:
-            month_p = s_month
-            res["source"] += "sxtwl_month;"
+from bazi import HAVE_SXTWL, YEAR_RANGE, ganzhi_years, analyze_bazi, calc_bazi, lunar_to_solar
+from bazi import GZS_LIST, mask_of, metrics
+from bazi.rules import available as available_rules
+from bazi.sxtwl_adapter import loaded_adapter
+from bazi.warmup import warm_up
+
+REVERSE_LIMIT = 200  # 反查结果最多显示条数
+CALENDAR_YEARS = 50  # 吉凶月日历覆盖的年数
+CACHE_ENTRIES = 4096  # 每个 cache_data 函数保留的输入组合数
+COHORT_CHUNK = 2000  # 群体统计每块记录数（每块更新一次进度条）
+# 调试面板只在部署方显式开启时显示（环境变量 BAZI_DEBUG_PANEL=1）；面板只读，不改进程级状态
+DEBUG_PANEL = os.environ.get("BAZI_DEBUG_PANEL", "").strip().lower() in ("1", "true", "yes", "on")
+
+# ---------- 缓存（所有会话共享） ----------
+@st.cache_resource
+def _start_warm_up():
+    """页面首次渲染后在后台导入 sxtwl、算当年节气、导入日历 / 反查模块（numpy），首个查询不必等待"""
+    return warm_up(modules=("bazi.almanac", "bazi.reverse"))
+
+@st.cache_resource
+def _cache_counts():
+    """调试面板用：各缓存函数的调用次数与实际计算（未命中）次数；同时登记为指标导出项"""
+    counts = {"calls": Counter(), "misses": Counter()}
+    metrics.register_collector("streamlit_cache", lambda: {
+        f"{name}_{kind}": n for kind in ("calls", "misses") for name, n in counts[kind].items()})
+    return counts
+
+_COUNTS = _cache_counts()
+
+def _tracked(name, cached):
+    """包一层 cache_data 函数，统计调用次数；未命中次数由函数体内 _COUNTS["misses"] 统计"""
+    def call(*args):
+        _COUNTS["calls"][name] += 1
+        return cached(*args)
+    return call
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _calc_bazi_cached(y, m, d, hour, minute, manual_branch, compare, prefer, longitude=None, tz=None):
+    _COUNTS["misses"]["calc_bazi"] += 1
+    return calc_bazi(y, m, d, hour=hour, minute=minute, manual_month_branch=manual_branch,
+                     use_sxtwl_for_compare=compare, prefer_sxtwl=prefer, longitude=longitude, tz=tz)
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _analyze_bazi_cached(y, m, d, h, rules):
+    _COUNTS["misses"]["analyze_bazi"] += 1
+    return analyze_bazi(y, m, d, h, rules=rules)
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _lunar_to_solar_cached(y, m, d, leap):
+    _COUNTS["misses"]["lunar_to_solar"] += 1
+    return lunar_to_solar(y, m, d, leap)
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _calendar_cached(ji_mask, xiong_mask, years, today):
+    """吉凶月列表与第一页（一年）吉凶日；today 参与缓存键，日期变化后自动重算"""
+    _COUNTS["misses"]["calendar"] += 1
+    from bazi.almanac import chart_calendar  # 连带导入 numpy，用到时才导入
+    cal = chart_calendar(ji_mask, xiong_mask, start=today, years=years)
+    return cal["months"], next(cal["days"], None)
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _reverse_cached(y, m, d, h, limit):
+    _COUNTS["misses"]["find_birth_times"] += 1
+    from bazi.reverse import find_birth_times
+    return list(islice(find_birth_times(y, m, d, h), limit))
+
+cached_calc_bazi = _tracked("calc_bazi", _calc_bazi_cached)
+cached_analyze_bazi = _tracked("analyze_bazi", _analyze_bazi_cached)
+cached_lunar_to_solar = _tracked("lunar_to_solar", _lunar_to_solar_cached)
+cached_calendar = _tracked("calendar", _calendar_cached)
+cached_reverse = _tracked("find_birth_times", _reverse_cached)
+
+def show_cache_panel():
+    """侧栏调试面板：各缓存命中率，以及 sxtwl 适配器的按日缓存"""
+    with st.sidebar.expander("🛠 缓存命中率（调试）"):
+        rows = []
+        for name, calls in sorted(_COUNTS["calls"].items()):
+            misses = min(_COUNTS["misses"][name], calls)
+            rows.append({"函数": name, "调用": calls, "计算": misses,
+                         "命中率": f"{(calls - misses) / calls:.1%}" if calls else "-"})
+        if rows:
+            st.table(rows)
+        else:
+            st.caption("暂无调用")
+        adapter = loaded_adapter()  # 只看已加载的，不为调试面板导入 sxtwl
+        if adapter is not None:
+            c = adapter.cache_stats()
+            st.caption(f"sxtwl 按日缓存：命中 {c['hits']}，未命中 {c['misses']}，"
+                       f"{c['size']}/{c['maxsize']} 条，命中率 {c['hit_rate']:.1%}")
+        # 指标为进程级开关，只由部署方用环境变量 BAZI_METRICS=1 开启，不在会话里切换
+        if not metrics.ENABLED:
+            st.caption("分阶段计时 / 计数未开启（启动前设置环境变量 BAZI_METRICS=1）")
         else:
-            # 近似月支 -> 五虎遁
-            mb = get_month_branch_approx(year, month, day)
-            month_p = month_stem_by_fihu_dun(res["year"][0], mb)
-            res["source"] += "approx_month;"
-    res["month"] = month_p
-
-    # 时柱：默认用五鼠遁规则
-    hour_p_rule = None
-    if hour is None or hour < 0:
-        hour_p_rule = "不知道"
-    else:
-        hour_p_rule = time_ganzhi_by_rule(res["day"], hour, minute or 0)
-    res["hour_rule"] = hour_p_rule
-
-    # sxtwl hour available?
-    hour_p_sxtwl = res["sxtwl"].get("hour") if res.get("sxtwl") else None
-
-    # 决定最终时柱：优先规则（默认）；若 prefer_sxtwl True 并 sxtwl可用则覆盖
-    if prefer_sxtwl and hour_p_sxtwl:
-        res["hour"] = hour_p_sxtwl
-        res["source"] += "sxtwl_hour_used;"
-    else:
-        res["hour"] = hour_p_rule
-        res["source"] += "rule_hour_used;"
-
-    # 日柱：我们以锚点法为主；如果 sxtwl 可用并用户要求对比，则会在界面展示
-    res["sxtwl_day"] = res["sxtwl"].get("day")
-    return res
+            st.code(metrics.to_prometheus(), language="text")
+            st.download_button("下载指标 JSON", metrics.to_json(indent=2), file_name="bazi_metrics.json",
+                               mime="application/json")
 
 # ---------- 输出：漂亮的吉凶显示 ----------
-def show_result_beauty(ji_list, xiong_list):
-    year_map = year_ganzhi_map(1900,2100)
+def _show_years(gz_list, color, background, start, end, cur):
+    for gz in gz_list:
+        years = ganzhi_years(gz, start, end)
+        if not years: continue
+        # 年份升序，二分找到第一个未来年份，其后全部加星
+        i = bisect_left(years, cur)
+        parts = [f"{gz}{y}年" for y in years[:i]] + [f"**{gz}{y}年 ★**" for y in years[i:]]
+        st.markdown(f"<div style='color:{color};padding:6px;border-left:4px solid {color};background:{background}'>{gz}: {'，'.join(parts)}</div>", unsafe_allow_html=True)
+
+def show_result_beauty(ji_list, xiong_list, start=YEAR_RANGE[0], end=YEAR_RANGE[1]):
     cur = datetime.datetime.now().year
     color_good = "#c21807"  # 红
     color_bad = "#333333"   # 深灰
-    st.markdown("### 🎉 吉年")
-    if not ji_list:
-        st.info("无吉年（按当前规则）")
-    else:
-        for gz in ji_list:
-            years = [y for y,g in year_map.items() if g == gz]
-            if not years: continue
-            years.sort()
-            parts=[]
-            for y in years:
-                s = f"{gz}{y}年"
-                if y >= cur:
-                    s = f"**{s} ★**"
-                parts.append(s)
-            st.markdown(f"<div style='color:{color_good};padding:6px;border-left:4px solid {color_good};background:#fff5f5'>{gz}: {'，'.join(parts)}</div>", unsafe_allow_html=True)
-    st.markdown("### ☠️ 凶年")
-    if not xiong_list:
-        st.info("无凶年（按当前规则）")
-    else:
-        for gz in xiong_list:
-            years = [y for y,g in year_map.items() if g == gz]
-            if not years: continue
-            years.sort()
-            parts=[]
-            for y in years:
-                s = f"{gz}{y}年"
-                if y >= cur:
-                    s = f"**{s} ★**"
-                parts.append(s)
-            st.markdown(f"<div style='color:{color_bad};padding:6px;border-left:4px solid {color_bad};background:#fbfbfb'>{gz}: {'，'.join(parts)}</div>", unsafe_allow_html=True)
+    with metrics.timer("render.years"):
+        st.markdown("### 🎉 吉年")
+        if not ji_list:
+            st.info("无吉年（按当前规则）")
+        else:
+            _show_years(ji_list, color_good, "#fff5f5", start, end, cur)
+        st.markdown("### ☠️ 凶年")
+        if not xiong_list:
+            st.info("无凶年（按当前规则）")
+        else:
+            _show_years(xiong_list, color_bad, "#fbfbfb", start, end, cur)
+    with metrics.timer("render.calendar"):
+        _show_calendar(ji_list, xiong_list)
+
+def _show_calendar(ji_list, xiong_list, years=CALENDAR_YEARS):
+    """未来若干年的吉凶月（节气月）与吉凶日；逐日结果只渲染第一页（一年）"""
+    ji_mask, xiong_mask = mask_of(ji_list), mask_of(xiong_list)
+    if not (ji_mask or xiong_mask):
+        return
+    months, page = cached_calendar(ji_mask, xiong_mask, years, datetime.date.today())
+    with st.expander(f"📅 未来 {years} 年吉凶月、吉凶日"):
+        st.markdown("#### 吉凶月（按节气交节时刻）")
+        rows = [f"- {m.start:%Y-%m-%d %H:%M} ~ {m.end:%Y-%m-%d %H:%M} {m.ganzhi}月（{'吉' if m.ji else ''}{'凶' if m.xiong else ''}）" for m in months]
+        st.markdown("\n".join(rows) if rows else "无")
+        st.markdown("#### 近一年吉凶日")
+        if page is None or not len(page["date"]):
+            st.markdown("无")
+        else:
+            st.markdown("\n".join(
+                f"- {d} {GZS_LIST[g]}日（{'吉' if j else ''}{'凶' if x else ''}）"
+                for d, g, j, x in zip(page["date"].tolist(), page["ganzhi"].tolist(), page["ji"].tolist(), page["xiong"].tolist())))
+
+# ---------- 群体统计（上传文件） ----------
+def _run_cohort(upload, rules):
+    """逐块统计上传的文件，进度条按已读字节推进；只保留汇总，不保留逐条结果"""
+    from bazi.batch import iter_records
+    from bazi.cohort import CohortSummary, iter_summaries
+    fmt = "jsonl" if upload.name.endswith((".jsonl", ".json", ".ndjson")) else "csv"
+    upload.seek(0)
+    fp = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    size = upload.size or 1
+    bar = st.progress(0.0, text="准备中……")
+    summary = CohortSummary(rules)
+    try:
+        with metrics.timer("render.cohort"):
+            for summary, done in iter_summaries(iter_records(fp, fmt), chunk_size=COHORT_CHUNK,
+                                                table_path=os.environ.get("BAZI_DAYTABLE"), rules=rules):
+                bar.progress(min(upload.tell() / size, 1.0), text=f"已处理 {done} 条")
+    finally:
+        fp.detach()  # 不随包装对象关闭上传文件，重跑时还能再读
+    bar.progress(1.0, text=f"完成：{summary.total} 条，出错 {summary.errors} 条")
+    return summary
+
+def show_true_solar(result):
+    if result.get("true_solar"):
+        st.write(f"真太阳时：{result['true_solar']}（日柱、时柱按此计算；年柱、月柱按换算到北京时间的交节时刻）")
+
+def show_cohort_page(rules):
+    st.markdown("上传出生记录 CSV / JSONL（字段同 `python -m bazi.batch`：calendar、year、month、day、hour、minute……），"
+                "按块流式统计四柱与吉凶分布，不保留逐条结果。")
+    upload = st.file_uploader("出生记录文件", type=["csv", "jsonl", "json", "ndjson"])
+    cur = datetime.date.today().year
+    start, end = st.slider("逐年命中统计的年份范围", YEAR_RANGE[0], YEAR_RANGE[1], (cur, min(cur + 50, YEAR_RANGE[1])))
+    if upload is not None and st.button("开始统计"):
+        try:
+            summary = _run_cohort(upload, rules)
+        except Exception as e:
+            metrics.incr("errors", stage="cohort", type=type(e).__name__)
+            st.error(f"统计出错：{e}")
+            return
+        # 存入会话：点击下载按钮会重跑脚本，结果不必重算
+        st.session_state["cohort"] = (upload.name, summary)
+    saved = st.session_state.get("cohort")
+    if not saved:
+        return
+    name, summary = saved
+    st.markdown(f"### 统计结果：{name}（规则：{summary.rules or 'default'}）")
+    st.write(f"有效 {summary.total} 条，出错 {summary.errors} 条，时辰未知 {summary.hour_unknown} 条")
+    if not summary.total:
+        return
+    import pandas as pd  # streamlit 自带依赖
+    st.markdown("#### 各干支为吉 / 凶的人数占比")
+    st.bar_chart(pd.DataFrame({"吉": [n / summary.total for n in summary.ji],
+                               "凶": [n / summary.total for n in summary.xiong]}, index=GZS_LIST))
+    rows = summary.year_hits(start, end)
+    st.markdown(f"#### {start}-{end} 凶人数最多的年份")
+    st.table([{"年份": y, "干支": gz, "吉人数": j, "凶人数": x, "凶占比": f"{x / summary.total:.1%}"}
+              for y, gz, j, x in summary.top_years(start, end, "xiong")])
+    st.download_button("下载汇总 JSON", json.dumps(summary.to_dict((start, end)), ensure_ascii=False, indent=2),
+                       file_name="cohort_summary.json", mime="application/json")
+    st.download_button("下载六十甲子分布 CSV", summary.to_csv(), file_name="cohort_ganzhi.csv", mime="text/csv")
+    st.download_button("下载逐年命中 CSV", "year,ganzhi,ji,xiong\n" + "".join(f"{y},{gz},{j},{x}\n" for y, gz, j, x in rows),
+                       file_name="cohort_years.csv", mime="text/csv")
 
 # ---------- Streamlit UI ----------
 st.set_page_config(page_title="八字排盘（精确分钟、锚点日法）", layout="centered")
@@ -378,7 +230,9 @@ st.title("八字排盘与吉凶年份查询（中文）")
 
 st.markdown("说明：日柱采用锚点法（1984-01-01 甲午）计算；月可手动指定地支（如你信任人工月支），时柱默认用五鼠遁规则（分钟精确）。可选用本地 sxtwl（若安装）做对比或覆盖时柱。")
 
-mode = st.selectbox("输入方式", ["阳历生日", "农历生日", "四柱八字（手动）"])
+mode = st.selectbox("输入方式", ["阳历生日", "农历生日", "四柱八字（手动）", "群体统计（上传文件）"])
+RULE_LABELS = dict(available_rules())
+rules_name = st.selectbox("吉凶规则", list(RULE_LABELS), format_func=RULE_LABELS.get)
 
 use_sxtwl_compare = False
 prefer_sxtwl_hour = False
@@ -387,6 +241,16 @@ if HAVE_SXTWL:
     if use_sxtwl_compare:
         prefer_sxtwl_hour = st.checkbox("当 sxtwl 与规则冲突时，是否以 sxtwl 时柱为准？（否则以规则为准）", value=False)
 
+birth_lon = birth_tz = None
+if mode in ("阳历生日", "农历生日") and st.checkbox("按出生地真太阳时定日柱、时柱（需填经度）", value=False):
+    pc1, pc2 = st.columns(2)
+    with pc1:
+        birth_lon = st.number_input("出生地经度（东经为正，西经为负）", min_value=-180.0, max_value=180.0,
+                                    value=116.4, step=0.1, format="%.2f")
+    with pc2:
+        birth_tz = st.number_input("出生时钟表所用时区（UTC+，北京时间为 8）", min_value=-12.0, max_value=14.0,
+                                   value=8.0, step=0.5)
+
 if mode == "阳历生日":
     col1, col2 = st.columns([2,1])
     with col1:
@@ -410,11 +274,11 @@ if mode == "阳历生日":
         hour_val = None if bhour == -1 else int(bhour)
         min_val = None if bhour == -1 else int(bmin)
         try:
-            result = calc_bazi(int(byear), int(bmonth), int(bday), hour=hour_val, minute=min_val,
-                               manual_month_branch=manual_branch, use_sxtwl_for_compare=use_sxtwl_compare,
-                               prefer_sxtwl=prefer_sxtwl_hour)
+            result = cached_calc_bazi(int(byear), int(bmonth), int(bday), hour_val, min_val,
+                                      manual_branch, use_sxtwl_compare, prefer_sxtwl_hour, birth_lon, birth_tz)
             # 展示结果
             st.markdown("## 推算结果（四柱）")
+            show_true_solar(result)
             st.write(f"年柱：{result['year']} ； 月柱：{result['month']} ； 日柱（锚点法）：{result['day']} ； 时柱：{result['hour']}")
             # 若 sxtwl 有结果并启用对比，显示对比
             if use_sxtwl_compare and result.get("sxtwl"):
@@ -425,10 +289,11 @@ if mode == "阳历生日":
                     if s.get("day") and s.get("day") != result["day"]:
                         st.warning(f"注：sxtwl 日柱为{s.get('day')}，但程序当前以锚点法日柱 {result['day']} 为主。")
             # 吉凶
-            ji, xiong = analyze_bazi(result["year"], result["month"], result["day"], result["hour"])
+            ji, xiong = cached_analyze_bazi(result["year"], result["month"], result["day"], result["hour"], rules_name)
             st.markdown("---")
             show_result_beauty(ji, xiong)
         except Exception as e:
+            metrics.incr("errors", stage="solar_mode", type=type(e).__name__)
             st.error(f"计算出错：{e}")
 
 elif mode == "农历生日":
@@ -455,37 +320,14 @@ elif mode == "农历生日":
         hour_val = None if bhour == -1 else int(bhour)
         min_val = None if bhour == -1 else int(bmin)
         try:
-            # 将农历转公历：优先使用 sxtwl.fromLunar（若可用），否则使用 lunarcalendar 作为后备
-            solar_y = solar_m = solar_d = None
-            if HAVE_SXTWL:
-                try:
-                    if hasattr(sxtwl, "fromLunar"):
-                        try:
-                            dayobj = sxtwl.fromLunar(int(ly), int(lm), int(ld), bool(isleap))
-                        except TypeError:
-                            dayobj = sxtwl.fromLunar(int(ly), int(lm), int(ld))
-                        # try to extract solar via dayobj.getSolar() or attributes
-                        try:
-                            solar = getattr(dayobj, "getSolar", None)
-                            if callable(solar):
-                                s = dayobj.getSolar()
-                                solar_y, solar_m, solar_d = s.getYear(), s.getMonth(), s.getDay()
-                        except Exception:
-                            solar_y = solar_m = solar_d = None
-                except Exception:
-                    solar_y = solar_m = solar_d = None
-            if solar_y is None:
-                # fallback: use lunarcalendar Converter
-                from lunarcalendar import Converter, Solar, Lunar
-                lunar_obj = Lunar(int(ly), int(lm), int(ld), bool(isleap))
-                solar = Converter.Lunar2Solar(lunar_obj)
-                solar_y, solar_m, solar_d = solar.year, solar.month, solar.day
-
-            result = calc_bazi(solar_y, solar_m, solar_d, hour=hour_val, minute=min_val,
-                               manual_month_branch=manual_branch, use_sxtwl_for_compare=use_sxtwl_compare,
-                               prefer_sxtwl=prefer_sxtwl_hour)
+            # 将农历转公历：农历 1900-2100 查内置表（bazi.lunar），表外才退回 sxtwl / lunarcalendar
+            solar_y, solar_m, solar_d = cached_lunar_to_solar(int(ly), int(lm), int(ld), bool(isleap))
+
+            result = cached_calc_bazi(solar_y, solar_m, solar_d, hour_val, min_val,
+                                      manual_branch, use_sxtwl_compare, prefer_sxtwl_hour, birth_lon, birth_tz)
             st.markdown("### 推算结果（四柱）")
             st.write(f"对应阳历：{solar_y}年{solar_m}月{solar_d}日")
+            show_true_solar(result)
             st.write(f"年柱：{result['year']} ； 月柱：{result['month']} ； 日柱（锚点法）：{result['day']} ； 时柱：{result['hour']}")
             if use_sxtwl_compare and result.get("sxtwl") and any(result["sxtwl"].values()):
                 s = result["sxtwl"]
@@ -493,12 +335,16 @@ elif mode == "农历生日":
                 st.write(f"（sxtwl）年：{s.get('year')}，月：{s.get('month')}，日：{s.get('day')}，时：{s.get('hour')}")
                 if s.get("day") and s.get("day") != result["day"]:
                     st.warning(f"注：sxtwl 日柱为 {s.get('day')}，程序以锚点法日柱 {result['day']} 为主。")
-            ji, xiong = analyze_bazi(result["year"], result["month"], result["day"], result["hour"])
+            ji, xiong = cached_analyze_bazi(result["year"], result["month"], result["day"], result["hour"], rules_name)
             st.markdown("---")
             show_result_beauty(ji, xiong)
         except Exception as e:
+            metrics.incr("errors", stage="lunar_mode", type=type(e).__name__)
             st.error(f"转换或计算出错：{e}")
 
+elif mode == "群体统计（上传文件）":
+    show_cohort_page(rules_name)
+
 else:  # 四柱手动输入
     st.markdown("请直接输入四柱（例：甲子、乙丑、丙寅）。时柱可填写“不要”或“不要时”或“不知道”以跳过。")
     ny = st.text_input("年柱（如：甲子）", value="")
@@ -509,12 +355,33 @@ else:  # 四柱手动输入
         if not (ny and my and dy):
             st.error("请至少填写年柱、月柱、日柱")
         else:
-            ji, xiong = analyze_bazi(ny.strip(), my.strip(), dy.strip(), sy.strip())
+            ji, xiong = cached_analyze_bazi(ny.strip(), my.strip(), dy.strip(), sy.strip(), rules_name)
             st.markdown("### 你输入的四柱")
             st.write(f"{ny}  {my}  {dy}  {sy}")
             st.markdown("---")
             show_result_beauty(ji, xiong)
+    if st.button("反查出生时间（1900-2100）"):
+        if not (ny and my and dy):
+            st.error("请至少填写年柱、月柱、日柱")
+        else:
+            try:
+                slots = cached_reverse(ny.strip(), my.strip(), dy.strip(), sy.strip(), REVERSE_LIMIT + 1)
+            except ValueError as e:
+                metrics.incr("errors", stage="reverse", type=type(e).__name__)
+                st.error(f"反查出错：{e}")
+            else:
+                if not slots:
+                    st.info("1900-2100 年间没有能排出该四柱的时间（请检查月干、时干是否符合五虎遁 / 五鼠遁）")
+                else:
+                    st.markdown("### 可能的出生时间（北京时间，按节气表定年月）")
+                    rows = [f"- {s.start:%Y-%m-%d %H:%M} ~ {s.end:%H:%M}（{s.hour}时）" for s in slots[:REVERSE_LIMIT]]
+                    if len(slots) > REVERSE_LIMIT:
+                        rows.append(f"- ……（仅显示前 {REVERSE_LIMIT} 条）")
+                    st.markdown("\n".join(rows))
 
 # 页脚简短提示（不包含安装建议）
 st.markdown("---")
+if DEBUG_PANEL:
+    show_cache_panel()
+_start_warm_up()
 st.caption("注：程序默认以锚点日法（日柱）与五鼠遁（时柱规则）为主；若已安装并启用本地 sxtwl，会做并列对比或覆盖（取决于你的选择）。")
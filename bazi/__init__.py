@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+bazi：八字排盘计算包（不依赖 Streamlit）
+- ganzhi 干支基础数据与合冲表
+- engine 整数编码吉凶引擎（柱 0-59，吉凶为 60 位掩码）
+- rules  吉凶规则集（数据声明，编译为查找表；analyze_bazi 等以 rules= 按名称选用）
+- core   吉凶字符串接口、四柱推算 calc_bazi
+- lunar  农历 <-> 公历（1900-2100 内置表）
+- solartime  真太阳时（经度 + 时区 + 均时差表），calc_bazi(..., longitude=, tz=) 据此定日柱、时柱
+- batch  CSV/JSONL 流式批量排盘（python -m bazi.batch）
+- vectorized  NumPy 数组批量排盘 calc_bazi_batch（按需导入，需要 numpy）
+- cohort   群体统计：流式累计六十甲子直方图与逐年命中人数，可跨进程合并（python -m bazi.cohort）
+- metrics  分阶段计时与计数，导出 JSON / Prometheus（默认关闭，BAZI_METRICS=1 开启）
+- warmup   后台预热（导入 sxtwl、算当年节气、展开农历表），缩短首个请求的冷启动
+- store    持久化结果缓存（SQLite WAL），批量 / 服务的多个进程及重启之间共享
+- service  HTTP JSON 服务（ASGI：uvicorn bazi.service:app）
+- match  合婚批量匹配，每个档案取前 k 名 top_matches（按需导入，需要 numpy）
+"""
+from .core import (
+    tiangan, dizhi, GZS_LIST,
+    gan_he, gan_chong, zhi_he, zhi_chong,
+    HAVE_SXTWL,
+    GZ_INDEX, YEAR_RANGE, year_ganzhi_map, ganzhi_years, calc_jixiong, analyze_bazi,
+    day_ganzhi_by_anchor, month_stem_by_fihu_dun, get_month_branch_approx,
+    get_hour_branch_by_minute, time_ganzhi_by_rule,
+    calc_bazi, apply_true_solar,
+)
+from .engine import JI_MASK, XIONG_MASK, chart_masks, mask_of, mask_to_ganzhi
+from .lunar import lunar_to_solar, solar_to_lunar
+from .rules import get_rules, register_rules
+from .solartime import true_solar_time
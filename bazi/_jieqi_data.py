@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# 由 python -m bazi.jieqi --build 生成（sxtwl），请勿手工修改
+# 内容：每年 12 个节的北京时间，自 1900-01-01 00:00 起的分钟数，int32 小端序
+START_YEAR = 1900
+END_YEAR = 2100
+DATA = (
+    "nBwAAIDCAAD2aQEAARQCAPvAAgB3cAMATiEEAPPRBADlgAUAJS0GAHjWBgBofQcAGSMIAPzICABz"
+    "cAkAgBoKAH7HCgD8dgsA1CcMAHbYDABmhw0ApjMOAPrcDgDtgw8AoCkQAILPEAD4dhEAASESAPvN"
+    "EgB0fRMARi4UAObeFADWjRUAGToWAHLjFgBpihcAIDAYAAPWGAB3fRkAficaAHXUGgDvgxsAxTQc"
+    "AGjlHABalB0AnkAeAPXpHgDrkB8AoTYgAITcIAD4gyEA/y0iAPfaIgBxiiMASDskAOzrJADemiUA"
+    "IEcmAHXwJgBplycAHz0oAATjKAB6iikAgjQqAHrhKgDykCsAxEEsAGXyLABWoS0AmE0uAO72LgDj"
+    "nS8AmUMwAIDpMAD4kDEAAzsyAPznMgB1lzMAR0g0AOj4NADYpzUAG1Q2AHP9NgBppDcAH0o4AAPw"
+    "OAB3lzkAf0E6AHbuOgDtnTsAv048AGD/PABSrj0Al1o+APADPwDnqj8AnVBAAH/2QADynUEA+EdC"
+    "AO70QgBnpEMAPFVEAN8FRQDQtEUAE2FGAGoKRwBgsUcAFVdIAPn8SABtpEkAdU5KAG/7SgDqqksA"
+    "wFtMAGIMTQBTu00Ak2dOAOkQTwDft08All1QAHsDUQDxqlEA91RSAOsBUwBgsVMAMWJUANESVQDC"
+    "wVUABW5WAF0XVwBVvlcADWRYAPIJWQBnsVkAbVtaAGAIWwDWt1sAqWhcAEwZXQBByF0Ah3ReAN8d"
+    "XwDUxF8Ah2pgAGoQYQDdt2EA5GFiANsOYwBTvmMAKW9kAM0fZQDCzmUAB3tmAF8kZwBTy2cABnFo"
+    "AOcWaQBZvmkAYGhqAFcVawDNxGsAn3VsAEAmbQAy1W0AeIFuANIqbwDJ0W8Af3dwAGEdcQDUxHEA"
+    "2m5yANAbcwBIy3MAG3x0AL0sdQCw23UA94d2AFMxdwBN2HcABH54AOUjeQBUy3kAVXV6AEciewC8"
+    "0XsAkIJ8ADQzfQAp4n0AcY5+AM43fwDI3n8AgISAAGIqgQDR0YEA0nuCAMIogwA22IMAComEAK85"
+    "hQCl6IUA7JSGAEY+hwA+5YcA9YqIANowiQBN2IkAUoKKAEYviwC73osAjo+MADJAjQAn740AbpuO"
+    "AMlEjwDB648AeJGQAF03kQDR3pEA1YiSAMY1kwA35ZMABJaUAKNGlQCX9ZUA4KGWAD9LlwA68pcA"
+    "85eYANc9mQBJ5ZkATY+aAD48mwCx65sAgZycACJNnQAY/J0AYaieAMBRnwC6+J8AcZ6gAFJEoQDD"
+    "66EAx5WiALtCowAy8qMAB6OkAKpTpQCfAqYA5a6mAEFYpwA6/6cA8qSoANRKqQBF8qkASZyqADxJ"
+    "qwCx+KsAg6msACNarQAWCa4AW7WuALVerwCvBbAAaauwAE5RsQDC+LEAxqKyALlPswAu/7MAAbC0"
+    "AKVgtQCaD7YA4bu2AD1ltwA3DLgA7rG4ANBXuQBA/7kAQqm6ADJWuwCmBbwAera8ACBnvQAZFr4A"
+    "Y8K+AMBrvwC5EsAAbrjAAE5ewQC8BcIAva/CAK5cwwAiDMQA9bzEAJxtxQCVHMYA4MjGAD1yxwA1"
+    "GcgA6b7IAMlkyQA4DMoAOrbKAC5jywCkEswAecPMAB90zQAYI84AY8/OAMJ4zwC8H9AAcsXQAFJr"
+    "0QDAEtIAvrzSAKxp0wAeGdQA7snUAJB61QCIKdYA1dXWADh/1wA3JtgA8cvYANJx2QA+GdoAOsPa"
+    "ACVw2wCVH9wAZtDcAAuB3QAFMN4AU9zeALWF3wCyLOAAa9LgAEx44QC5H+IAt8niAKN24wAVJuQA"
+    "6NbkAI+H5QCKNuYA1uLmADWM5wAxM+gA6tjoAM1+6QA8JuoAO9DqACh96wCXLOwAZN3sAAWO7QD8"
+    "PO4AR+nuAKeS7wCkOfAAX9/wAEOF8QC1LPIAtdbyAKOD8wASM/QA4OP0AIGU9QB4Q/YAxe/2ACiZ"
+    "9wAnQPgA4OX4AMGL+QAuM/oALN36ABqK+wCKOfwAWur8AP2a/QD1Sf4AQ/b+AKaf/wCkRgABXewA"
+    "AT2SAQGpOQIBpuMCAZOQAwEEQAQB1PAEAXihBQFvUAYBuvwGARqmBwEWTQgBz/IIAbGYCQEfQAoB"
+    "HuoKAQ6XCwGBRgwBVPcMAfqnDQHxVg4BPAMPAZusDwGXUxABUPkQATSfEQGiRhIBoPASAYudEwH5"
+    "TBQByP0UAWyuFQFkXRYBsQkXAROzFwERWhgByv8YAa2lGQEaTRoBFvcaAQCkGwFuUxwBPgQdAeS0"
+    "HQHgYx4BMBAfAZK5HwGNYCABQwYhASGsIQGNUyIBi/0iAXiqIwHrWSQBvgolAWe7JQFlaiYBtBYn"
+    "ARfAJwESZygByAwpAaayKQEQWioBDQQrAfuwKwFrYCwBOhEtAd3BLQHXcC4BJx0vAYvGLwGKbTAB"
+    "QxMxASO5MQGOYDIBiQozAXO3MwHjZjQBsxc1AVnINQFUdzYBpSM3AQzNNwEOdDgByBk5Aaa/OQEO"
+    "ZzoBBRE7Ae29OwFcbTwBLh49AdfOPQHWfT4BKSo/AZDTPwGRekABTCBBASzGQQGUbUIBixdDAXDE"
+    "QwHcc0QBrCRFAVPVRQFRhEYBojBHAQfaRwEGgUgBwCZJAaLMSQEOdEoBCR5LAfLKSwFfekwBLytN"
+    "AdbbTQHUik4BJjdPAYzgTwGMh1ABRi1RASnTUQGVelIBkCRTAXfRUwHhgFQBrDFVAU7iVQFKkVYB"
+    "nj1XAQfnVwELjlgBxzNZAajZWQETgVoBCytbAfHXWwFbh1wBJzhdAcvoXQHHl14BGkRfAYPtXwGF"
+    "lGABPzphAR/gYQGIh2IBgjFjAWzeYwHbjWQBrD5lAVPvZQFQnmYBoUpnAQf0ZwEIm2gBwkBpAaPm"
+    "aQEOjmoBCDhrAfHkawFdlGwBK0VtAc31bQHGpG4BFVFvAXr6bwF8oXABOEdxARztcQGJlHIBgz5z"
+    "AWnrcwHVmnQBo0t1AUj8dQFDq3YBlVd3AfsAeAH8p3gBtk15AZbzeQEAm3oB+ER7Ad/xewFLoXwB"
+    "HFJ9AcUCfgHFsX4BGV5/AYAHgAGAroABOFSBARb6gQF+oYIBdUuDAVz4gwHIp4QBl1iFAT4JhgE9"
+    "uIYBkGSHAfcNiAH2tIgBrVqJAYsAigHzp4oB7FGLAdX+iwFDrowBFF+NAbsPjgG6vo4BD2uPAXgU"
+    "kAF5u5ABM2GRAREHkgF3rpIBbFiTAVEFlAG7tJQBiWWVAS8WlgEuxZYBhHGXAfAamAH2wZgBsmeZ"
+    "AZENmgH3tJoB6V6bAckLnAExu5wB/mudAaUcngGmy54B/HefAWchoAFqyKABJm6hAQUUogFru6IB"
+    "X2WjAUISpAGswaQBfXKlAScjpgEq0qYBgH6nAeonqAHszqgBpnSpAYYaqgHuwaoB5WurAcgYrAEw"
+    "yKwB+3itAZ8prgGd2K4B8oSvAV0usAFh1bABHXuxAf8gsgFpyLIBX3KzAUIftAGpzrQBc3+1ARcw"
+    "tgEW37YBbYu3Ads0uAHg27gBnIG5AXonugHfzroB03i7AbYlvAEf1bwB7oW9AZY2vgGY5b4B8JG/"
+    "AV07wAFj4sABHojBAfwtwgFg1cIBU3/DATYsxAGg28QBbozFARQ9xgET7MYBaJjHAdJByAHW6MgB"
+    "ko7JAXM0ygHa28oBz4XLAbIyzAEd4swB7JLNAZRDzgGU8s4B6p7PAVRI0AFY79ABFJXRAfU60gFd"
+    "4tIBUIzTATE51AGY6NQBZZnVAQ1K1gEP+dYBZ6XXAdRO2AHa9dgBlpvZAXZB2gHd6NoBz5LbAa8/"
+    "3AEU79wB4J/dAYhQ3gGM/94B5qvfAVJV4AFV/OABDqLhAetH4gFQ7+IBRJnjASdG5AGR9eQBYabl"
+    "AQxX5gERBucBbbLnAdpb6AHeAukBl6jpAXJO6gHX9eoByp/rAa1M7AEW/OwB46ztAYhd7gGJDO8B"
+    "47jvAVJi8AFaCfEBF6/xAfVU8gFZ/PIBSqbzASlT9AGPAvUBW7P1AQJk9gEDE/cBXr/3Ac9o+AHZ"
+    "D/kBlrX5AXRb+gHVAvsBw6z7AaBZ/AEGCf0B1rn9AYFq/gGIGf8B5MX/AVRvAAJdFgECGrwBAvlh"
+    "AgJcCQMCSrMDAidgBAKMDwUCWMAFAgBxBgIDIAcCXcwHAst1CALRHAkCjsIJAm5oCgLVDwsCx7kL"
+    "AqZmDAIKFg0C1cYNAn13DgKAJg8C29IPAkt8EAJSIxECDskRAu5uEgJTFhMCRMATAiJtFAKGHBUC"
+    "T80VAvV9FgL4LBcCVdkXAseCGALSKRkCkM8ZAm91GgLSHBsCwcYbAp1zHAIAIx0CydMdAm+EHgJy"
+    "Mx8Czd8fAj2JIAJFMCECAtYhAt97IgJCIyMCMc0jAhB6JAJ3KSUCRtolAu+KJgLzOScCTuYnAr2P"
+    "KALENikCgdwpAl+CKgLDKSsCs9MrApKALAL3Ly0CxOAtAmqRLgJrQC8CxewvAjOWMAI7PTEC+uIx"
+    "AtqIMgI+MDMCLtozAgqHNAJsNjUCN+c1At6XNgLiRjcCPvM3Aq6cOAK1QzkCcek5Ak2POgKvNjsC"
+    "nOA7AniNPALdPD0Cq+09AliePgJiTT8Cw/k/AjWjQAI8SkEC9u9BAtCVQgIwPUMCHedDAvmTRAJe"
+    "Q0UCK/RFAtSkRgLbU0cCOgBIAqupSAKzUEkCbfZJAkicSgKpQ0sClu1LAnKaTALXSU0Co/pNAk2r"
+    "TgJTWk8CswZQAiiwUAIyV1EC8PxRAsyiUgIrSlMCFfRTAu6gVAJQUFUCGwFWAsWxVgLNYFcCLw1Y"
+    "Aqa2WAK1XVkCdgNaAlOpWgKyUFsCmfpbAm+nXALOVl0ClwdeAkG4XgJJZ18CqhNgAh+9YAIqZGEC"
+    "6QliAsevYgIoV2MCEgFkAuqtZAJLXWUCFw5mAsK+ZgLMbWcCLhpoAqPDaAKtamkCaxBqAkm2agKs"
+    "XWsCmgdsAnS0bALUY20CnBRuAkLFbgJIdG8CqCBwAh7KcAIrcXEC6xZyAsu8cgIuZHMCGw50AvW6"
+    "dAJTanUCGRt2Ar7LdgLCencCIyd4AprQeAKod3kCaB16AkTDegKkansCjhR8AmfBfALJcH0ClSF+"
+    "Aj/SfgJIgX8Cqi2AAiHXgAIufoEC7SOCAsnJggIocYMCExuEAuzHhAJQd4UCHCiGAsXYhgLJh4cC"
+    "JzSIAprdiAKlhIkCZSqKAkPQigKld4sCkSGMAmvOjALNfY0CmC6OAkHfjgJHjo8CpjqQAhjkkAIj"
+    "i5EC4zCSAsHWkgIjfpMCDSiUAuTUlAJEhJUCDzWWArrllgLElJcCJkGYApzqmAKokZkCZzeaAkTd"
+    "mgKjhJsCjC6cAmPbnALCip0CizueAjbsngJAm58Co0egAhjxoAIimKEC3T2iArfjogIVi6MC/jSk"
+    "AtfhpAI5kaUCBUKmArLypgK+oacCI06oApr3qAKknqkCX0SqAjjqqgKUkasCfjusAlforAK4l60C"
+    "g0iuAiz5rgI1qK8CmVSwAhH+sAIgpbEC4EqyArzwsgIYmLMC/kG0AtPutAIwnrUC+U62AqL/tgKr"
+    "rrcCD1u4AokEuQKZq7kCWVG6AjT3ugKOnrsCcEi8AkL1vAKfpL0Ca1W+AhkGvwIotb8CkGHAAgoL"
+    "wQIYssEC2FfCArP9wgIPpcMC807EAsb7xAIjq8UC7VvGApgMxwKku8cCCWjIAoERyQKOuMkCTl7K"
+    "AisEywKKq8sCclXMAkYCzQKhsc0CZ2LOAhATzwIaws8Cf27QAvoX0QIJv9ECyWTSAqYK0wIDstMC"
+    "6VvUArsI1QIWuNUC3GjWAoYZ1wKRyNcC+nTYAnce2QKKxdkCTGvaAigR2wKEuNsCaWLcAjsP3QKW"
+    "vt0CXW/eAgUg3wIPz98CdXvgAvAk4QIAzOECwXHiApwX4wL4vuMC3WjkArEV5QIOxeUC2HXmAoMm"
+    "5wKO1ecC84HoAm0r6QJ80ukCPXjqAhke6wJ3xesCXW/sAjIc7QKPy+0CWHzuAgIt7wIM3O8CcIjw"
+    "Auox8QL62PECvH7yApsk8wL6y/MC4HX0ArIi9QIN0vUC04L2Anwz9wKH4vcC7Y74Amg4+QJ33/kC"
+    "NoX6AhEr+wJs0vsCUHz8AiIp/QJ+2P0CSYn+Avg5/wIJ6f8Cc5UAA/A+AQP+5QEDu4sCA5QxAwPu"
+    "2AMD0oIEA6YvBQMF3wUD0I8GA31ABwOK7wcD85sIA29FCQN+7AkDPJIKAxY4CwNw3wsDVIkMAyc2"
+    "DQOF5Q0DTZYOA/hGDwMF9g8DbaIQA+tLEQP98hEDvpgSA5k+EwPx5RMD0Y8UA588FQP56xUDwpwW"
+    "A3BNFwOA/BcD7KgYA2xSGQOC+RkDRZ8aAyFFGwN67BsDWZYcAyVDHQN98h0DRaMeA/JTHwMCAyAD"
+    "bK8gA+pYIQP7/yEDvaUiA5hLIwPz8iMD1JwkA6JJJQP7+CUDwqkmA29aJwN/CSgD6rUoA2hfKQN5"
+    "BioDOawqAxVSKwNw+SsDVKMsAyVQLQN+/y0DQ7AuA+xgLwP6DzADZbwwA+VlMQP5DDIDvLIyA5hY"
+    "MwP0/zMD1qk0A6VWNQP9BTYDwLY2A2dnNwNzFjgD3cI4A15sOQNyEzoDNLk6Aw1fOwNlBjwDRLA8"
+    "AxJdPQNsDD4DNL0+A+BtPwPwHEADXclAA91yQQPxGUIDs79CA4xlQwPkDEQDw7ZEA5JjRQPuEkYD"
+    "t8NGA2R0RwNxI0gD2c9IA1d5SQNpIEoDK8ZKAwdsSwNhE0wDQr1MAxFqTQNqGU4DMcpOA9t6TwPp"
+    "KVADUdZQA85/UQPhJlIDo8xSA39yUwPZGVQDuMNUA4NwVQPZH1YDn9BWA02BVwNfMFgDzdxYA0+G"
+    "WQNjLVoDJNNaA/54WwNWIFwDNcpcAwB3XQNXJl4DHtdeA8uHXwPdNmADS+NgA8yMYQPeM2IDndli"
+    "A3R/YwPLJmQDqtBkA3d9ZQPQLGYDl91mA0SOZwNWPWgDxeloA0eTaQNaOmoDGuBqA/KFawNILWwD"
+    "JtdsA/ODbQNLM24DEeRuA72UbwPOQ3ADPPBwA8CZcQPYQHIDneZyA3iMcwPOM3QDqt10A3SKdQPJ"
+    "OXYDjup2AzmbdwNJSngDtvZ4AzqgeQNSR3oDF+16A/GSewNGOnwDIOR8A+eQfQM7QH4DAvF+A7Gh"
+    "fwPGUIADN/2AA7umgQPRTYIDlPOCA26ZgwPFQIQDouqEA2yXhQPCRoYDifeGAzeohwNJV4gDuAOJ"
+    "AzqtiQNPVIoDEvqKA+2fiwNHR4wDJvGMA/KdjQNHTY4DC/6OA7SujwPEXZADMgqRA7azkQPNWpID"
+    "kACTA2umkwPCTZQDn/eUA2eklQO7U5YDfwSXAyq1lwM9ZJgDrxCZAze6mQNQYZoDFQebA+6smwNE"
+    "VJwDH/6cA+mqnQM+Wp4DBAufA7G7nwPEaqADMxehA7fAoQPNZ6IDkA2jA2qzowPAWqQDmwSlA2ax"
+    "pQO8YKYDgxGnAzHCpwNDcagDsR2pAzTHqQNJbqoDDBSrA+a5qwM9YawDGQutA+O3rQM5Z64D/xev"
+    "A6zIrwO/d7ADLiSxA7LNsQPJdLIDjRqzA2jAswPAZ7QDnRG1A2W+tQO5bbYDfh63AyvPtwM+frgD"
+    "ryq5AzTUuQNKe7oDCyG7A+LGuwM2brwDDxi9A9fEvQMqdL4D8CS/A6HVvwO5hMADLjHBA7TawQPK"
+    "gcIDiifDA1/NwwOxdMQDih7FA1PLxQOqesYDcivHAyLcxwM4i8gDqzfJAzLhyQNJiMoDCy7LA+PT"
+    "ywM2e8wDDyXNA9fRzQMsgc4D8THPA57izwOxkdADIz7RA6vn0QPFjtIDijTTA2Pa0wO0gdQDiCvV"
+    "A0rY1QOah9YDXjjXAw3p1wMkmNgDmkTZAyXu2QNCldoDCTvbA+Lg2wM0iNwDCTLdA8ve3QMajt4D"
+    "3j7fA4/v3wOnnuADG0vhA6P04QO9m+IDgUHjA1vn4wOvjuQDhjjlA0rl5QOalOYDXEXnAwn25wMf"
+    "pegDlFHpAxz76QM1ouoD+UfrA9Lt6wMnlewDAD/tA8Xr7QMUm+4D1UvvA3/87wOUq/ADCVjxA5QB"
+    "8gOwqPIDd07zA1L08wOnm/QDgEX1A0Ty9QOUofYDVVL3A/4C+AMRsvgDhV75AxAI+gMsr/oD8lT7"
+    "A8r6+wMbovwD8Uv9A7X4/QMFqP4DyVj/A3YJAASMuAAEAWUBBIoOAgSltQIEalsDBEMBBASUqAQE"
+    "a1IFBDD/BQSErgYESl8HBPkPCAQOvwgEgGsJBAcVCgQgvAoE5mELBMAHDAQVrwwE7lgNBLMFDgQG"
+    "tQ4EymUPBHcWEASMxRAE/nERBIQbEgSdwhIEYmgTBDwOFASPtRQEZV8VBCYMFgR0uxYEN2wXBOcc"
+    "GAQAzBgEeXgZBAQiGgQfyRoE424bBLoUHAQLvBwE4GUdBKMSHgTzwR4EuHIfBGsjIASG0iAE/34h"
+    "BIkoIgSizyIEZHUjBDkbJASIwiQEXWwlBCEZJgR0yCYEOHknBOgpKAQB2SgEeoUpBAYvKgQh1ioE"
+    "5HsrBLkhLAQIySwE3HItBJ0fLgTtzi4EsH8vBF8wMAR43zAE8YsxBIE1MgSg3DIEaIIzBEEoNASQ"
+    "zzQEYnk1BCEmNgRu1TYEMYY3BOE2OAT55TgEc5I5BAE8OgQg4zoE54g7BL8uPAQN1jwE3X89BJos"
+    "PgTm2z4EqYw/BFo9QAR27EAE8ZhBBH9CQgSd6UIEY49DBDs1RASL3EQEXoZFBB0zRgRq4kYELZNH"
+    "BNxDSAT28kgEcJ9JBP5ISgQb8EoE4pVLBLs7TAQO40wE44xNBKU5TgTy6E4Es5lPBF5KUAR1+VAE"
+    "7aVRBHxPUgSb9lIEYpxTBDtCVASL6VQEXZNVBBtAVgRl71YEJKBXBNFQWATq/1gEZaxZBPZVWgQY"
+    "/VoE4KJbBLhIXAQG8FwE15ldBJZGXgTj9V4EpqZfBFVXYARvBmEE6bJhBHZcYgSUA2MEW6ljBDNP"
+    "ZASD9mQEVaBlBBVNZgRj/GYEJ61nBNVdaATtDGkEZblpBPFiagQNCmsE069rBK1VbAT9/GwE0KZt"
+    "BI5TbgTZAm8EmrNvBEhkcARhE3EE2r9xBGhpcgSHEHMETrZzBChcdAR5A3UETK11BApadgRWCXcE"
+    "F7p3BMZqeAThGXkEXMZ5BOtvegQJF3sEzbx7BKJifATvCX0EwLN9BH1gfgTJD38Ei8B/BDxxgARZ"
+    "IIEE18yBBGd2ggSFHYMESMODBBxphARnEIUENrqFBPVmhgRDFocEB8eHBLh3iATUJokEUdOJBOF8"
+    "igQAJIsExsmLBJxvjAToFo0EucCNBHdtjgTEHI8Eh82PBDd+kARRLZEEzNmRBF2DkgR/KpMER9CT"
+    "BB52lARpHZUENMeVBOxzlgQ0I5cE9NOXBKWEmATDM5kEQuCZBNWJmgT5MJsEwtabBJl8nATlI50E"
+    "sM2dBGh6ngSwKZ8EctqfBCWLoARFOqEExeahBFeQogR2N6MEPd2jBBSDpARhKqUEMdSlBOyApgQ2"
+    "MKcE9uCnBKaRqATDQKkEQu2pBNSWqgT0PasEuuOrBJGJrATeMK0ErtqtBGiHrgSvNq8EbOevBBmY"
+    "sAQ1R7EEtPOxBEqdsgRuRLMEN+qzBA+QtARcN7UEKuG1BOWNtgQuPbcE7e23BJyeuAS4TbkEN/q5"
+    "BM2jugTxSrsEufC7BI+WvATZPb0Epee9BF6UvgSoQ78EafS/BBmlwAQ3VMEEtgDCBEmqwgRsUcME"
+    "NPfDBAqdxARVRMUEIe7FBNqaxgQlSscE5/rHBJiryAS1WskEMwfKBMWwygTnV8sEr/3LBIijzATX"
+    "Ss0EpvTNBGGhzgSrUM8EbAHQBB2y0AQ6YdEEtw3SBEm30gRrXtMENATUBAuq1ARXUdUEIvvVBNmn"
+    "1gQfV9cE3QfYBI642ASvZ9kEMRTaBMi92gTrZNsEsgrcBIew3ATRV90EmwHeBFOu3gSbXd8EXA7g"
+    "BBC/4AQzbuEEthriBEzE4gRua+MEMxHkBAa35ARPXuUEGwjmBNW05gQgZOcE4hToBJPF6ASzdOkE"
+    "NCHqBMvK6gTucesEtRfsBIq97ATSZO0EnA7uBFK77gSYau8EVhvwBAXM8AQje/EEpSfyBD7R8gRm"
+    "ePMEMh70BArE9ARTa/UEGxX2BM/B9gQUcfcE0yH4BITS+ASlgfkEKC76BMDX+gTmfvsEsCT8BIfK"
+    "/ATQcf0EmBv+BEvI/gSQd/8ETigABQDZAAUiiAEFpjQCBT3eAgVhhQMFKSsEBf/QBAVJeAUFEyIG"
+    "BcjOBgUNfgcFyi4IBXrfCAWajgkFHTsKBbTkCgXZiwsFojEMBXnXDAXFfg0FkigOBUrVDgWQhA8F"
+    "TTUQBfzlEAUalREFm0ESBTPrEgVakhMFJDgUBfrdFAVDhRUFCy8WBb/bFgUCixcFvjsYBWzsGAWM"
+    "mxkFEEgaBarxGgXSmBsFnD4cBXLkHAW6ix0FgDUeBTTiHgV5kR8FOUIgBevyIAUNoiEFkE4iBSf4"
+    "IgVMnyMFFUUkBerqJAUzkiUF/DsmBbLoJgX5lycFu0goBW75KAWOqCkFD1UqBaX+KgXJpSsFkUss"
+    "BWfxLAWwmC0FeUIuBS3vLgVvni8FLE8wBd3/MAX9rjEFgVsyBRoFMwVArDMFClI0BeH3NAUpnzUF"
+    "8Ug2BaT1NgXnpDcFpVU4BVgGOQV9tTkFBGI6BZ4LOwXEsjsFilg8BV3+PAWipT0FaE8+BRv8PgVh"
+    "qz8FIFxABdQMQQX6u0EFgmhCBR4SQwVEuUMFC19EBdwERQUgrEUF5VVGBZgCRwXdsUcFnGJIBU4T"
+    "SQVxwkkF+G5KBZUYSwW9v0sFiGVMBVwLTQWisk0FZ1xOBRoJTwVfuE8FHmlQBdEZUQX0yFEFenVS"
+    "BRcfUwVCxlMFD2xUBeURVQUquVUF62JWBZgPVwXXvlcFk29YBUYgWQVrz1kF9XtaBZMlWwW+zFsF"
+    "i3JcBWIYXQWov10FamleBRYWXwVVxV8FEnZgBcYmYQXt1WEFd4JiBRQsYwU802MFBnlkBdweZQUk"
+    "xmUF629mBZ0cZwXfy2cFnHxoBU8taQVy3GkF+4hqBZcyawXA2WsFin9sBWAlbQWozG0Fb3ZuBR8j"
+    "bwVe0m8FFoNwBcMzcQXl4nEFbY9yBQs5cwU44HMFBYZ0Bd0rdQUk03UF6Hx2BZgpdwXZ2HcFlIl4"
+    "BUU6eQVo6XkF8JV6BY8/ewW65nsFhYx8BVoyfQWf2X0FYoN+BRMwfwVW338FFZCABchAgQXr74EF"
+    "c5yCBQ9GgwU47YMFApOEBdc4hQUc4IUF4ImGBZA2hwXS5YcFkJaIBUJHiQVk9okF6qKKBYVMiwWt"
+    "84sFeJmMBU4/jQWW5o0FXJCOBQ09jwVQ7I8FDp2QBcJNkQXm/JEFbqmSBQpTkwUy+pMF/J+UBdFF"
+    "lQUV7ZUF15aWBYVDlwXE8pcFgKOYBTNUmQVbA5oF56+aBYdZmwWwAJwFeaacBUpMnQWM850FTZ2e"
+    "BfpJnwU5+Z8F96mgBa1aoQXWCaIFY7aiBQJgowUrB6QF86ykBcNSpQUE+qUFxqOmBXZQpwW5/6cF"
+    "ebCoBS5hqQVWEKoF4ryqBYJmqwWtDawFd7OsBUlZrQWKAK4FSaquBfNWrwUwBrAF67awBZxnsQXC"
+    "FrIFTsOyBfBsswUfFLQF7rm0BcRftQUFB7YFwrC2BWpdtwWmDLgFYL24BRVuuQU+HboFzcm6BXBz"
+    "uwWdGrwFasC8BT5mvQWADb4FPre+BedjvwUjE8AF38PABZR0wQW+I8IFTdDCBe95wwUbIcQF5sbE"
+    "BbpsxQX8E8YFvL3GBWZqxwWiGcgFW8rIBQx7yQUyKsoFv9bKBWGAywWPJ8wFXM3MBTFzzQV2Gs4F"
+    "OMTOBeRwzwUiINAF3NDQBY2B0QWzMNIFQN3SBeOG0wUSLtQF4dPUBbZ51QX3INYFtcrWBV531wWa"
+    "JtgFU9fYBQWI2QUsN9oFuuPaBV+N2wWPNNwFXtrcBTOA3QVzJ94FMNHeBdh93wUULeAFz93gBYSO"
+    "4QWsPeIFOeriBduT4wUIO+QF1eDkBaqG5QXsLeYFrNfmBViE5wWXM+gFVeToBQuV6QUzROoFwPDq"
+    "BWCa6wWMQewFWefsBS6N7QVyNO4FMt7uBduK7wUWOvAFz+rwBYCb8QWnSvIFNffyBdig8wUGSPQF"
+    "1O30BaqT9QXtOvYFrOT2BVSR9wWOQPgFSPH4Bfyh+QUnUfoFuf36BV6n+wWLTvwFVfT8BSaa/QVm"
+    "Qf4FJOv+Bc6X/wUNRwAGyvcABoGoAQatVwIGPwQDBuStAwYSVQQG3PoEBqygBQbqRwYGpvEGBlCe"
+    "BwaNTQgGSP4IBvuuCQYkXgoGswoLBli0CwaIWwwGVgENBiqnDQZqTg4GJvgOBs6kDwYKVBAGxgQR"
+    "Bnu1EQalZBIGNRETBtu6EwYNYhQG3AcVBrCtFQbvVBYGp/4WBkurFwaDWhgGPQsZBvO7GQYfaxoG"
+    "sxcbBlrBGwaMaBwGWg4dBi60HQZtWx4GJgUfBsmxHwYAYSAGuBEhBm7CIQabcSIGLh4jBtTHIwYD"
+    "byQGzxQlBqK6JQbjYSYGnwsnBke4JwaCZygGPBgpBvHIKQYceCoGryQrBlXOKwaFdSwGUhstBiXB"
+    "LQZmaC4GIhIvBsi+Lwb/bTAGtR4xBmTPMQaMfjIGHiszBsfUMwb7ezQGzCE1BqDHNQbfbjYGmRg3"
+    "BjzFNwZzdDgGKiU5BtzVOQYGhToGmTE7BkLbOwZ0gjwGQyg9BhXOPQZSdT4GCx8/BrHLPwbrekAG"
+    "pytBBl7cQQaKi0IGHDhDBsLhQwbziEQGwS5FBpTURQbSe0YGiyVHBjDSRwZqgUgGIzJJBtbiSQb/"
+    "kUoGjz5LBjToSwZkj0wG"
+)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+吉凶年 / 月 / 日历：给定一张命盘的吉凶掩码（engine.chart_masks / mask_of），
+列出日期范围内干支命中的年份、月份（节气月）和日子。
+- 年：ganzhi_years 的 60 年步长
+- 月：节气表（jieqi.JIE_TABLE）切片 + 五虎遁，数组运算
+- 日：锚点法日柱（按公历日，不含 23:00 换日），数组运算；可按页（chunk）生成，渲染几十年的逐日结果也不必一次算完
+仅覆盖节气表范围（1900-2100）内的月份；年、日不受此限。
+"""
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from . import jieqi
+from .core import ANCHOR_DATE, ANCHOR_INDEX, YEAR_BASE
+from .ganzhi import GZS_LIST, month_pillar_index
+
+YearHit = namedtuple("YearHit", "year ganzhi ji xiong")
+# start / end 为交节时刻（北京时间），end 不含
+MonthHit = namedtuple("MonthHit", "start end ganzhi ji xiong")
+
+_ANCHOR_ORD = ANCHOR_DATE.toordinal()
+_EPOCH_DT = datetime(jieqi.START_YEAR, 1, 1)
+_EPOCH_ORD = jieqi.EPOCH.toordinal()
+_ORD_1970 = 719163  # date(1970, 1, 1).toordinal()
+_JIE = np.asarray(jieqi.JIE_TABLE, dtype=np.int64)
+
+
+def _bits(mask):
+    """掩码 -> 长度 60 的布尔查找表"""
+    return np.array([bool(mask >> i & 1) for i in range(60)])
+
+
+def year_hits(ji_mask, xiong_mask, start_year, end_year):
+    """[start_year, end_year] 内年柱命中吉 / 凶的年份（升序）"""
+    ys = np.arange(start_year, end_year + 1)
+    idx = (ys - YEAR_BASE) % 60
+    ji, xiong = _bits(ji_mask)[idx], _bits(xiong_mask)[idx]
+    for i in np.nonzero(ji | xiong)[0].tolist():
+        yield YearHit(int(ys[i]), GZS_LIST[idx[i]], bool(ji[i]), bool(xiong[i]))
+
+
+def month_hits(ji_mask, xiong_mask, start, end):
+    """[start, end]（date）内与之相交的节气月中，月柱命中吉 / 凶者（升序）"""
+    lo = (start.toordinal() - _EPOCH_ORD) * 1440
+    hi = (end.toordinal() + 1 - _EPOCH_ORD) * 1440
+    n = len(_JIE)
+    # 第 k 个月为 [JIE[k], JIE[k+1])；取与 [lo, hi) 相交的 k
+    k0 = max(int(np.searchsorted(_JIE, lo, side="right")) - 1, 0)
+    k1 = min(int(np.searchsorted(_JIE, hi, side="left")), n)
+    if k0 >= k1:
+        return
+    k = np.arange(k0, k1)
+    j = k % 12
+    pillar_year = jieqi.START_YEAR + k // 12 - (j == 0)
+    midx = month_pillar_index((pillar_year - YEAR_BASE) % 60, (j + 1) % 12)
+    ji, xiong = _bits(ji_mask)[midx], _bits(xiong_mask)[midx]
+    ends = np.append(_JIE[k0 + 1:k1 + 1], jieqi.END_MINUTE if k1 == n else [])
+    for i in np.nonzero(ji | xiong)[0].tolist():
+        yield MonthHit(_EPOCH_DT + timedelta(minutes=int(_JIE[k0 + i])),
+                       _EPOCH_DT + timedelta(minutes=int(ends[i])),
+                       GZS_LIST[midx[i]], bool(ji[i]), bool(xiong[i]))
+
+
+def day_hits(ji_mask, xiong_mask, start, end):
+    """
+    [start, end]（date）内日柱命中吉 / 凶的日子，返回数组 dict：
+      date（datetime64[D]）、ganzhi（0-59）、ji、xiong（bool）
+    """
+    ords = np.arange(start.toordinal(), end.toordinal() + 1)
+    idx = (ANCHOR_INDEX + ords - _ANCHOR_ORD) % 60
+    ji, xiong = _bits(ji_mask)[idx], _bits(xiong_mask)[idx]
+    keep = ji | xiong
+    return {"date": (ords[keep] - _ORD_1970).astype("M8[D]"), "ganzhi": idx[keep],
+            "ji": ji[keep], "xiong": xiong[keep]}
+
+
+def iter_day_hits(ji_mask, xiong_mask, start, end, page_days=366):
+    """按页产出 day_hits 结果（每页最多 page_days 个公历日），供分页渲染 / 流式输出"""
+    s = start
+    while s <= end:
+        e = min(end, s + timedelta(days=page_days - 1))
+        yield day_hits(ji_mask, xiong_mask, s, e)
+        s = e + timedelta(days=1)
+
+
+def chart_calendar(ji_mask, xiong_mask, start=None, years=50):
+    """便捷入口：从 start（默认今天）起 years 年内的吉凶年、月（列表）与逐日（按年分页的生成器）"""
+    start = start or date.today()
+    end = date(start.year + years, start.month, 28 if (start.month, start.day) == (2, 29) else start.day) - timedelta(days=1)
+    return {
+        "years": list(year_hits(ji_mask, xiong_mask, start.year, end.year)),
+        "months": list(month_hits(ji_mask, xiong_mask, start, end)),
+        "days": iter_day_hits(ji_mask, xiong_mask, start, end),
+    }
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""
+批量排盘：流式读取 CSV / JSONL 出生记录，逐块送入进程池计算 calc_bazi + analyze_bazi，
+结果按输入顺序增量写出（内存占用与输入规模无关）。
+
+输入字段（CSV 表头或 JSON 键）：
+  id                   可选，原样透传
+  calendar             solar（默认）/ lunar / manual
+  year, month, day     公历或农历年月日；manual 时为年、月、日柱干支（如 甲子）
+  hour, minute         可选；留空或 -1 表示时辰未知；manual 时 hour 为时柱干支（可留空）
+  leap                 农历是否闰月（1/true/是）
+  manual_month_branch  可选，手动指定月支
+  rules                可选，吉凶规则集名称（见 bazi.rules，默认 default）
+  longitude, tz        可选，出生地经度（东经为正）与钟表时区（小时，默认 8）；年柱、月柱按北京时间查节气，
+                       日柱、时柱给出经度时按真太阳时、只给时区时按当地钟表时间
+
+用法：
+  python -m bazi.batch births.csv -o charts.jsonl --workers 8
+  python -m bazi.batch births.csv -o charts.jsonl --store charts.db   重复运行时复用已算结果
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+
+from .core import calc_bazi, analyze_bazi, apply_true_solar, dizhi, GZS_LIST
+from .daytable import open_shared
+from .lunar import lunar_to_solar
+from .solartime import beijing_time, check_place, check_tz
+
+OUTPUT_FIELDS = ["id", "solar_date", "year", "month", "day", "hour", "ji", "xiong", "source", "true_solar", "error"]
+TRUE_VALUES = ("1", "true", "yes", "y", "t", "是")
+MANUAL_VALUES = ("manual", "pillars", "四柱")
+
+
+def _to_int(v, default=None):
+    if v is None:
+        return default
+    s = str(v).strip()
+    if not s:
+        return default
+    return int(float(s))
+
+
+def _to_float(v):
+    if v is None:
+        return None
+    s = str(v).strip()
+    return float(s) if s else None
+
+
+def _to_bool(v):
+    if isinstance(v, bool):
+        return v
+    return str(v or "").strip().lower() in TRUE_VALUES
+
+
+def iter_records(fp, fmt=None):
+    """逐行产出 dict 记录；fmt 为 csv / jsonl，缺省时按文件名后缀判断"""
+    if fmt is None:
+        name = getattr(fp, "name", "") or ""
+        fmt = "jsonl" if name.endswith((".jsonl", ".json", ".ndjson")) else "csv"
+    if fmt == "jsonl":
+        for line in fp:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    else:
+        for row in csv.DictReader(fp):
+            yield row
+
+
+def _rules_of(rec):
+    return str(rec.get("rules") or "").strip() or None
+
+
+def _place_of(rec):
+    """记录 -> (经度, 时区)；未填的项为 None"""
+    lon, tz = _to_float(rec.get("longitude")), _to_float(rec.get("tz"))
+    if lon is None:
+        return None, (check_tz(tz) if tz is not None else None)
+    return check_place(lon, tz)
+
+
+def _manual_pillars(rec):
+    pillars = [str(rec.get(k) or "").strip() for k in ("year", "month", "day", "hour")]
+    if not all(pillars[:3]):
+        raise ValueError("手动四柱至少需要年柱、月柱、日柱")
+    return {"year": pillars[0], "month": pillars[1], "day": pillars[2], "hour": pillars[3] or None,
+            "source": "manual"}
+
+
+def _calc_by_table(table, y, m, d, hour, minute, manual_branch):
+    """查逐日柱表（daytable.DayTable）得到与 calc_bazi 相同的四柱；表外日期等返回 None 交给 calc_bazi"""
+    mb = None
+    if manual_branch:
+        if manual_branch not in dizhi:
+            return None
+        mb = dizhi.index(manual_branch)
+    try:
+        yi, mi, di, hi = table.lookup(y, m, d, hour, minute, mb)
+    except (KeyError, ValueError):
+        return None
+    src = "sxtwl" if table.from_sxtwl else "jieqi"
+    return {"year": GZS_LIST[yi], "month": GZS_LIST[mi], "day": GZS_LIST[di],
+            "hour": GZS_LIST[hi] if hi >= 0 else "不知道",
+            "source": f"{src}_year;" + ("manual_month;" if mb is not None else f"{src}_month;") + "rule_hour_used;"}
+
+
+def _chart_args(rec):
+    """非手动记录 -> calc_bazi 的 (年, 月, 日, 时, 分, 手动月支)，农历已换算为公历"""
+    y, m, d = _to_int(rec.get("year")), _to_int(rec.get("month")), _to_int(rec.get("day"))
+    hour = _to_int(rec.get("hour"), -1)
+    minute = _to_int(rec.get("minute"), 0)
+    if hour is None or hour < 0:
+        hour = minute = None
+    if str(rec.get("calendar") or "solar").strip().lower() in ("lunar", "农历"):
+        y, m, d = lunar_to_solar(y, m, d, _to_bool(rec.get("leap")))
+    return y, m, d, hour, minute, (rec.get("manual_month_branch") or "").strip() or None
+
+
+def _is_manual(rec):
+    return str(rec.get("calendar") or "").strip().lower() in MANUAL_VALUES
+
+
+def chart_record(rec, table=None, store=None):
+    """
+    单条记录 -> (公历 (年, 月, 日)（手动四柱为 None）, 四柱结果 dict)，只排盘、不算吉凶字符串，
+    供只需四柱的调用方（如 cohort 按掩码统计）；字段非法时抛异常。
+    table 为已打开的逐日柱表时优先查表（结果与 calc_bazi 相同，免去 sxtwl 按年重算节气）；
+    store 为持久化缓存（store.ChartStore）时先查缓存，未命中算完后登记（需调用方 flush）。
+    """
+    if _is_manual(rec):
+        return None, _manual_pillars(rec)
+    args = _chart_args(rec)
+    lon, tz = _place_of(rec)
+    # 给出出生地或时区时先换算为北京时间（节气表时区）查缓存 / 表 / 推算，日柱、时柱再按当地时间替换
+    calc_args = beijing_time(*args[:5], tz) + args[5:] if tz is not None else args
+    result = store.get(*calc_args) if store is not None else None
+    if result is None:
+        result = _calc_by_table(table, *calc_args) if table is not None else None
+        if result is None:
+            y, m, d, hour, minute, manual_branch = calc_args
+            result = calc_bazi(y, m, d, hour=hour, minute=minute, manual_month_branch=manual_branch)
+        if store is not None:
+            store.put(*calc_args, result=result)
+    if tz is not None:
+        result = apply_true_solar(result, *args[:5], lon, tz)
+    return args[:3], result
+
+
+def process_record(rec, table=None, store=None):
+    """单条记录 -> 结果 dict（四柱见 chart_record，另按记录的 rules 算吉凶）；出错时写入 error 字段而不中断整批"""
+    out = {"id": rec.get("id")}
+    try:
+        ymd, result = chart_record(rec, table, store)
+        ji, xiong = analyze_bazi(result["year"], result["month"], result["day"], result["hour"],
+                                 rules=_rules_of(rec))
+        if ymd is not None:
+            out["solar_date"] = "%04d-%02d-%02d" % ymd
+        out.update({
+            "year": result["year"], "month": result["month"],
+            "day": result["day"], "hour": result["hour"],
+            "ji": ji, "xiong": xiong, "source": result["source"],
+        })
+        if "true_solar" in result:
+            out["true_solar"] = result["true_solar"]
+    except Exception as e:
+        out["error"] = f"{type(e).__name__}: {e}"
+    return out
+
+
+def record_key(rec):
+    """
+    规范化记录 -> 可哈希的键（不含 id），键相同的记录结果相同，供缓存 / 合并请求使用。
+    字段无法解析时抛 ValueError / TypeError。
+    """
+    cal = str(rec.get("calendar") or "solar").strip().lower()
+    if cal in MANUAL_VALUES:
+        return ("manual",) + tuple(str(rec.get(k) or "").strip() for k in ("year", "month", "day", "hour")) \
+            + (_rules_of(rec),)
+    lunar = cal in ("lunar", "农历")
+    hour = _to_int(rec.get("hour"), -1)
+    minute = _to_int(rec.get("minute"), 0)
+    if hour is None or hour < 0:
+        hour = minute = None
+    return ("lunar" if lunar else "solar",
+            _to_int(rec.get("year")), _to_int(rec.get("month")), _to_int(rec.get("day")),
+            hour, minute, lunar and _to_bool(rec.get("leap")),
+            (rec.get("manual_month_branch") or "").strip() or None, _rules_of(rec)) + _place_of(rec)
+
+
+def _prefetch(store, records):
+    inputs = []
+    for rec in records:
+        if not _is_manual(rec):
+            try:
+                args = _chart_args(rec)
+                tz = _place_of(rec)[1]
+                inputs.append(beijing_time(*args[:5], tz) + args[5:] if tz is not None else args)
+            except Exception:
+                pass  # 出错的记录由 process_record 给出 error
+    store.prefetch(inputs)
+
+
+def process_chunk(records, table_path=None, store_path=None):
+    """一块记录 -> 结果列表；store_path 为持久化缓存文件时整块一次预取、算完一次写回"""
+    table = open_shared(table_path) if table_path else None
+    if not store_path:
+        return [process_record(r, table) for r in records]
+    from .store import open_store
+    store = open_store(store_path, backend=table.from_sxtwl if table is not None else None)
+    _prefetch(store, records)
+    out = [process_record(r, table, store) for r in records]
+    store.flush()
+    return out
+
+
+def _chunks(it, size):
+    buf = []
+    for rec in it:
+        buf.append(rec)
+        if len(buf) >= size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def iter_results(records, workers=None, chunk_size=2000, table_path=None, store_path=None):
+    """
+    按输入顺序产出结果。workers <= 1 时在当前进程计算；
+    否则使用进程池，同时在途的块数不超过 workers * 2，保证内存恒定。
+    table_path 为逐日柱表文件时各进程 mmap 共享查表；store_path 为持久化缓存（SQLite）文件时
+    各进程共用同一缓存。
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(records, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from process_chunk(chunk, table_path, store_path)
+        return
+    from concurrent.futures import ProcessPoolExecutor  # 按需导入（含 multiprocessing，约 10ms）
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(process_chunk, chunk, table_path, store_path))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class _CsvWriter:
+    def __init__(self, fp):
+        self.w = csv.DictWriter(fp, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+        self.w.writeheader()
+
+    def write(self, row):
+        row = dict(row)
+        for k in ("ji", "xiong"):
+            if isinstance(row.get(k), list):
+                row[k] = " ".join(row[k])
+        self.w.writerow(row)
+
+
+class _JsonlWriter:
+    def __init__(self, fp):
+        self.fp = fp
+
+    def write(self, row):
+        self.fp.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def _with_defaults(records, defaults):
+    """记录中留空的字段用 defaults 补上"""
+    for r in records:
+        missing = {k: v for k, v in defaults.items() if r.get(k) in (None, "")}
+        yield dict(r, **missing) if missing else r
+
+
+def run_batch(in_fp, out_fp, in_fmt=None, out_fmt="jsonl", workers=None, chunk_size=2000, table_path=None,
+              store_path=None, rules=None, longitude=None, tz=None):
+    """
+    流式处理 in_fp -> out_fp，返回 (总数, 出错数)。
+    rules / longitude / tz 为未填对应字段的记录所用的规则集、出生地经度与时区。
+    """
+    writer = _CsvWriter(out_fp) if out_fmt == "csv" else _JsonlWriter(out_fp)
+    total = errors = 0
+    records = iter_records(in_fp, in_fmt)
+    defaults = {k: v for k, v in (("rules", rules), ("longitude", longitude), ("tz", tz)) if v not in (None, "")}
+    if defaults:
+        records = _with_defaults(records, defaults)
+    for row in iter_results(records, workers=workers, chunk_size=chunk_size,
+                            table_path=table_path, store_path=store_path):
+        writer.write(row)
+        total += 1
+        if row.get("error"):
+            errors += 1
+    out_fp.flush()
+    return total, errors
+
+
+def _fmt_from_name(name, default):
+    if not name or name == "-":
+        return default
+    return "jsonl" if name.endswith((".jsonl", ".json", ".ndjson")) else "csv"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bazi.batch", description="批量八字排盘（CSV/JSONL 流式）")
+    ap.add_argument("input", help="输入文件（.csv / .jsonl），- 表示标准输入")
+    ap.add_argument("-o", "--output", default="-", help="输出文件（.csv / .jsonl），默认标准输出 JSONL")
+    ap.add_argument("--input-format", choices=["csv", "jsonl"], default=None)
+    ap.add_argument("--output-format", choices=["csv", "jsonl"], default=None)
+    ap.add_argument("-w", "--workers", type=int, default=None, help="进程数，默认 CPU 核数；1 表示不用进程池")
+    ap.add_argument("--chunk-size", type=int, default=2000)
+    ap.add_argument("--daytable", default=None, help="逐日柱表文件（python -m bazi.daytable build 生成），查表代替逐条推算")
+    ap.add_argument("--store", default=None, help="持久化缓存文件（SQLite），重复运行及各进程共享已算结果")
+    ap.add_argument("--rules", default=None, help="吉凶规则集（default / wuji / sanhe / plain），记录中的 rules 字段优先")
+    ap.add_argument("--longitude", type=float, default=None, help="出生地经度（东经为正），按真太阳时定日柱、时柱；记录中的字段优先")
+    ap.add_argument("--tz", type=float, default=None, help="钟表时间的时区（小时），默认 8（北京时间）")
+    args = ap.parse_args(argv)
+
+    in_fmt = args.input_format or _fmt_from_name(args.input, "csv")
+    out_fmt = args.output_format or _fmt_from_name(args.output, "jsonl")
+    in_fp = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8") if args.input == "-" \
+        else open(args.input, encoding="utf-8-sig", newline="")
+    out_fp = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        total, errors = run_batch(in_fp, out_fp, in_fmt, out_fmt, args.workers, args.chunk_size, args.daytable,
+                                  args.store, args.rules, args.longitude, args.tz)
+    finally:
+        if args.input != "-":
+            in_fp.close()
+        if args.output != "-":
+            out_fp.close()
+    print(f"完成 {total} 条，出错 {errors} 条", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
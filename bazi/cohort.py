@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+群体统计：把出生记录流式送进排盘引擎，只累计汇总量，不保留逐条结果（内存与记录数无关）。
+
+CohortSummary 累计：
+  pillars[柱][i]   年 / 月 / 日 / 时柱为六十甲子第 i 个的人数（时辰未知不计入时柱）
+  ji[i] / xiong[i] 吉 / 凶掩码含第 i 个干支的人数（“多少用户以甲子为凶年”= xiong[0] / total）
+  birth_years      出生年（公历）-> 人数
+各计数都是整数加法，worker 进程各算一块后在主进程 merge（或 sum(...)）即可。
+某一公历年对多少人为吉 / 凶，由年柱干支查 ji / xiong 直方图得到（year_hits）。
+
+  from bazi.cohort import aggregate
+  s = aggregate(iter_records(fp), workers=4, table_path="daytable.bin")
+  s.year_hits(2025, 2035)             # [(年, 干支, 吉人数, 凶人数)]
+  python -m bazi.cohort births.csv --json summary.json --csv summary.csv --years 2025-2075
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from collections import Counter, deque
+
+from .batch import _chunks, chart_record, iter_records
+from .daytable import open_shared
+from .engine import chart_masks, iter_mask
+from .ganzhi import GZS_LIST, GZ_INDEX
+
+PILLARS = ("year", "month", "day", "hour")
+CHUNK_SIZE = 2000
+
+
+class CohortSummary:
+    """可合并的汇总；只含整数计数，可直接 pickle 在进程间传递"""
+
+    def __init__(self, rules=None):
+        self.rules = rules
+        self.total = 0      # 成功排盘的记录数
+        self.errors = 0
+        self.hour_unknown = 0
+        self.pillars = {p: [0] * 60 for p in PILLARS}
+        self.ji = [0] * 60
+        self.xiong = [0] * 60
+        self.birth_years = Counter()
+
+    def add(self, row):
+        """累计一条 batch.process_record 的结果；带 error 的只计数"""
+        if row.get("error"):
+            self.errors += 1
+            return
+        self.add_chart([GZ_INDEX.get(row.get(p), -1) for p in PILLARS],
+                       int(row["solar_date"][:4]) if row.get("solar_date") else None)
+
+    def add_chart(self, idx, birth_year=None):
+        """累计一张命盘：四柱序号（-1 为未知）与出生年（手动四柱为 None）；吉凶按 self.rules 查掩码"""
+        for p, i in zip(PILLARS, idx):
+            if i >= 0:
+                self.pillars[p][i] += 1
+        if idx[3] < 0:
+            self.hour_unknown += 1
+        ji, xiong = chart_masks(idx, self.rules)
+        for i in iter_mask(ji):
+            self.ji[i] += 1
+        for i in iter_mask(xiong):
+            self.xiong[i] += 1
+        if birth_year is not None:
+            self.birth_years[birth_year] += 1
+        self.total += 1
+
+    def merge(self, other):
+        """把另一份汇总（如 worker 的结果）并入本对象，返回 self"""
+        if other.rules != self.rules:
+            raise ValueError(f"规则集不同，不能合并：{self.rules} / {other.rules}")
+        self.total += other.total
+        self.errors += other.errors
+        self.hour_unknown += other.hour_unknown
+        for p in PILLARS:
+            self.pillars[p] = [a + b for a, b in zip(self.pillars[p], other.pillars[p])]
+        self.ji = [a + b for a, b in zip(self.ji, other.ji)]
+        self.xiong = [a + b for a, b in zip(self.xiong, other.xiong)]
+        self.birth_years.update(other.birth_years)
+        return self
+
+    def __add__(self, other):
+        return CohortSummary(self.rules).merge(self).merge(other)
+
+    def __radd__(self, other):
+        # 支持 sum(summaries)
+        return self if other == 0 else NotImplemented
+
+    def share(self, kind, gz):
+        """吉 / 凶（kind 为 "ji" / "xiong"）掩码含干支 gz 的人数占比"""
+        return getattr(self, kind)[GZ_INDEX[gz]] / self.total if self.total else 0.0
+
+    def year_hits(self, start, end):
+        """[start, end] 各公历年的 (年, 年柱干支, 吉人数, 凶人数)"""
+        out = []
+        for y in range(start, end + 1):
+            i = (y - 1984) % 60
+            out.append((y, GZS_LIST[i], self.ji[i], self.xiong[i]))
+        return out
+
+    def top_years(self, start, end, kind="xiong", n=10):
+        """[start, end] 内按吉 / 凶人数降序的前 n 年"""
+        col = 2 if kind == "ji" else 3
+        return sorted(self.year_hits(start, end), key=lambda r: (-r[col], r[0]))[:n]
+
+    # ---------- 导出 ----------
+    def to_dict(self, years=None):
+        """可 json.dumps 的 dict；years=(start, end) 时附带逐年命中人数"""
+        d = {"rules": self.rules, "total": self.total, "errors": self.errors, "hour_unknown": self.hour_unknown,
+             "ganzhi": GZS_LIST, "pillars": self.pillars, "ji": self.ji, "xiong": self.xiong,
+             "birth_years": {str(y): n for y, n in sorted(self.birth_years.items())}}
+        if years:
+            d["years"] = [{"year": y, "ganzhi": gz, "ji": j, "xiong": x} for y, gz, j, x in self.year_hits(*years)]
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        s = cls(d.get("rules"))
+        s.total, s.errors, s.hour_unknown = d["total"], d["errors"], d.get("hour_unknown", 0)
+        s.pillars = {p: list(d["pillars"][p]) for p in PILLARS}
+        s.ji, s.xiong = list(d["ji"]), list(d["xiong"])
+        s.birth_years = Counter({int(y): n for y, n in d.get("birth_years", {}).items()})
+        return s
+
+    def to_csv(self):
+        """按六十甲子一行的 CSV 文本：各柱人数、吉 / 凶人数与占比"""
+        buf = io.StringIO()
+        w = csv.writer(buf)
+        w.writerow(["ganzhi", "year", "month", "day", "hour", "ji", "xiong", "ji_share", "xiong_share"])
+        for i, gz in enumerate(GZS_LIST):
+            w.writerow([gz] + [self.pillars[p][i] for p in PILLARS] + [self.ji[i], self.xiong[i],
+                       f"{self.ji[i] / self.total:.6f}" if self.total else "",
+                       f"{self.xiong[i] / self.total:.6f}" if self.total else ""])
+        return buf.getvalue()
+
+
+def _year_of(rec):
+    return str(rec.get("year") or "")
+
+
+def summarize_chunk(records, table_path=None, rules=None):
+    """一块记录 -> CohortSummary（供进程池调用）"""
+    table = open_shared(table_path) if table_path else None
+    s = CohortSummary(rules)
+    # 汇总与顺序无关：按年排序，sxtwl 每换一个年份才重算一次节气
+    # 只排四柱（chart_record），吉凶由 add_chart 按 rules 参数查一次掩码；记录自带的 rules 字段不用
+    for rec in sorted(records, key=_year_of):
+        try:
+            ymd, r = chart_record(rec, table)
+        except Exception:
+            s.errors += 1
+            continue
+        s.add_chart([GZ_INDEX.get(r[p], -1) for p in PILLARS], ymd[0] if ymd else None)
+    return s
+
+
+def iter_summaries(records, workers=1, chunk_size=CHUNK_SIZE, table_path=None, rules=None):
+    """
+    逐块产出 (累计到目前的 CohortSummary, 已处理记录数)，供进度显示；
+    最后一次产出即全量结果。workers > 1 时各块在进程池中计算，同时在途不超过 workers * 2 块。
+    """
+    total = CohortSummary(rules)
+    done = 0
+    chunks = _chunks(records, chunk_size)
+    if workers is None or workers <= 1:
+        for chunk in chunks:
+            done += len(chunk)
+            yield total.merge(summarize_chunk(chunk, table_path, rules)), done
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((len(chunk), pool.submit(summarize_chunk, chunk, table_path, rules)))
+            if len(pending) >= workers * 2:
+                n, f = pending.popleft()
+                done += n
+                yield total.merge(f.result()), done
+        while pending:
+            n, f = pending.popleft()
+            done += n
+            yield total.merge(f.result()), done
+
+
+def aggregate(records, workers=None, chunk_size=CHUNK_SIZE, table_path=None, rules=None):
+    """汇总全部记录，返回 CohortSummary；workers 缺省为 CPU 核数"""
+    workers = workers or os.cpu_count() or 1
+    summary = CohortSummary(rules)
+    for summary, _ in iter_summaries(records, workers, chunk_size, table_path, rules):
+        pass
+    return summary
+
+
+def _parse_years(s):
+    a, _, b = s.partition("-")
+    return int(a), int(b or a)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bazi.cohort", description="群体吉凶统计（CSV/JSONL 流式）")
+    ap.add_argument("input", help="输入文件（.csv / .jsonl，字段同 bazi.batch），- 表示标准输入")
+    ap.add_argument("--input-format", choices=["csv", "jsonl"], default=None)
+    ap.add_argument("--json", default=None, help="汇总写入此 JSON 文件（默认打印到标准输出）")
+    ap.add_argument("--csv", default=None, help="六十甲子分布写入此 CSV 文件")
+    ap.add_argument("--years", default=None, help="逐年命中人数的年份范围，如 2025-2075")
+    ap.add_argument("--rules", default=None, help="吉凶规则集，默认 default")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="进程数，默认 CPU 核数；1 表示不用进程池")
+    ap.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    ap.add_argument("--daytable", default=None, help="逐日柱表文件，查表代替逐条推算")
+    args = ap.parse_args(argv)
+
+    in_fp = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8") if args.input == "-" \
+        else open(args.input, encoding="utf-8-sig", newline="")
+    fmt = args.input_format or (None if args.input != "-" else "csv")
+    try:
+        summary = aggregate(iter_records(in_fp, fmt), args.workers, args.chunk_size, args.daytable, args.rules)
+    finally:
+        if args.input != "-":
+            in_fp.close()
+    text = json.dumps(summary.to_dict(_parse_years(args.years) if args.years else None), ensure_ascii=False)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            f.write(summary.to_csv())
+    print(f"完成 {summary.total} 条，出错 {summary.errors} 条", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
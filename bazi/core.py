@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+"""
+八字排盘计算核心（不依赖 Streamlit，可在 worker / 批处理中直接导入）
+- 干支基础数据、合冲表、吉凶计算
+- 日柱锚点法、年柱月柱（手动 / sxtwl / 节气表 / 近似节气 + 五虎遁）、时柱五鼠遁
+- 可选真太阳时（出生地经度 + 时区）校正日柱换日与时柱（solartime.py）
+- sxtwl 兼容性包装
+"""
+import datetime
+from bisect import bisect_right
+from datetime import date, timedelta
+
+from .jieqi import year_month_by_jieqi
+# 干支基础数据与合冲表见 ganzhi.py（此处重新导出），整数编码吉凶表见 engine.py
+from .ganzhi import (
+    tiangan, dizhi, GZS_LIST, GZ_INDEX,
+    gan_he, gan_chong, zhi_he, zhi_chong, zhi_next, zhi_prev,
+)
+from .engine import PAIR_CODE, PAIR_STR, JI_PAIRS, XIONG_PAIRS, analyze_codes
+from .rules import get_rules
+from .solartime import BEIJING_TZ, beijing_time, check_place, check_tz, true_solar_time
+
+# sxtwl（若安装）：接口形态在 sxtwl_adapter 中探测一次，按日期缓存
+from .sxtwl_adapter import HAVE_SXTWL, get_adapter, load_sxtwl
+from . import metrics
+
+# ---------- 干支年份索引 ----------
+YEAR_BASE = 1984  # 甲子年
+YEAR_RANGE = (1900, 2100)
+
+def year_ganzhi_map(start=1900, end=2100):
+    return {y: GZS_LIST[(y-YEAR_BASE)%60] for y in range(start, end+1)}
+
+def _stride_years(idx, start, end):
+    # 年干支序号 = (y - YEAR_BASE) % 60，故同一干支的年份是步长 60 的等差数列
+    return range(start + (idx - (start - YEAR_BASE)) % 60, end + 1, 60)
+
+# 干支 -> 默认窗口（1900-2100）内的年份（升序 range），模块加载时建好
+GANZHI_YEARS = {gz: _stride_years(i, *YEAR_RANGE) for i, gz in enumerate(GZS_LIST)}
+
+def ganzhi_years(gz, start=YEAR_RANGE[0], end=YEAR_RANGE[1]):
+    """干支 -> [start, end] 内该干支的所有年份（升序 range，可直接 bisect）；非法干支返回空"""
+    if (start, end) == YEAR_RANGE:
+        return GANZHI_YEARS.get(gz, range(0))
+    idx = GZ_INDEX.get(gz)
+    if idx is None:
+        return range(0)
+    return _stride_years(idx, start, end)
+
+# ---------- 吉凶计算（默认保持你原规则；字符串接口，内部走 engine / rules 的整数表） ----------
+# rules：规则集名称（见 rules.RULE_SETS）或 CompiledRules，缺省为默认规则；名称不存在时抛 ValueError
+def calc_jixiong(gz, rules=None):
+    code = PAIR_CODE.get(gz[:2]) if gz else None
+    if code is None:
+        return {"吉": [], "凶": []}
+    ji_pairs, xiong_pairs = (JI_PAIRS, XIONG_PAIRS) if rules is None else \
+        (get_rules(rules).ji_pairs, get_rules(rules).xiong_pairs)
+    return {"吉": [PAIR_STR[c] for c in ji_pairs[code]], "凶": [PAIR_STR[c] for c in xiong_pairs[code]]}
+
+def analyze_bazi(nianzhu, yuezhu, rizhu, shizhu, rules=None):
+    pillars = [p for p in (nianzhu, yuezhu, rizhu) if p]
+    if shizhu and str(shizhu).strip() and str(shizhu).strip() != "不知道":
+        pillars.append(shizhu)
+    codes = []
+    for p in pillars:
+        c = PAIR_CODE.get(p[:2])
+        if c is not None:
+            codes.append(c)
+    # 去重但保序（位掩码）
+    ji, xiong = analyze_codes(codes, rules)
+    return [PAIR_STR[c] for c in ji], [PAIR_STR[c] for c in xiong]
+
+# ---------- 日柱（锚点法） ----------
+ANCHOR_DATE = date(1984,1,1)
+ANCHOR_GZ = "甲午"
+ANCHOR_INDEX = GZS_LIST.index(ANCHOR_GZ)
+
+def day_ganzhi_by_anchor(y, m, d, hour=None, minute=None):
+    # 23:00 及以后归入次日
+    if hour is not None and hour >= 23:
+        target = date(y,m,d) + timedelta(days=1)
+    else:
+        target = date(y,m,d)
+    delta = (target - ANCHOR_DATE).days
+    idx = (ANCHOR_INDEX + delta) % 60
+    return GZS_LIST[idx]
+
+# ---------- 月柱（手动输入优先 / 否则近似节气分月 + 五虎遁） ----------
+# 五虎遁起始天干（寅月起点）
+def month_stem_by_fihu_dun(year_tg, month_branch):
+    if year_tg in ("甲","己"): start = "丙"
+    elif year_tg in ("乙","庚"): start = "戊"
+    elif year_tg in ("丙","辛"): start = "庚"
+    elif year_tg in ("丁","壬"): start = "壬"
+    elif year_tg in ("戊","癸"): start = "甲"
+    else: start = "丙"
+    start_idx = tiangan.index(start)
+    offset = (dizhi.index(month_branch) - dizhi.index("寅")) % 12
+    stem_idx = (start_idx + offset) % 10
+    return tiangan[stem_idx] + month_branch
+
+APPROX_JIEQI = {
+    "立春": (2,4), "惊蛰": (3,6), "清明": (4,5), "立夏": (5,6),
+    "芒种": (6,6), "小暑": (7,7), "立秋": (8,7), "白露": (9,7),
+    "寒露": (10,8), "立冬": (11,7), "大雪": (12,7), "小寒": (1,6)
+}
+# 节的月日（MMDD）按时间排序：小寒(丑) 立春(寅) …… 大雪(子)；模块加载时计算一次
+APPROX_JIE_MD = sorted(m*100 + d for m, d in APPROX_JIEQI.values())
+def get_month_branch_approx(year, month, day):
+    """近似节气定月支（超出节气表范围时的后备）：一次二分查找，不分配对象"""
+    # 小寒前为子月，小寒起丑月，立春起寅月 …… 大雪起子月
+    return dizhi[bisect_right(APPROX_JIE_MD, month*100 + day) % 12]
+
+# ---------- 时柱（分钟精确） 五鼠遁规则 ----------
+# 时辰地支区间（采用说明中的区间）
+# 子时：23:00-00:59, 丑:01:00-02:59, 寅:03:00-04:59 ... 以此类推
+def get_hour_branch_by_minute(hour, minute):
+    if hour is None:
+        return None
+    tot = hour*60 + (minute or 0)
+    # 子时：23:00-23:59 and 0:00-0:59 => we map these to index 0
+    if tot >= 23*60 or tot < 1*60:
+        return "子", 0
+    # else compute ((tot - 60) // 120) -> 0..11 mapping to 丑..亥? We'll just build boundaries:
+    intervals = [
+        (1*60, 3*60, "丑"),
+        (3*60, 5*60, "寅"),
+        (5*60, 7*60, "卯"),
+        (7*60, 9*60, "辰"),
+        (9*60, 11*60, "巳"),
+        (11*60, 13*60, "午"),
+        (13*60, 15*60, "未"),
+        (15*60, 17*60, "申"),
+        (17*60, 19*60, "酉"),
+        (19*60, 21*60, "戌"),
+        (21*60, 23*60, "亥"),
+    ]
+    for i, (s,e,name) in enumerate(intervals):
+        if s <= tot < e:
+            return name, i+1  # i+1 because 0 reserved for 子
+    return "子", 0
+
+def time_ganzhi_by_rule(day_gz, hour, minute):
+    if hour is None:
+        return "不知道"
+    branch, idx = get_hour_branch_by_minute(hour, minute)
+    # day_gz is like '丙午', day_gan = day_gz[0]
+    day_gan = day_gz[0]
+    # 起始映射（五鼠遁）
+    if day_gan in ("甲","己"): start = tiangan.index("甲")
+    elif day_gan in ("乙","庚"): start = tiangan.index("丙")
+    elif day_gan in ("丙","辛"): start = tiangan.index("戊")
+    elif day_gan in ("丁","壬"): start = tiangan.index("庚")
+    elif day_gan in ("戊","癸"): start = tiangan.index("壬")
+    else: start = 0
+    tg_idx = (start + idx) % 10
+    return tiangan[tg_idx] + branch
+
+# ---------- sxtwl 兼容性包装（尽力尝试多种api） ----------
+# calc_bazi 直接使用 sxtwl_adapter；以下函数保留给按 dayobj 操作的调用方
+def try_sxtwl_from_solar(y,m,d):
+    """尝试用 sxtwl 提取 dayobj（返回 None 则不可用；经适配器缓存）"""
+    adapter = get_adapter() if HAVE_SXTWL else None
+    if adapter is None:
+        return None
+    return adapter.day(int(y), int(m), int(d))[0]
+
+def extract_gz_from_dayobj_day(dayobj):
+    """从 dayobj 尝试提取 year/month/day gz（返回 tuple 或 (None,None,None)）"""
+    if dayobj is None:
+        return None, None, None
+    # 尝试 getYearGZ/getMonthGZ/getDayGZ
+    def get_gz(fn):
+        try:
+            val = fn()
+            # val 有可能是对象有 .tg/.dz，也可能是 tuple/list
+            if hasattr(val, "tg") and hasattr(val, "dz"):
+                return tiangan[int(val.tg)] + dizhi[int(val.dz)]
+            elif isinstance(val, (list,tuple)) and len(val) >= 2:
+                return tiangan[int(val[0])] + dizhi[int(val[1])]
+        except Exception:
+            pass
+        return None
+    yg = get_gz(getattr(dayobj, "getYearGZ", lambda: None))
+    mg = get_gz(getattr(dayobj, "getMonthGZ", lambda: None))
+    dg = get_gz(getattr(dayobj, "getDayGZ", lambda: None))
+    return yg, mg, dg
+
+def extract_hour_from_dayobj(dayobj, hour):
+    """尝试从 dayobj 中提取时柱，返回字符串或 None"""
+    if dayobj is None:
+        return None
+    # 尝试 dayobj.getHourGZ(hour)
+    try:
+        if hasattr(dayobj, "getHourGZ"):
+            val = dayobj.getHourGZ(int(hour))
+            if hasattr(val, "tg") and hasattr(val, "dz"):
+                return tiangan[int(val.tg)] + dizhi[int(val.dz)]
+            elif isinstance(val, (list,tuple)) and len(val) >=2:
+                return tiangan[int(val[0])] + dizhi[int(val[1])]
+    except Exception:
+        pass
+    # 尝试 sxtwl.getShiGz (some libs)
+    sxtwl = load_sxtwl()
+    try:
+        if hasattr(sxtwl, "getShiGz"):
+            # need day_tg index
+            try:
+                daygz = extract_gz_from_dayobj_day(dayobj)[2]
+                if daygz:
+                    day_tg_idx = tiangan.index(daygz[0])
+                    val = sxtwl.getShiGz(day_tg_idx, int(hour))
+                    if hasattr(val, "tg") and hasattr(val, "dz"):
+                        return tiangan[int(val.tg)] + dizhi[int(val.dz)]
+                    elif isinstance(val, (list,tuple)) and len(val)>=2:
+                        return tiangan[int(val[0])] + dizhi[int(val[1])]
+            except Exception:
+                pass
+    except Exception:
+        pass
+    return None
+
+# ---------- 合并推算流程 ----------
+def calc_bazi(year, month, day, hour=None, minute=None, manual_month_branch=None, use_sxtwl_for_compare=False, prefer_sxtwl=False,
+              longitude=None, tz=None):
+    """
+    返回 dict:
+    {
+      "year": year_pillar,
+      "month": month_pillar,
+      "day": day_pillar,           # 默认使用锚点法（anchor）
+      "hour": hour_pillar,         # 默认使用规则（五鼠遁），但如果 prefer_sxtwl=True 且 sxtwl可用会覆盖
+      "sxtwl": {"year":..., "month":..., "day":..., "hour":...}  # 若能从sxtwl提取
+      "source": "anchor/approx/sxtwl"  # 简单说明
+      "true_solar": "YYYY-MM-DD HH:MM"  # 仅在给出 longitude 且时辰已知时：日柱、时柱所用的真太阳时
+    }
+    longitude 为出生地经度（东经为正），tz 为钟表时间的时区（小时，缺省北京时间 8）：年柱、月柱按换算到
+    北京时间的时刻查节气；日柱换日与时柱给出经度时按真太阳时，只给 tz 时按当地钟表时间（见 apply_true_solar）
+    """
+    if not metrics.ENABLED:
+        return _calc_bazi_at(year, month, day, hour, minute, manual_month_branch, prefer_sxtwl, longitude, tz)
+    with metrics.timer("calc_bazi"):
+        res = _calc_bazi_at(year, month, day, hour, minute, manual_month_branch, prefer_sxtwl, longitude, tz)
+    for tag in res["source"].split(";"):
+        if tag:
+            metrics.incr("source", branch=tag)
+    return res
+
+
+def _calc_bazi_at(year, month, day, hour, minute, manual_month_branch, prefer_sxtwl, longitude, tz):
+    if longitude is None and tz is None:
+        return _calc_bazi(year, month, day, hour, minute, manual_month_branch, prefer_sxtwl)
+    longitude, tz = check_place(longitude, tz) if longitude is not None else (None, check_tz(tz))
+    # 节气表、sxtwl 均为北京时间：年柱、月柱按换算到北京时间的时刻排，日柱、时柱再按当地时间替换
+    res = _calc_bazi(*beijing_time(year, month, day, hour, minute, tz), manual_month_branch, prefer_sxtwl)
+    return apply_true_solar(res, year, month, day, hour, minute, longitude, tz, prefer_sxtwl)
+
+
+def _calc_bazi(year, month, day, hour, minute, manual_month_branch, prefer_sxtwl):
+    res = {"year": None, "month": None, "day": None, "hour": None, "sxtwl": {}, "source": ""}
+    # 1) 日柱：采用锚点法（用户要求）
+    day_p = day_ganzhi_by_anchor(year, month, day, hour, minute)
+    res["day"] = day_p
+
+    # 2) 通过 sxtwl 尝试获取年/月/日/时（用于对比或覆盖；适配器按日期缓存）
+    adapter = get_adapter() if HAVE_SXTWL else None
+    s_year = s_month = s_day = s_hour = None
+    with metrics.timer("calc_bazi.sxtwl"):
+        s_dayobj = adapter.day(int(year), int(month), int(day)) if adapter is not None else None
+        if s_dayobj is not None and s_dayobj[0] is not None:
+            s_year, s_month, s_day = s_dayobj[1:]
+            if hour is not None and hour >= 0:
+                s_hour = adapter.hour_ganzhi(year, month, day, hour)
+            res["sxtwl"] = {"year": s_year, "month": s_month, "day": s_day, "hour": s_hour}
+    # 3) 年柱、月柱：如果用户手动指定月支（地支），用五虎遁确定月柱；否则优先使用 sxtwl（若有），
+    #    其次查节气表（1900-2100，精确到分钟），再否则近似
+    jq = None
+    if not (s_year and (s_month or manual_month_branch)):
+        with metrics.timer("calc_bazi.jieqi"):
+            jq = year_month_by_jieqi(year, month, day, hour if hour is not None and hour >= 0 else 0, minute or 0)
+    # 年柱
+    if s_year:
+        year_p = s_year
+        res["source"] += "sxtwl_year;"
+    elif jq:
+        year_p = GZS_LIST[(jq[0] - 1984) % 60]
+        res["source"] += "jieqi_year;"
+    else:
+        # 近似年柱，以立春 2/4 作为边界（fallback）
+        birth_dt = datetime.datetime(year, month, day, hour or 0, minute or 0)
+        lichun = datetime.datetime(year, 2, 4, 0, 0)
+        adj_year = year if birth_dt >= lichun else year - 1
+        year_p = GZS_LIST[(adj_year - 1984) % 60]
+        res["source"] += "approx_year;"
+    res["year"] = year_p
+
+    # 月柱
+    if manual_month_branch:
+        month_p = month_stem_by_fihu_dun(res["year"][0], manual_month_branch)
+        res["source"] += "manual_month;"
+    else:
+        if s_month:
+            month_p = s_month
+            res["source"] += "sxtwl_month;"
+        elif jq:
+            # 节气表月支 -> 五虎遁
+            month_p = month_stem_by_fihu_dun(res["year"][0], dizhi[jq[1]])
+            res["source"] += "jieqi_month;"
+        else:
+            # 近似月支 -> 五虎遁
+            mb = get_month_branch_approx(year, month, day)
+            month_p = month_stem_by_fihu_dun(res["year"][0], mb)
+            res["source"] += "approx_month;"
+    res["month"] = month_p
+
+    # 时柱：默认用五鼠遁规则
+    hour_p_rule = None
+    if hour is None or hour < 0:
+        hour_p_rule = "不知道"
+    else:
+        hour_p_rule = time_ganzhi_by_rule(res["day"], hour, minute or 0)
+    res["hour_rule"] = hour_p_rule
+
+    # sxtwl hour available?
+    hour_p_sxtwl = res["sxtwl"].get("hour") if res.get("sxtwl") else None
+
+    # 决定最终时柱：优先规则（默认）；若 prefer_sxtwl True 并 sxtwl可用则覆盖
+    if prefer_sxtwl and hour_p_sxtwl:
+        res["hour"] = hour_p_sxtwl
+        res["source"] += "sxtwl_hour_used;"
+    else:
+        res["hour"] = hour_p_rule
+        res["source"] += "rule_hour_used;"
+
+    # 日柱：我们以锚点法为主；如果 sxtwl 可用并用户要求对比，则会在界面展示
+    res["sxtwl_day"] = res["sxtwl"].get("day")
+    return res
+
+
+def apply_true_solar(res, year, month, day, hour, minute, longitude, tz=None, prefer_sxtwl=False):
+    """
+    按北京时间排出的结果（年柱、月柱以此为准）-> 日柱、时柱改按出生地真太阳时（返回新 dict）；
+    longitude 为 None 时改按 tz 的当地钟表时间（tz 为北京时间则原样返回）。
+    year ... minute 为出生地的钟表时间；时辰未知时原样返回。
+    批量路径先用 solartime.beijing_time 换算后查缓存 / 逐日柱表，再调用本函数。
+    """
+    if hour is None or hour < 0:
+        return res
+    if longitude is None:
+        if check_tz(tz) == BEIJING_TZ:
+            return res
+        sy, sm, sd, sh, smin = year, month, day, hour, minute or 0
+    else:
+        sy, sm, sd, sh, smin = true_solar_time(year, month, day, hour, minute or 0, longitude, tz)
+    out = dict(res)
+    out["day"] = day_ganzhi_by_anchor(sy, sm, sd, sh, smin)
+    out["hour_rule"] = hour_p = time_ganzhi_by_rule(out["day"], sh, smin)
+    if prefer_sxtwl and "sxtwl_hour_used;" in res["source"]:
+        adapter = get_adapter() if HAVE_SXTWL else None
+        hour_p = (adapter.hour_ganzhi(sy, sm, sd, sh) if adapter is not None else None) or hour_p
+    out["hour"] = hour_p
+    if longitude is None:
+        out["source"] = res["source"] + "local_time;"
+        return out
+    out["true_solar"] = f"{sy:04d}-{sm:02d}-{sd:02d} {sh:02d}:{smin:02d}"
+    out["source"] = res["source"] + "true_solar;"
+    return out
+
+
+def _sxtwl_cache_stats():
+    adapter = get_adapter() if HAVE_SXTWL else None
+    return adapter.cache_stats() if adapter is not None else {}
+
+
+metrics.register_collector("sxtwl_day_cache", _sxtwl_cache_stats)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+逐日柱表：预先计算 1900-2100 每一天的年柱、月柱、日柱序号（与 calc_bazi 一致：
+sxtwl 可用时年月取 sxtwl，否则取节气表；日柱为锚点法），写成定长二进制文件，
+各 worker 进程以只读 mmap 打开，共享同一份页缓存，无需各自导入 sxtwl 或重算。
+时柱由日干按五鼠遁算出，查表后只需整数运算。
+
+文件格式（小端序）：
+  头部 16 字节：magic b"BZDT" | version u16 | flags u16 | 起始日 ordinal u32 | 天数 u32
+  每天 4 字节：年柱 u8 | 月柱 u8 | 日柱 u8 | 标志 u8
+  头部 flags bit0：年月取自 sxtwl（日粒度）；否则取自节气表
+  每日标志 bit0：当天有“节”交接（节气表来源时，年月需按出生时分重新判断）
+
+用法：
+  python -m bazi.daytable build daytable.bin
+"""
+import mmap
+import struct
+import sys
+from datetime import date
+
+from . import jieqi
+from .ganzhi import GZ_INDEX, hour_pillar_index, month_pillar_index
+from .solartime import beijing_time, true_solar_time
+
+MAGIC = b"BZDT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+RECORD_SIZE = 4
+FLAG_SXTWL = 1
+DAY_HAS_JIE = 1
+
+
+def build(path, start=date(1900, 1, 1), end=date(2100, 12, 31)):
+    """逐日调用 calc_bazi 生成表文件，返回天数"""
+    from .core import HAVE_SXTWL, calc_bazi
+    from .sxtwl_adapter import get_adapter
+    # 与 calc_bazi 实际所用一致：sxtwl 可导入但适配失败时按节气表排，标志也不能置位
+    flags = FLAG_SXTWL if HAVE_SXTWL and get_adapter() is not None else 0
+    n = end.toordinal() - start.toordinal() + 1
+    jie_days = {jieqi.EPOCH.toordinal() + t // 1440 for t in jieqi.JIE_TABLE}
+    buf = bytearray(HEADER.size + n * RECORD_SIZE)
+    HEADER.pack_into(buf, 0, MAGIC, VERSION, flags, start.toordinal(), n)
+    off = HEADER.size
+    for o in range(start.toordinal(), start.toordinal() + n):
+        d = date.fromordinal(o)
+        r = calc_bazi(d.year, d.month, d.day)
+        buf[off] = GZ_INDEX[r["year"]]
+        buf[off + 1] = GZ_INDEX[r["month"]]
+        buf[off + 2] = GZ_INDEX[r["day"]]
+        buf[off + 3] = DAY_HAS_JIE if o in jie_days else 0
+        off += RECORD_SIZE
+    with open(path, "wb") as f:
+        f.write(buf)
+    return n
+
+
+class DayTable:
+    """只读 mmap 的逐日柱表；多个进程打开同一文件时共享物理内存"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, start, n = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"不是有效的逐日柱表文件：{path}")
+        if len(self._mm) < HEADER.size + n * RECORD_SIZE:
+            self._mm.close()
+            raise ValueError(f"逐日柱表文件不完整：{path}")
+        self._mv = memoryview(self._mm)
+        self.path = path
+        self.from_sxtwl = bool(flags & FLAG_SXTWL)
+        self.start = start
+        self.count = n
+
+    def close(self):
+        self._mv.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, y, m, d):
+        i = date(y, m, d).toordinal() - self.start
+        if not 0 <= i < self.count:
+            raise KeyError(f"{y}-{m}-{d} 超出逐日柱表范围")
+        return HEADER.size + i * RECORD_SIZE
+
+    def lookup(self, y, m, d, hour=None, minute=None, manual_month_branch=None, longitude=None, tz=None):
+        """
+        返回 (年柱, 月柱, 日柱, 时柱) 序号，时辰未知时时柱为 -1。
+        manual_month_branch 为地支序号（0-11），按五虎遁定月干。
+        longitude / tz 同 calc_bazi：年柱、月柱按换算到北京时间的时刻，日柱、时柱按真太阳时（无经度时按
+        当地钟表时间）。
+        """
+        if (longitude is not None or tz is not None) and hour is not None and hour >= 0:
+            yi, mi, _, _ = self.lookup(*beijing_time(y, m, d, hour, minute, tz), manual_month_branch)
+            if longitude is None:
+                sy, sm, sd, sh, smin = y, m, d, hour, minute or 0
+            else:
+                sy, sm, sd, sh, smin = true_solar_time(y, m, d, hour, minute or 0, longitude, tz)
+            # 真太阳时可能跨到表外的前一天，日柱由当地日期的日柱按天数平移
+            di = (self._mv[self._offset(y, m, d) + 2] + date(sy, sm, sd).toordinal() - date(y, m, d).toordinal()
+                  + (sh >= 23)) % 60
+            return yi, mi, di, hour_pillar_index(di, sh, smin)
+        mv = self._mv
+        off = self._offset(y, m, d)
+        yi, mi, di = mv[off], mv[off + 1], mv[off + 2]
+        has_hour = hour is not None and hour >= 0
+        if has_hour and not self.from_sxtwl and mv[off + 3] & DAY_HAS_JIE:
+            # 交节当天按出生时分查节气表
+            jy, branch = jieqi.year_month_by_jieqi(y, m, d, hour, minute or 0)
+            yi = (jy - 1984) % 60
+            mi = month_pillar_index(yi, branch)
+        if manual_month_branch is not None:
+            mi = month_pillar_index(yi, manual_month_branch)
+        if not has_hour:
+            return yi, mi, di, -1
+        if hour >= 23:
+            # 23:00 及以后归入次日
+            di = (di + 1) % 60
+        return yi, mi, di, hour_pillar_index(di, hour, minute or 0)
+
+    def as_array(self):
+        """零拷贝的 (天数, 4) uint8 numpy 视图：列依次为年柱、月柱、日柱、标志"""
+        import numpy as np
+        return np.frombuffer(self._mm, dtype=np.uint8, count=self.count * RECORD_SIZE,
+                             offset=HEADER.size).reshape(self.count, RECORD_SIZE)
+
+
+_OPENED = {}
+
+
+def open_shared(path):
+    """同一进程内对同一路径只 mmap 一次"""
+    t = _OPENED.get(path)
+    if t is None:
+        t = _OPENED[path] = DayTable(path)
+    return t
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] != "build":
+        print("用法：python -m bazi.daytable build <输出文件>", file=sys.stderr)
+        return 2
+    n = build(argv[1])
+    print(f"已写入 {argv[1]}（{n} 天）", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
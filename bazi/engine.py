@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+整数编码的吉凶引擎
+- 柱：六十甲子序号 0-59（GZS_LIST 下标；-1 表示无此柱，如时辰未知）
+- 干支组合码 pair = 天干序号 * 12 + 地支序号（0-119）。“双合进一 / 双冲退一”得到的组合
+  （如 己寅）天干地支奇偶不一致，不属于六十甲子，只能用组合码表示
+- JI_MASK / XIONG_MASK：每柱一行的 60 位掩码（bit i 对应 GZS_LIST[i]），一张命盘的吉凶
+  即至多四行的按位或
+默认规则与原 calc_jixiong 一致：天干五合 + 地支六合（及地支进一）为吉，天干四冲 + 地支对冲
+（及地支退一）为凶；其他规则集见 rules.py，chart_masks / analyze_codes 的 rules 参数可按名称选用。
+"""
+from .ganzhi import tiangan, dizhi, GZS_LIST, GZ_INDEX
+from .rules import N_PAIRS, get_rules
+
+PAIR_STR = [tiangan[c // 12] + dizhi[c % 12] for c in range(N_PAIRS)]
+PAIR_CODE = {s: c for c, s in enumerate(PAIR_STR)}
+
+# 默认规则集（rules.py 中 "default"）的查找表：组合码 -> 有序的吉 / 凶组合码，六十甲子序号 -> 吉 / 凶掩码
+_DEFAULT = get_rules()
+JI_PAIRS = _DEFAULT.ji_pairs
+XIONG_PAIRS = _DEFAULT.xiong_pairs
+JI_MASK = _DEFAULT.ji_mask
+XIONG_MASK = _DEFAULT.xiong_mask
+
+
+def chart_masks(pillars, rules=None):
+    """柱序号序列（负数跳过）-> (吉掩码, 凶掩码)；rules 为规则集名称或 CompiledRules，缺省为默认规则"""
+    if rules is not None:
+        return get_rules(rules).chart_masks(pillars)
+    ji = xiong = 0
+    for p in pillars:
+        if p >= 0:
+            ji |= JI_MASK[p]
+            xiong |= XIONG_MASK[p]
+    return ji, xiong
+
+
+def iter_mask(mask):
+    """按序号升序产出掩码中置位的六十甲子序号"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def mask_to_ganzhi(mask):
+    return [GZS_LIST[i] for i in iter_mask(mask)]
+
+
+def mask_of(gz_list):
+    """干支字符串列表 -> 掩码（非六十甲子的组合忽略）"""
+    m = 0
+    for gz in gz_list:
+        i = GZ_INDEX.get(gz)
+        if i is not None:
+            m |= 1 << i
+    return m
+
+
+def analyze_codes(codes, rules=None):
+    """组合码序列 -> (吉组合码列表, 凶组合码列表)，按出现顺序去重；rules 同 chart_masks"""
+    if rules is not None:
+        return get_rules(rules).analyze_codes(codes)
+    ji, xiong = [], []
+    seen_ji = seen_xiong = 0
+    for c in codes:
+        for t in JI_PAIRS[c]:
+            if not seen_ji >> t & 1:
+                seen_ji |= 1 << t
+                ji.append(t)
+        for t in XIONG_PAIRS[c]:
+            if not seen_xiong >> t & 1:
+                seen_xiong |= 1 << t
+                xiong.append(t)
+    return ji, xiong
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+干支基础数据与合冲表（纯数据，无依赖；core / engine 共用）
+"""
+tiangan = ["甲","乙","丙","丁","戊","己","庚","辛","壬","癸"]
+dizhi = ["子","丑","寅","卯","辰","巳","午","未","申","酉","戌","亥"]
+GZS_LIST = [tiangan[i%10] + dizhi[i%12] for i in range(60)]
+GZ_INDEX = {gz: i for i, gz in enumerate(GZS_LIST)}
+
+# 天干合（五合）
+gan_he = {"甲":"己","己":"甲","乙":"庚","庚":"乙","丙":"辛","辛":"丙","丁":"壬","壬":"丁","戊":"癸","癸":"戊"}
+# 仅四冲（用户要求，去掉戊己）
+gan_chong = {"甲":"庚","庚":"甲","乙":"辛","辛":"乙","丙":"壬","壬":"丙","丁":"癸","癸":"丁"}
+# 地支合（六合）
+zhi_he = {"子":"丑","丑":"子","寅":"亥","亥":"寅","卯":"戌","戌":"卯","辰":"酉","酉":"辰","巳":"申","申":"巳","午":"未","未":"午"}
+# 地支冲（对冲）
+zhi_chong = {dz: dizhi[(i+6)%12] for i, dz in enumerate(dizhi)}
+
+def zhi_next(z): return dizhi[(dizhi.index(z)+1)%12]
+def zhi_prev(z): return dizhi[(dizhi.index(z)-1)%12]
+
+# ---------- 整数序号运算（六十甲子序号 idx：idx % 10 为天干，idx % 12 为地支） ----------
+def ganzhi_index(stem, branch):
+    """天干序号 + 地支序号 -> 六十甲子序号（二者奇偶须一致；对 numpy 数组同样适用）"""
+    return (6 * stem - 5 * branch) % 60
+
+def hour_branch_index(hour, minute=0):
+    """时分 -> 时辰地支序号（23:00-00:59 为子 0，01:00 起丑 1 ……）"""
+    return ((hour * 60 + minute + 60) // 120) % 12
+
+def hour_pillar_index(day_idx, hour, minute=0):
+    """五鼠遁：日柱序号 + 时分 -> 时柱序号（甲己起甲、乙庚起丙、丙辛起戊、丁壬起庚、戊癸起壬）"""
+    branch = hour_branch_index(hour, minute)
+    return ganzhi_index((day_idx % 5 * 2 + branch) % 10, branch)
+
+def month_pillar_index(year_idx, branch):
+    """五虎遁：年柱序号 + 月支序号 -> 月柱序号（甲己起丙、乙庚起戊、丙辛起庚、丁壬起壬、戊癸起甲）"""
+    return ganzhi_index((year_idx % 5 * 2 + 2 + (branch - 2) % 12) % 10, branch)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+节气（节）时刻表：1900-2100 年每年 12 个“节”（小寒、立春、惊蛰 …… 大雪）的北京时间，
+精确到分钟，存为有序整数数组（自 1900-01-01 00:00 起的分钟数）。
+年柱、月支由出生时刻在表中的一次二分查找得到，不依赖 sxtwl。
+
+表数据在 _jieqi_data.py 中，由 sxtwl 生成：
+  python -m bazi.jieqi --build
+"""
+import base64
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+
+from . import _jieqi_data
+
+START_YEAR = _jieqi_data.START_YEAR
+END_YEAR = _jieqi_data.END_YEAR
+# 每个“节”起始的月支：小寒 -> 丑 …… 大雪 -> 子
+JIE_NAMES = ["小寒","立春","惊蛰","清明","立夏","芒种","小暑","立秋","白露","寒露","立冬","大雪"]
+
+EPOCH = date(START_YEAR, 1, 1)
+_EPOCH_ORD = EPOCH.toordinal()
+# 表覆盖的时刻范围 [0, END_MINUTE)
+END_MINUTE = (date(END_YEAR + 1, 1, 1).toordinal() - _EPOCH_ORD) * 1440
+
+
+def _load_table():
+    t = array("i")
+    t.frombytes(base64.b64decode(_jieqi_data.DATA))
+    if sys.byteorder == "big":
+        t.byteswap()
+    return t
+
+
+# 第 k 项：公历 START_YEAR + k // 12 年的第 k % 12 个节（JIE_NAMES 顺序）
+JIE_TABLE = _load_table()
+
+
+def to_minutes(y, m, d, hour=0, minute=0):
+    """公历时刻 -> 自 1900-01-01 00:00 起的分钟数"""
+    return (date(y, m, d).toordinal() - _EPOCH_ORD) * 1440 + hour * 60 + minute
+
+
+def jie_year_month(ts):
+    """
+    分钟时间戳 -> (年柱所属年份, 月支序号 0-11)；超出表范围返回 None。
+    1900-01-01 至首个小寒之间属 1899 年子月。
+    """
+    if ts < 0 or ts >= END_MINUTE:
+        return None
+    k = bisect_right(JIE_TABLE, ts) - 1
+    y, j = START_YEAR + k // 12, k % 12
+    # j == 0 为小寒（丑月），仍属上一年
+    return (y if j else y - 1), (j + 1) % 12
+
+
+def year_month_by_jieqi(y, m, d, hour=0, minute=0):
+    """公历年月日时分 -> (年柱所属年份, 月支序号)；超出 1900-2100 返回 None"""
+    return jie_year_month(to_minutes(y, m, d, hour, minute))
+
+
+def jie_datetime(k):
+    """表中第 k 项的北京时间 datetime"""
+    return datetime(START_YEAR, 1, 1) + timedelta(minutes=JIE_TABLE[k])
+
+
+# ---------- 生成表（需要 sxtwl） ----------
+# sxtwl 的节气序号：0 冬至、1 小寒、2 大寒、3 立春 …… 23 大雪；奇数为“节”
+_JD_EPOCH = 2415020.5  # 1900-01-01 00:00 的儒略日（sxtwl 的 jd 为北京时间）
+
+
+def build_table(start=START_YEAR, end=END_YEAR):
+    import sxtwl
+    end_minute = (date(end + 1, 1, 1).toordinal() - date(start, 1, 1).toordinal()) * 1440
+    jd0 = _JD_EPOCH + (date(start, 1, 1).toordinal() - _EPOCH_ORD)
+    seen = set()
+    for yr in range(start - 1, end + 2):
+        for jq in sxtwl.getJieQiByYear(yr):
+            if jq.jqIndex % 2 == 1:
+                ts = int(round((jq.jd - jd0) * 1440))
+                if 0 <= ts < end_minute:
+                    seen.add(ts)
+    table = sorted(seen)
+    if len(table) != (end - start + 1) * 12:
+        raise RuntimeError(f"节气数量不符：{len(table)}")
+    return table
+
+
+def write_data_module(table, path, start=START_YEAR, end=END_YEAR):
+    a = array("i", table)
+    if sys.byteorder == "big":
+        a.byteswap()
+    b64 = base64.b64encode(a.tobytes()).decode("ascii")
+    lines = [b64[i:i + 76] for i in range(0, len(b64), 76)]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# -*- coding: utf-8 -*-\n")
+        f.write("# 由 python -m bazi.jieqi --build 生成（sxtwl），请勿手工修改\n")
+        f.write("# 内容：每年 12 个节的北京时间，自 1900-01-01 00:00 起的分钟数，int32 小端序\n")
+        f.write(f"START_YEAR = {start}\nEND_YEAR = {end}\n")
+        f.write("DATA = (\n" + "".join(f'    "{ln}"\n' for ln in lines) + ")\n")
+
+
+if __name__ == "__main__":
+    import os
+    if "--build" in sys.argv:
+        out = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_jieqi_data.py")
+        write_data_module(build_table(), out)
+        print(f"已写入 {out}")
+    else:
+        for k in range(12):
+            print(JIE_NAMES[k], jie_datetime(k))
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+农历 <-> 公历转换
+- 农历 1900-2100 年：内置压缩表（_lunar_data.py，每年一个整数：各月大小 + 闰月位置），
+  单条与批量转换都只需算术 + 二分查找，运行时不依赖 sxtwl / lunarcalendar
+- 超出表范围：农历 -> 公历优先 sxtwl.fromLunar（若可用），否则 lunarcalendar；
+  公历 -> 农历使用 lunarcalendar
+表由 sxtwl 生成：python -m bazi.lunar --build
+逐月表在第一次转换（或访问 MONTH_START 等属性）时才展开，导入本模块不做计算。
+"""
+import sys
+from bisect import bisect_right
+from datetime import date
+
+from . import _lunar_data, metrics
+from .sxtwl_adapter import HAVE_SXTWL, get_adapter
+
+START_YEAR = _lunar_data.START_YEAR
+END_YEAR = _lunar_data.END_YEAR
+# 农历 START_YEAR 年正月初一
+FIRST_DAY = date.fromordinal(_lunar_data.FIRST_ORDINAL)
+
+
+def _expand(year_info, first_ordinal):
+    """
+    年表 -> 逐月表：
+      MONTH_START[k]  第 k 个农历月初一的 ordinal（末尾多一个哨兵：表尾次日）
+      MONTH_YEAR / MONTH_NUM / MONTH_LEAP  第 k 个月的农历年、月序号、是否闰月
+      YEAR_FIRST[i]   农历 START_YEAR + i 年正月在逐月表中的下标
+    """
+    starts, years, nums, leaps, firsts = [], [], [], [], []
+    o = first_ordinal
+    for i, info in enumerate(year_info):
+        leap_month = info >> 13
+        firsts.append(len(starts))
+        n = 13 if leap_month else 12
+        for slot in range(n):
+            num = slot + 1 if not leap_month or slot < leap_month else slot
+            starts.append(o)
+            years.append(START_YEAR + i)
+            nums.append(num)
+            leaps.append(bool(leap_month) and slot == leap_month)
+            o += 30 if info >> slot & 1 else 29
+    starts.append(o)
+    return starts, years, nums, leaps, firsts
+
+
+# 按需展开的表：MONTH_START, MONTH_YEAR, MONTH_NUM, MONTH_LEAP, YEAR_FIRST, LEAP_MONTH,
+# END_ORDINAL（表覆盖 [FIRST_ORDINAL, END_ORDINAL)）
+_TABLE_NAMES = ("MONTH_START", "MONTH_YEAR", "MONTH_NUM", "MONTH_LEAP", "YEAR_FIRST", "LEAP_MONTH", "END_ORDINAL")
+_loaded = False
+
+
+def _load_tables():
+    global MONTH_START, MONTH_YEAR, MONTH_NUM, MONTH_LEAP, YEAR_FIRST, LEAP_MONTH, END_ORDINAL, _loaded
+    if _loaded:
+        return
+    tables = _expand(_lunar_data.YEAR_INFO, _lunar_data.FIRST_ORDINAL)
+    LEAP_MONTH = [info >> 13 for info in _lunar_data.YEAR_INFO]
+    END_ORDINAL = tables[0][-1]
+    MONTH_START, MONTH_YEAR, MONTH_NUM, MONTH_LEAP, YEAR_FIRST = tables
+    _loaded = True  # 最后置位：其他线程看到 True 时各表均已就绪
+
+
+def __getattr__(name):
+    if name in _TABLE_NAMES:
+        _load_tables()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def leap_month_of(ly):
+    """农历年的闰月（0 表示无闰月）"""
+    if not _loaded:
+        _load_tables()
+    return LEAP_MONTH[ly - START_YEAR]
+
+
+def lunar_month_index(ly, lm, isleap=False):
+    """农历年月 -> 逐月表下标；该月不存在时抛 ValueError"""
+    if not _loaded:
+        _load_tables()
+    leap = LEAP_MONTH[ly - START_YEAR]
+    if not 1 <= lm <= 12 or (isleap and lm != leap):
+        raise ValueError(f"农历 {ly}年{'闰' if isleap else ''}{lm}月 不存在")
+    return YEAR_FIRST[ly - START_YEAR] + lm - 1 + (1 if leap and (lm > leap or isleap) else 0)
+
+
+def _lunar_to_ordinal(ly, lm, ld, isleap):
+    k = lunar_month_index(ly, lm, isleap)
+    start = MONTH_START[k]
+    if not 1 <= ld <= MONTH_START[k + 1] - start:
+        raise ValueError(f"农历 {ly}年{'闰' if isleap else ''}{lm}月{ld}日 不存在")
+    return start + ld - 1
+
+
+def _lunar_to_solar_fallback(ly, lm, ld, isleap):
+    solar = None
+    adapter = get_adapter() if HAVE_SXTWL else None
+    if adapter is not None:
+        try:
+            with metrics.timer("lunar_to_solar.sxtwl"):
+                solar = adapter.lunar_to_solar(ly, lm, ld, isleap)
+        except Exception:
+            solar = None
+    if solar is None:
+        # fallback: use lunarcalendar Converter
+        with metrics.timer("lunar_to_solar.lunarcalendar"):
+            from lunarcalendar import Converter, Lunar
+            lunar_obj = Lunar(int(ly), int(lm), int(ld), bool(isleap))
+            s = Converter.Lunar2Solar(lunar_obj)
+            solar = s.year, s.month, s.day
+        if metrics.ENABLED:
+            metrics.incr("lunar_path", path="lunarcalendar")
+    elif metrics.ENABLED:
+        metrics.incr("lunar_path", path="sxtwl")
+    return solar
+
+
+def lunar_to_solar(ly, lm, ld, isleap=False):
+    """农历年月日（可选闰月）转公历，返回 (year, month, day)；日期不存在时抛出异常"""
+    ly, lm, ld = int(ly), int(lm), int(ld)
+    if START_YEAR <= ly <= END_YEAR:
+        if metrics.ENABLED:
+            metrics.incr("lunar_path", path="table")
+        d = date.fromordinal(_lunar_to_ordinal(ly, lm, ld, bool(isleap)))
+        return d.year, d.month, d.day
+    return _lunar_to_solar_fallback(ly, lm, ld, isleap)
+
+
+def solar_to_lunar(y, m, d):
+    """公历转农历，返回 (农历年, 月, 日, 是否闰月)"""
+    if not _loaded:
+        _load_tables()
+    o = date(int(y), int(m), int(d)).toordinal()
+    if MONTH_START[0] <= o < END_ORDINAL:
+        k = bisect_right(MONTH_START, o) - 1
+        return MONTH_YEAR[k], MONTH_NUM[k], o - MONTH_START[k] + 1, MONTH_LEAP[k]
+    from lunarcalendar import Converter, Solar
+    lu = Converter.Solar2Lunar(Solar(int(y), int(m), int(d)))
+    return lu.year, lu.month, lu.day, bool(lu.isleap)
+
+
+def lunar_to_solar_many(rows):
+    """批量农历 -> 公历：rows 为 (年, 月, 日[, 闰月]) 序列，返回 (年, 月, 日) 列表"""
+    return [lunar_to_solar(*r) for r in rows]
+
+
+def solar_to_lunar_many(rows):
+    """批量公历 -> 农历：rows 为 (年, 月, 日) 序列，返回 (年, 月, 日, 闰月) 列表"""
+    return [solar_to_lunar(*r) for r in rows]
+
+
+# ---------- 生成表（需要 sxtwl） ----------
+def build_table(start=START_YEAR, end=END_YEAR):
+    """逐日扫描 sxtwl，返回 (首日 ordinal, 每年信息整数列表)"""
+    import sxtwl
+    o = date(start, 1, 1).toordinal()
+    while True:
+        d = date.fromordinal(o)
+        day = sxtwl.fromSolar(d.year, d.month, d.day)
+        if day.getLunarYear() == start and day.getLunarMonth() == 1 and day.getLunarDay() == 1 and not day.isLunarLeap():
+            break
+        o += 1
+    first = o
+    months = []  # (农历年, 月, 闰, 初一 ordinal)
+    while True:
+        d = date.fromordinal(o)
+        day = sxtwl.fromSolar(d.year, d.month, d.day)
+        if day.getLunarDay() == 1:
+            if day.getLunarYear() > end:
+                months.append((None, None, None, o))
+                break
+            months.append((day.getLunarYear(), day.getLunarMonth(), bool(day.isLunarLeap()), o))
+        o += 29 if day.getLunarDay() == 1 else 1
+    year_info = []
+    for ly in range(start, end + 1):
+        idx = [i for i, mo in enumerate(months[:-1]) if mo[0] == ly]
+        info = 0
+        for slot, i in enumerate(idx):
+            if months[i + 1][3] - months[i][3] == 30:
+                info |= 1 << slot
+            if months[i][2]:
+                info |= months[i][1] << 13
+        if len(idx) != (13 if info >> 13 else 12):
+            raise RuntimeError(f"农历 {ly} 年月数不符：{len(idx)}")
+        year_info.append(info)
+    return first, year_info
+
+
+def write_data_module(first, year_info, path, start=START_YEAR, end=END_YEAR):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("# -*- coding: utf-8 -*-\n")
+        f.write("# 由 python -m bazi.lunar --build 生成（sxtwl），请勿手工修改\n")
+        f.write("# 每个农历年一个整数：bit0-12 依次为各月（含闰月）是否 30 天，bit13-16 为闰月月份（0 无闰月）\n")
+        f.write(f"START_YEAR = {start}\nEND_YEAR = {end}\n")
+        f.write(f"FIRST_ORDINAL = {first}  # {date.fromordinal(first)}，农历 {start} 年正月初一\n")
+        f.write("YEAR_INFO = (\n")
+        for i in range(0, len(year_info), 8):
+            f.write("    " + ", ".join(f"0x{v:05x}" for v in year_info[i:i + 8]) + ",\n")
+        f.write(")\n")
+
+
+if __name__ == "__main__":
+    import os
+    if "--build" in sys.argv:
+        out = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_lunar_data.py")
+        write_data_module(*build_table(), out)
+        print(f"已写入 {out}")
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+合婚批量匹配：两组命盘（整数柱序号，形如 (N, 4)：年、月、日、时，时柱未知为 -1）
+按同位柱的天干五合 / 四冲、地支六合 / 对冲打分，分块计算 N x M 得分并为每个档案取前 k 名，
+不生成完整矩阵；行块可分发到进程池。
+
+单柱得分 PAIR_SCORE[a, b] = 天干合 + 地支合 - 天干冲 - 地支冲（取值 -2..2，使用与
+calc_jixiong 相同的 gan_he / gan_chong / zhi_he / zhi_chong 表）；命盘得分为四柱加权和。
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .ganzhi import tiangan, dizhi, gan_he, gan_chong, zhi_he, zhi_chong
+
+UNKNOWN = 60  # 时柱未知（-1）映射到的行 / 列，得分恒为 0
+DEFAULT_WEIGHTS = (1, 1, 1, 1)
+ROW_BLOCK = 1024
+COL_BLOCK = 8192
+_LOW = 0xFFFFFFFF
+_SKIP = np.iinfo(np.int16).min  # 排除自身：低于任何得分
+
+
+def _pair_score_table():
+    t = np.zeros((61, 61), dtype=np.int16)
+    for a in range(60):
+        ga, za = tiangan[a % 10], dizhi[a % 12]
+        for b in range(60):
+            gb, zb = tiangan[b % 10], dizhi[b % 12]
+            t[a, b] = ((gan_he.get(ga) == gb) + (zhi_he.get(za) == zb)
+                       - (gan_chong.get(ga) == gb) - (zhi_chong.get(za) == zb))
+    return t
+
+
+PAIR_SCORE = _pair_score_table()
+
+
+def _codes(charts):
+    c = np.asarray(charts, dtype=np.int64)
+    if c.ndim != 2 or c.shape[1] != 4:
+        raise ValueError("命盘数组应为 (N, 4)：年、月、日、时柱序号")
+    return np.where(c < 0, UNKNOWN, c)
+
+
+def check_weights(weights):
+    """
+    权重 -> 整数元组。得分按 int16 计算并与列下标合成整数键，非整数权重（如 1.5）会被截断，
+    故直接拒绝；加权后得分须在 int16 内（每柱 |得分| <= 2）。不合法时抛 ValueError
+    """
+    ws = tuple(weights)
+    if len(ws) != 4:
+        raise ValueError(f"权重应为 4 个（年、月、日、时柱）：{weights}")
+    for w in ws:
+        if isinstance(w, bool) or not float(w).is_integer():
+            raise ValueError(f"权重须为整数：{weights}")
+    ws = tuple(int(w) for w in ws)
+    if 2 * sum(abs(w) for w in ws) >= np.iinfo(np.int16).max:
+        raise ValueError(f"权重过大，得分超出 int16：{weights}")
+    return ws
+
+
+def pair_score(a, b, weights=DEFAULT_WEIGHTS):
+    """两张命盘（各 4 个柱序号）的得分"""
+    return int(sum(w * PAIR_SCORE[UNKNOWN if x < 0 else x, UNKNOWN if y < 0 else y]
+                   for w, x, y in zip(weights, a, b)))
+
+
+def score_block(a_codes, b_codes, weights=DEFAULT_WEIGHTS):
+    """行块 x 列块的得分矩阵（int16）。先按列块算出每柱 61 行的得分表，再按行整行取出相加"""
+    total = None
+    for p, w in enumerate(check_weights(weights)):
+        if not w:
+            continue
+        pre = PAIR_SCORE[:, b_codes[:, p]] * np.int16(w)
+        part = pre[a_codes[:, p]]
+        total = part if total is None else total + part
+    if total is None:
+        total = np.zeros((len(a_codes), len(b_codes)), dtype=np.int16)
+    return total
+
+
+def _merge_sparse(best, rr, keys, k):
+    """把稀疏候选 (行, 键) 并入每行前 k 的键表 best（(r, k)，已满）"""
+    r = best.shape[0]
+    all_r = np.concatenate([np.repeat(np.arange(r), k), rr])
+    all_k = np.concatenate([best.ravel(), keys])
+    order = np.lexsort((-all_k, all_r))
+    all_r, all_k = all_r[order], all_k[order]
+    rank = np.arange(len(all_r)) - np.searchsorted(all_r, all_r)
+    keep = rank < k
+    out = np.empty_like(best)
+    out[all_r[keep], rank[keep]] = all_k[keep]
+    return out
+
+
+def _topk_rows(a_codes, b_codes, k, weights, row_offset, exclude_self):
+    """
+    对一个行块扫描全部列块，返回 (前 k 列下标, 得分)，按得分降序、同分按下标升序。
+    得分与列下标合成唯一键（得分 << 32 | (_LOW - 下标)），分块选择结果与整体排序一致。
+    每行凑满 k 个之后，后续列块只有严格高于当前第 k 名得分的格子才可能入选（同分时前面的
+    列下标更小），只对这些格子建键合并，大部分列块只需一次比较。
+    """
+    r, m = len(a_codes), len(b_codes)
+    k = max(0, min(k, m - (1 if exclude_self else 0)))
+    best = np.empty((r, 0), dtype=np.int64)
+    if k == 0:
+        return best, best
+    rows = np.arange(r)
+    for c0 in range(0, m, COL_BLOCK):
+        block = score_block(a_codes, b_codes[c0:c0 + COL_BLOCK], weights)
+        width = block.shape[1]
+        if exclude_self:
+            own = rows + row_offset
+            hit = (own >= c0) & (own < c0 + width)
+            block[rows[hit], own[hit] - c0] = _SKIP
+        if best.shape[1] == k:
+            mask = block > (best[:, -1] >> 32).astype(np.int16)[:, None]
+            rr, cc = np.nonzero(mask)
+            if len(rr):
+                keys = (block[rr, cc].astype(np.int64) << 32) | (_LOW - (cc + c0))
+                best = _merge_sparse(best, rr, keys, k)
+            continue
+        key = (block.astype(np.int64) << 32) | (_LOW - np.arange(c0, c0 + width))
+        cand = np.concatenate([best, key], axis=1)
+        if cand.shape[1] > k:
+            part = np.argpartition(cand, cand.shape[1] - k, axis=1)[:, -k:]
+            cand = np.take_along_axis(cand, part, axis=1)
+        best = np.sort(cand, axis=1)[:, ::-1]
+    return _LOW - (best & _LOW), best >> 32
+
+
+_WORKER = {}
+
+
+def _init_worker(b_codes, k, weights, exclude_self):
+    _WORKER.update(b=b_codes, k=k, weights=weights, exclude_self=exclude_self)
+
+
+def _worker_task(args):
+    offset, a_codes = args
+    w = _WORKER
+    ids, scores = _topk_rows(a_codes, w["b"], w["k"], w["weights"], offset, w["exclude_self"])
+    return offset, ids, scores
+
+
+def iter_top_matches(a_charts, b_charts=None, k=10, weights=DEFAULT_WEIGHTS, workers=1, row_block=ROW_BLOCK):
+    """
+    按行块产出 (起始行, 前 k 列下标 (r, k), 得分 (r, k))，行块按顺序产出。
+    b_charts 省略时在 a_charts 组内互相匹配（排除自己）。workers > 1 时使用进程池，
+    同时在途的行块不超过 workers * 2，结果内存不随行数增长。weights 须为整数（见 check_weights）。
+    """
+    weights = check_weights(weights)
+    a = _codes(a_charts)
+    exclude_self = b_charts is None
+    b = a if exclude_self else _codes(b_charts)
+    tasks = ((i, a[i:i + row_block]) for i in range(0, len(a), row_block))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for off, chunk in tasks:
+            ids, scores = _topk_rows(chunk, b, k, weights, off, exclude_self)
+            yield off, ids, scores
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(b, k, weights, exclude_self)) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(_worker_task, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def top_matches(a_charts, b_charts=None, k=10, weights=DEFAULT_WEIGHTS, workers=1, row_block=ROW_BLOCK):
+    """汇总 iter_top_matches，返回 (ids, scores)，形状 (N, k)"""
+    ids, scores = [], []
+    for _, i, s in iter_top_matches(a_charts, b_charts, k, weights, workers, row_block):
+        ids.append(i)
+        scores.append(s)
+    return np.concatenate(ids), np.concatenate(scores)
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+轻量指标：分阶段计时、计数（calc_bazi 走了哪个 source 分支、缓存命中、错误），
+可导出为 JSON 或 Prometheus 文本格式。
+
+默认关闭：timer() 返回共享的空上下文，incr() / observe() 在第一行返回，热路径上只多一次
+全局变量判断。开启方式：环境变量 BAZI_METRICS=1，或调用 enable()。
+
+  from bazi import metrics
+  with metrics.timer("calc_bazi.sxtwl"):
+      ...
+  metrics.incr("source", branch="sxtwl_year")
+  print(metrics.to_prometheus())
+
+缓存命中率等现成的统计通过 register_collector 登记，导出时再读取（不在热路径上计数）。
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+
+ENABLED = os.environ.get("BAZI_METRICS", "").strip().lower() in ("1", "true", "yes", "on")
+PREFIX = "bazi_"
+# 计时直方图上界（秒）
+BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+_lock = threading.Lock()
+_counters = {}    # (名称, ((标签, 值), ...)) -> 次数
+_timers = {}      # 阶段 -> [次数, 总秒数, 最大秒数, 各桶计数]
+_collectors = {}  # 名称 -> 无参函数，返回 {指标: 数值}
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = bool(on)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+
+
+def incr(name, n=1, **labels):
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+
+def observe(stage, seconds):
+    if not ENABLED:
+        return
+    with _lock:
+        t = _timers.get(stage)
+        if t is None:
+            t = _timers[stage] = [0, 0.0, 0.0, [0] * (len(BUCKETS) + 1)]
+        t[0] += 1
+        t[1] += seconds
+        if seconds > t[2]:
+            t[2] = seconds
+        t[3][bisect_left(BUCKETS, seconds)] += 1
+
+
+class _Timer:
+    __slots__ = ("stage", "t0")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.stage, time.perf_counter() - self.t0)
+        if exc_type is not None:
+            incr("errors", stage=self.stage, type=exc_type.__name__)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+def timer(stage):
+    """计时上下文；未开启时返回共享的空上下文。阶段内抛出的异常计入 errors{stage, type}"""
+    return _Timer(stage) if ENABLED else _NOOP
+
+
+def register_collector(name, fn):
+    """登记导出时读取的统计（如缓存命中）：fn() -> {指标: 数值}；同名覆盖"""
+    _collectors[name] = fn
+
+
+def snapshot():
+    """当前全部指标（dict，可直接 json.dumps）"""
+    with _lock:
+        counters = [{"name": n, "labels": dict(lb), "value": v} for (n, lb), v in sorted(_counters.items())]
+        timers = {s: {"count": c, "sum": tot, "max": mx,
+                      "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], bk))}
+                  for s, (c, tot, mx, bk) in sorted(_timers.items())}
+    gauges = {}
+    for name, fn in list(_collectors.items()):
+        try:
+            gauges[name] = dict(fn())
+        except Exception as e:
+            gauges[name] = {"error": f"{type(e).__name__}: {e}"}
+    return {"enabled": ENABLED, "counters": counters, "timers": timers, "gauges": gauges}
+
+
+def to_json(**kw):
+    import json
+    return json.dumps(snapshot(), ensure_ascii=False, **kw)
+
+
+def _labels(d):
+    if not d:
+        return ""
+    body = ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in sorted(d.items()))
+    return "{" + body + "}"
+
+
+def to_prometheus(prefix=PREFIX):
+    """Prometheus 文本格式（0.0.4）"""
+    snap = snapshot()
+    lines = []
+    by_name = {}
+    for c in snap["counters"]:
+        by_name.setdefault(c["name"], []).append(c)
+    for name, rows in by_name.items():
+        metric = f"{prefix}{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.extend(f"{metric}{_labels(r['labels'])} {r['value']}" for r in rows)
+    if snap["timers"]:
+        metric = f"{prefix}stage_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for stage, t in snap["timers"].items():
+            acc = 0
+            for le, n in t["buckets"].items():
+                acc += n
+                lines.append(f"{metric}_bucket{_labels({'stage': stage, 'le': le})} {acc}")
+            lines.append(f"{metric}_sum{_labels({'stage': stage})} {t['sum']:.9f}")
+            lines.append(f"{metric}_count{_labels({'stage': stage})} {t['count']}")
+    for group, vals in snap["gauges"].items():
+        for k, v in vals.items():
+            if isinstance(v, bool) or not isinstance(v, (int, float)):
+                continue
+            metric = f"{prefix}{group}_{k}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {v}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+反查：给定年 / 月 / 日（可选时）四柱，列出 1900-2100 年内所有能排出该命盘的出生时段。
+不逐时辰穷举：
+- 年柱 60 年一轮，直接得到候选干支年（ganzhi_years）
+- 月支 + 干支年 -> 节气表中的一个月窗口 [交节, 下一交节)
+- 日柱 60 日一轮，窗口（不足 31 天）内至多一个候选日
+- 时柱在候选日内定位到 2 小时时段，并与月窗口求交
+规则与 calc_bazi 不使用 sxtwl 时一致（节气表定年月，锚点法日柱含 23:00 换日，五鼠遁时柱）。
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from . import jieqi
+from .core import ANCHOR_DATE, ANCHOR_INDEX, ganzhi_years
+from .ganzhi import GZS_LIST, GZ_INDEX, hour_pillar_index, month_pillar_index
+
+# start / end 为北京时间 datetime，end 不含；hour 为时柱
+BirthSlot = namedtuple("BirthSlot", "start end hour")
+# 时柱填这些值视为未知（与界面说明一致）
+HOUR_SKIP = ("", "不知道", "不要", "不要时")
+
+_EPOCH_DT = datetime(jieqi.START_YEAR, 1, 1)
+_EPOCH_ORD = jieqi.EPOCH.toordinal()
+_ANCHOR_OFF = ANCHOR_DATE.toordinal() - _EPOCH_ORD  # 锚点日距表起点的天数
+
+
+def _parse(gz, what):
+    idx = GZ_INDEX.get(gz.strip() if isinstance(gz, str) else gz)
+    if idx is None:
+        raise ValueError(f"{what}“{gz}”不是六十甲子之一")
+    return idx
+
+
+def _month_window(pillar_year, branch):
+    """干支年 + 月支 -> 节气表中的分钟区间 [s, e)；不在表内返回 None"""
+    # 寅月始于该年立春（表中第 (年-1900)*12+1 项），其后每支一项；丑月为次年小寒
+    k = (pillar_year - jieqi.START_YEAR) * 12 + 1 + (branch - 2) % 12
+    n = len(jieqi.JIE_TABLE)
+    if k < -1 or k >= n:
+        return None
+    s = jieqi.JIE_TABLE[k] if k >= 0 else 0
+    e = jieqi.JIE_TABLE[k + 1] if k + 1 < n else jieqi.END_MINUTE
+    return s, e
+
+
+def find_birth_times(year_gz, month_gz, day_gz, hour_gz=None, start_year=1900, end_year=2100):
+    """
+    惰性产出 BirthSlot（按时间升序）。hour_gz 为空或 HOUR_SKIP 之一时产出候选日的全部 12 个时辰。
+    月干、时干与年干、日干不符（五虎遁 / 五鼠遁）时没有结果。
+    """
+    yi = _parse(year_gz, "年柱")
+    mi = _parse(month_gz, "月柱")
+    di = _parse(day_gz, "日柱")
+    hi = None
+    if hour_gz and str(hour_gz).strip() not in HOUR_SKIP:
+        hi = _parse(hour_gz, "时柱")
+    mb = mi % 12
+    if month_pillar_index(yi, mb) != mi:
+        return
+    if hi is not None:
+        hb = hi % 12
+        if hour_pillar_index(di, 2 * hb, 0) != hi:
+            return
+        branches = (hb,)
+    else:
+        branches = range(12)
+    hour_idx = [hour_pillar_index(di, 2 * b, 0) for b in branches]
+
+    lo = max(0, jieqi.to_minutes(max(start_year, jieqi.START_YEAR), 1, 1))
+    hi_ts = min(jieqi.END_MINUTE, jieqi.to_minutes(min(end_year, jieqi.END_YEAR) + 1, 1, 1))
+    # 立春前的 1、2 月属上一干支年，故候选年从 start_year - 1 起
+    for py in ganzhi_years(GZS_LIST[yi], start_year - 1, end_year):
+        win = _month_window(py, mb)
+        if win is None:
+            continue
+        ws, we = max(win[0], lo), min(win[1], hi_ts)
+        if ws >= we:
+            continue
+        # 干支日 p（距表起点天数）覆盖 [p 日 00:00 - 1h, p 日 23:00)；找首个与窗口相交且日柱为 di 的 p
+        p = (ws + 60) // 1440
+        p += (di - ANCHOR_INDEX - (p - _ANCHOR_OFF)) % 60
+        while p * 1440 - 60 < we:
+            base = p * 1440
+            for b, h in zip(branches, hour_idx):
+                s = base - 60 if b == 0 else base + (2 * b - 1) * 60
+                s, e = max(s, ws), min(s + 120, we)
+                if s < e:
+                    yield BirthSlot(_EPOCH_DT + timedelta(minutes=s), _EPOCH_DT + timedelta(minutes=e), GZS_LIST[h])
+            p += 60
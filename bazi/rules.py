@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+吉凶规则集：规则以数据声明，编译一次得到查找表，之后每张命盘的吉凶与固定规则一样只需查表、按位或。
+
+一条规则 (天干关系, 地支关系, 偏移)：某柱天干在天干关系中有对象、地支在地支关系中也有对象时，
+得到 对象天干 × (对象地支 + 偏移) 的各组合。例如默认的吉规则 ("五合", "六合", (0, 1)) 即
+“天干五合 + 地支六合，双合进一”；凶规则 ("四冲", "六冲", (0, -1)) 即“四冲 + 对冲，双冲退一”。
+关系见 STEM_RELATIONS / BRANCH_RELATIONS（值为一个或多个对象）。
+六十甲子干支奇偶相同：五合换干的奇偶、三合不换支的奇偶，“五合 + 三合”得不到任何甲子，
+组合天干、地支关系时须保证偏移后奇偶一致，否则规则只会输出无效组合。
+
+规则集编译后（CompiledRules）含：
+  ji_pairs / xiong_pairs  组合码（0-119）-> 有序的吉 / 凶组合码（字符串接口保序输出）
+  ji_mask / xiong_mask    六十甲子序号 -> 60 位掩码（整数接口）
+
+  analyze_bazi("甲子", "丙寅", "戊辰", "庚申", rules="sanhe")   # 按名称选用，每次请求可不同
+  get_rules("wuji").chart_masks((0, 2, 4, 56))                  # 同 engine.chart_masks
+自定义规则集用 register_rules(name, spec) 登记，spec 的格式同 RULE_SETS 中的条目。
+"""
+from .ganzhi import tiangan, dizhi, ganzhi_index, gan_he, gan_chong, zhi_he, zhi_chong
+
+N_PAIRS = 120  # 组合码 = 天干序号 * 12 + 地支序号
+
+_SANHE = ("申子辰", "亥卯未", "寅午戌", "巳酉丑")
+_SANHUI = ("寅卯辰", "巳午未", "申酉戌", "亥子丑")
+
+
+def _groups(groups):
+    """三字一组 -> 每个地支对应组内另外两支"""
+    return {z: tuple(o for o in g if o != z) for g in groups for z in g}
+
+
+STEM_RELATIONS = {
+    "比和": {g: g for g in tiangan},                  # 同干
+    "五合": gan_he,
+    "四冲": gan_chong,                                # 甲庚 乙辛 丙壬 丁癸（原规则去掉戊己）
+    "五冲": dict(gan_chong, 戊="己", 己="戊"),        # 四冲 + 戊己冲
+}
+BRANCH_RELATIONS = {
+    "六合": zhi_he,
+    "六冲": zhi_chong,
+    "三合": _groups(_SANHE),
+    "三会": _groups(_SANHUI),
+}
+
+_DEFAULT_JI = (("五合", "六合", (0, 1)),)
+_DEFAULT_XIONG = (("四冲", "六冲", (0, -1)),)
+
+# 内置规则集：名称 -> {"label", "ji", "xiong"}；"default" 与原 calc_jixiong 一致
+RULE_SETS = {
+    "default": {"label": "默认：五合 + 六合（双合进一）为吉，四冲 + 对冲（双冲退一）为凶",
+                "ji": _DEFAULT_JI, "xiong": _DEFAULT_XIONG},
+    "wuji": {"label": "含戊己冲：凶取五冲（四冲 + 戊己）",
+             "ji": _DEFAULT_JI, "xiong": (("五冲", "六冲", (0, -1)),)},
+    "sanhe": {"label": "加三合、三会：同干且地支三合、天干五合且地支三会亦为吉",
+              "ji": _DEFAULT_JI + (("比和", "三合", (0,)), ("五合", "三会", (0,))), "xiong": _DEFAULT_XIONG},
+    "plain": {"label": "不进不退：只取合、冲本身",
+              "ji": (("五合", "六合", (0,)),), "xiong": (("四冲", "六冲", (0,)),)},
+}
+DEFAULT = "default"
+
+
+def _targets(rel, key):
+    t = rel.get(key)
+    if t is None:
+        return ()
+    return (t,) if isinstance(t, str) else tuple(t)
+
+
+def _compile_side(rules):
+    """规则列表 -> 每个组合码的有序结果（去重保序）"""
+    compiled = []
+    for stem_rel, branch_rel, offsets in rules:
+        try:
+            compiled.append((STEM_RELATIONS[stem_rel], BRANCH_RELATIONS[branch_rel], tuple(offsets)))
+        except KeyError as e:
+            raise ValueError(f"未知的关系：{e.args[0]}") from None
+    rows = []
+    for code in range(N_PAIRS):
+        stem, branch = divmod(code, 12)
+        out = []
+        for srel, brel, offsets in compiled:
+            stems, branches = _targets(srel, tiangan[stem]), _targets(brel, dizhi[branch])
+            if not (stems and branches):
+                continue
+            for s in stems:
+                for b in branches:
+                    for off in offsets:
+                        c = tiangan.index(s) * 12 + (dizhi.index(b) + off) % 12
+                        if c not in out:
+                            out.append(c)
+        rows.append(tuple(out))
+    return tuple(rows)
+
+
+def _mask(codes):
+    """组合码 -> 掩码（天干地支奇偶不一致、不属于六十甲子的组合不计）"""
+    m = 0
+    for c in codes:
+        stem, branch = divmod(c, 12)
+        if not (stem - branch) % 2:
+            m |= 1 << ganzhi_index(stem, branch)
+    return m
+
+
+class CompiledRules:
+    """编译好的规则集：查找表在构造时算完，之后只读"""
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.label = spec.get("label", name)
+        self.ji_pairs = _compile_side(spec.get("ji", ()))
+        self.xiong_pairs = _compile_side(spec.get("xiong", ()))
+        # 六十甲子序号 i 的组合码为 (i % 10) * 12 + i % 12
+        self.ji_mask = tuple(_mask(self.ji_pairs[i % 10 * 12 + i % 12]) for i in range(60))
+        self.xiong_mask = tuple(_mask(self.xiong_pairs[i % 10 * 12 + i % 12]) for i in range(60))
+
+    def __repr__(self):
+        return f"CompiledRules({self.name!r})"
+
+    def chart_masks(self, pillars):
+        """柱序号序列（负数跳过）-> (吉掩码, 凶掩码)"""
+        ji = xiong = 0
+        ji_t, xiong_t = self.ji_mask, self.xiong_mask
+        for p in pillars:
+            if p >= 0:
+                ji |= ji_t[p]
+                xiong |= xiong_t[p]
+        return ji, xiong
+
+    def analyze_codes(self, codes):
+        """组合码序列 -> (吉组合码列表, 凶组合码列表)，按出现顺序去重"""
+        ji, xiong = [], []
+        seen_ji = seen_xiong = 0
+        for c in codes:
+            for t in self.ji_pairs[c]:
+                if not seen_ji >> t & 1:
+                    seen_ji |= 1 << t
+                    ji.append(t)
+            for t in self.xiong_pairs[c]:
+                if not seen_xiong >> t & 1:
+                    seen_xiong |= 1 << t
+                    xiong.append(t)
+        return ji, xiong
+
+
+_COMPILED = {}
+
+
+def register_rules(name, spec):
+    """登记（或覆盖）规则集并立即编译，关系名不存在时抛 ValueError；返回编译结果"""
+    compiled = CompiledRules(name, spec)
+    RULE_SETS[name] = spec
+    _COMPILED[name] = compiled
+    return compiled
+
+
+def get_rules(rules=None):
+    """规则集名称（None / 空为默认）或 CompiledRules -> CompiledRules；名称不存在时抛 ValueError"""
+    if isinstance(rules, CompiledRules):
+        return rules
+    name = rules or DEFAULT
+    compiled = _COMPILED.get(name)
+    if compiled is None:
+        spec = RULE_SETS.get(name)
+        if spec is None:
+            raise ValueError(f"未知的规则集：{name}（可选：{'、'.join(RULE_SETS)}）")
+        compiled = _COMPILED[name] = CompiledRules(name, spec)
+    return compiled
+
+
+def available():
+    """[(名称, 说明)]，按登记顺序"""
+    return [(name, spec.get("label", name)) for name, spec in RULE_SETS.items()]
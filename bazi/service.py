@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP JSON 服务（纯 ASGI，无框架依赖）：供其他服务调用排盘，不经过 Streamlit。
+
+  uvicorn bazi.service:app --port 8000        （或 python -m bazi.service --port 8000）
+
+接口（请求、响应均为 JSON；记录字段与 bazi.batch 相同，calendar 取 solar / lunar / manual，
+rules 选吉凶规则集，不同流派的请求可并行服务）：
+  POST /chart   单条记录 -> 结果 dict
+  POST /batch   {"records": [...]} 或记录列表 -> {"results": [...]}（按输入顺序）
+  GET  /health  存活检查
+  GET  /rules   可选的吉凶规则集
+  GET  /stats   缓存命中率、合并次数等
+  GET  /metrics 分阶段计时与计数（Prometheus 文本；需 BAZI_METRICS=1 开启，见 bazi.metrics）
+
+- 单条：进程内 TTL + LRU 缓存（键为 batch.record_key 规范化后的输入），未命中直接在事件循环内
+  计算（送线程 / 进程池的调度开销反而更大）
+- 逐日柱表：sxtwl 每换一个公历年要重算一次节气（十几毫秒），年份分散的请求几乎每条都要付出
+  这笔开销；设置环境变量 BAZI_DAYTABLE（或 daytable 参数）指向 python -m bazi.daytable build
+  生成的文件后改为 mmap 查表，结果不变，单条未命中也只需几十微秒
+- 持久化缓存：设置环境变量 BAZI_STORE（或 store 参数）指向 SQLite 文件（见 bazi.store），重启后及
+  多个服务进程之间共享已算结果；进程内 TTL 缓存未命中时先查它（WAL 读连接，不等写锁）。
+  新结果只进写缓冲（不自动 flush），由后台任务每 STORE_FLUSH_INTERVAL 秒在线程中一个事务写入
+  （关闭时再写一次）；写事务等其他进程的写锁时，事件循环上的读、登记照常进行
+- 单条请求的记录若正被某个批量请求计算，等待同一 Future（请求合并）
+- 批量：逐条查缓存，同一批内重复记录只算一次；正被其他请求计算的记录等待同一 Future（请求合并）；
+  其余记录较多时按块送进程池，较少时送线程池，都不阻塞事件循环
+- 未预期的异常返回 500 与 JSON 错误信息
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+
+from . import metrics
+from .batch import process_record, process_chunk, record_key
+from .daytable import open_shared
+from .rules import DEFAULT as DEFAULT_RULES, available as available_rules
+from .warmup import warm_up
+
+CACHE_SIZE = 65536
+CACHE_TTL = 3600.0  # 秒
+MAX_BATCH = 10000
+MAX_BODY = 16 * 1024 * 1024
+INLINE_BATCH = 256  # 待算记录不超过此数时就地计算，不进进程池
+CHUNK_SIZE = 1000
+STORE_FLUSH_INTERVAL = 1.0  # 秒
+
+
+class TTLCache:
+    """按插入时间过期的 LRU 缓存（非线程安全，只在事件循环内使用）"""
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize, self.ttl = maxsize, ttl
+        self._data = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is not None:
+            if item[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            del self._data[key]
+        self.misses += 1
+        return None
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data),
+                "maxsize": self.maxsize, "hit_rate": self.hits / total if total else 0.0}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _with_id(result, rec):
+    """缓存中的结果不带 id，响应时换成本条记录的 id"""
+    out = dict(result)
+    out["id"] = rec.get("id")
+    return out
+
+
+class BaziService:
+    """
+    ASGI 应用。workers 为批量进程池大小（默认 CPU 核数，1 表示不用进程池，进程池首次需要时才创建）；
+    daytable 为逐日柱表路径，默认取环境变量 BAZI_DAYTABLE；store 为持久化缓存路径，默认取 BAZI_STORE。
+    """
+
+    def __init__(self, cache_size=CACHE_SIZE, ttl=CACHE_TTL, workers=None, daytable=None, store=None):
+        self.cache = TTLCache(cache_size, ttl)
+        self.daytable = daytable or os.environ.get("BAZI_DAYTABLE") or None
+        self._table = None
+        self.store = store or os.environ.get("BAZI_STORE") or None
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._flusher = None  # 定时写入持久化缓存的后台任务
+        self._inflight = {}  # 记录键 -> 正在计算的 Future
+        self.coalesced = 0
+        self.routes = {
+            ("POST", "/chart"): self.chart,
+            ("POST", "/batch"): self.batch,
+            ("GET", "/health"): self.health,
+            ("GET", "/rules"): self.rules,
+            ("GET", "/stats"): self.stats,
+            ("GET", "/metrics"): self.metrics_text,
+        }
+        metrics.register_collector("service_cache", self.cache.stats)
+
+    # ---------- 计算 ----------
+    def chart_sync(self, rec, key=None):
+        """单条：查缓存，未命中就地计算并写入缓存；key 为已算好的 record_key"""
+        if key is None:
+            try:
+                key = record_key(rec)
+            except (TypeError, ValueError):
+                return process_record(rec)  # 无法规范化的输入不缓存，错误信息由 process_record 给出
+        result = self.cache.get(key)
+        if result is None:
+            store = self._get_store()
+            result = process_record(dict(rec, id=None), self._get_table(), store)
+            self.cache.set(key, result)
+        return _with_id(result, rec)
+
+    def _get_table(self):
+        if self._table is None and self.daytable:
+            self._table = open_shared(self.daytable)
+        return self._table
+
+    def _get_store(self):
+        if not self.store:
+            return None
+        from .store import open_store
+        table = self._get_table()
+        store = open_store(self.store, backend=table.from_sxtwl if table is not None else None)
+        store.flush_every = None  # 只由后台任务（线程中）写入，请求路径上的 put 不触发写事务
+        return store
+
+    def _get_pool(self):
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _start_flusher(self):
+        if self.store and self._flusher is None:
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """把单条请求攒下的持久化缓存写入定时一个事务写完（在线程中执行，不阻塞事件循环）"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(STORE_FLUSH_INTERVAL)
+            try:
+                await loop.run_in_executor(None, self._get_store().flush)
+            except Exception as e:  # 如数据库被其他进程长时间锁住：保留缓冲，下次再写
+                metrics.incr("errors", stage="store_flush", type=type(e).__name__)
+
+    async def _compute(self, recs):
+        loop = asyncio.get_running_loop()
+        if self.workers <= 1 or len(recs) <= INLINE_BATCH:
+            return await loop.run_in_executor(None, process_chunk, recs, self.daytable, self.store)
+        pool = self._get_pool()
+        parts = await asyncio.gather(*(loop.run_in_executor(pool, process_chunk, recs[i:i + CHUNK_SIZE],
+                                                            self.daytable, self.store)
+                                       for i in range(0, len(recs), CHUNK_SIZE)))
+        return [r for part in parts for r in part]
+
+    async def chart_many(self, records):
+        """批量：缓存 -> 批内去重 -> 合并在途请求 -> 其余记录计算，结果按输入顺序"""
+        results = [None] * len(records)
+        waits = []      # (下标, Future)：等待其他请求正在算的结果
+        todo = {}       # 记录键 -> 本请求负责计算的下标列表
+        loose = []      # 无法规范化的记录下标，直接计算（得到 error）
+        for i, rec in enumerate(records):
+            try:
+                key = record_key(rec)
+            except (TypeError, ValueError):
+                loose.append(i)
+                continue
+            if key in todo:
+                todo[key].append(i)
+                continue
+            hit = self.cache.get(key)
+            if hit is not None:
+                results[i] = _with_id(hit, rec)
+            elif key in self._inflight:
+                self.coalesced += 1
+                waits.append((i, self._inflight[key]))
+            else:
+                todo[key] = [i]
+        for i in loose:
+            results[i] = process_record(records[i], self._get_table())
+        if not todo:  # 全部命中缓存或在等其他请求：不进线程池，也不动共享缓存的预取
+            for i, f in waits:
+                results[i] = _with_id(await f, records[i])
+            return results
+        loop = asyncio.get_running_loop()
+        keys = list(todo)
+        futures = [loop.create_future() for _ in keys]
+        self._inflight.update(zip(keys, futures))
+        try:
+            computed = await self._compute([dict(records[todo[k][0]], id=None) for k in keys])
+        except BaseException as e:
+            for k, f in zip(keys, futures):
+                self._inflight.pop(k, None)
+                f.set_exception(e)
+                f.exception()  # 已由本请求抛出，避免“未取回异常”告警
+            raise
+        for k, f, res in zip(keys, futures, computed):
+            self.cache.set(k, res)
+            self._inflight.pop(k, None)
+            f.set_result(res)
+            for i in todo[k]:
+                results[i] = _with_id(res, records[i])
+        for i, f in waits:
+            results[i] = _with_id(await f, records[i])
+        return results
+
+    # ---------- 接口 ----------
+    async def chart(self, body):
+        if not isinstance(body, dict):
+            raise HTTPError(400, "请求体应为 JSON 对象")
+        self._start_flusher()
+        with metrics.timer("service.chart"):
+            try:
+                key = record_key(body)
+            except (TypeError, ValueError):
+                return process_record(body)
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                await asyncio.wait((fut,))
+                if not fut.cancelled() and fut.exception() is None:
+                    return _with_id(fut.result(), body)
+                # 合并的批量计算失败：自己算
+            return self.chart_sync(body, key)
+
+    async def batch(self, body):
+        records = body.get("records") if isinstance(body, dict) else body
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            raise HTTPError(400, "请求体应为记录列表或 {\"records\": [...]}")
+        if len(records) > MAX_BATCH:
+            raise HTTPError(413, f"单批最多 {MAX_BATCH} 条")
+        with metrics.timer("service.batch"):
+            return {"results": await self.chart_many(records)}
+
+    async def health(self, body):
+        return {"status": "ok"}
+
+    async def rules(self, body):
+        return {"default": DEFAULT_RULES, "rules": [{"name": n, "label": label} for n, label in available_rules()]}
+
+    async def stats(self, body):
+        return {"cache": self.cache.stats(), "inflight": len(self._inflight),
+                "coalesced": self.coalesced, "workers": self.workers, "daytable": self.daytable,
+                "store": self._get_store().stats() if self.store else None}
+
+    async def metrics_text(self, body):
+        return _Text(metrics.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8")
+
+    def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        if self.store:
+            self._get_store().flush()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    # ---------- ASGI ----------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        try:
+            handler = self.routes.get((scope["method"], scope["path"]))
+            if handler is None:
+                allowed = any(path == scope["path"] for _, path in self.routes)
+                raise HTTPError(405 if allowed else 404, "方法不允许" if allowed else "未找到")
+            body = None
+            if scope["method"] == "POST":
+                raw = await _read_body(receive)
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    raise HTTPError(400, "请求体不是合法 JSON")
+            status, payload = 200, await handler(body)
+        except HTTPError as e:
+            metrics.incr("errors", stage="http", status=e.status)
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            metrics.incr("errors", stage="http", status=500, type=type(e).__name__)
+            status, payload = 500, {"error": f"内部错误：{type(e).__name__}: {e}"}
+        if isinstance(payload, _Text):
+            await _send(send, status, payload.body.encode("utf-8"), payload.content_type)
+        else:
+            await _send(send, status, json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                        "application/json; charset=utf-8")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            msg = await receive()
+            if msg["type"] == "lifespan.startup":
+                self._get_table()
+                self._get_store()
+                self._start_flusher()
+                warm_up()
+                await send({"type": "lifespan.startup.complete"})
+            elif msg["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def _read_body(receive):
+    chunks, size = [], 0
+    while True:
+        msg = await receive()
+        if msg["type"] == "http.disconnect":
+            raise HTTPError(400, "连接已断开")
+        part = msg.get("body", b"")
+        size += len(part)
+        if size > MAX_BODY:
+            raise HTTPError(413, "请求体过大")
+        chunks.append(part)
+        if not msg.get("more_body"):
+            return b"".join(chunks)
+
+
+class _Text:
+    """非 JSON 的响应体（如 /metrics）"""
+    __slots__ = ("body", "content_type")
+
+    def __init__(self, body, content_type):
+        self.body, self.content_type = body, content_type
+
+
+async def _send(send, status, data, content_type):
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", content_type.encode()),
+                            (b"content-length", str(len(data)).encode())]})
+    await send({"type": "http.response.body", "body": data})
+
+
+app = BaziService()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bazi.service", description="八字排盘 HTTP JSON 服务")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--daytable", default=None, help="逐日柱表文件，默认取环境变量 BAZI_DAYTABLE")
+    ap.add_argument("--store", default=None, help="持久化缓存文件（SQLite），默认取环境变量 BAZI_STORE")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="批量进程数，默认 CPU 核数")
+    args = ap.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("需要 ASGI 服务器：pip install uvicorn（或用其他 ASGI 服务器加载 bazi.service:app）")
+    service = BaziService(workers=args.workers, daytable=args.daytable, store=args.store) \
+        if args.daytable or args.workers or args.store else app
+    uvicorn.run(service, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+真太阳时：钟表时间 -> 出生地的真太阳时，用于定时辰和 23:00 换日。
+  真太阳时 = 钟表时间 - 时区偏移 + 经度 × 4 分钟 + 均时差(日序)
+均时差按一年中的第几天预先算成表（EOT_SECONDS，366 项，NOAA 近似式，误差约半分钟），
+单条换算只是一次查表加整数运算；vectorized.calc_bazi_batch 用同一张表做数组版。
+
+日柱（换日）与时柱按真太阳时；年柱、月柱由交节时刻决定，而节气表（及 sxtwl）为北京时间，
+故先把钟表时间换算为北京时间（beijing_time）再查，与出生地经度无关。
+"""
+import math
+from datetime import date
+
+BEIJING_TZ = 8.0  # 钟表时间默认按北京时间（UTC+8）
+
+
+def _eot_minutes(doy):
+    """第 doy 天（1 起）正午的均时差（分钟，真太阳时 - 平太阳时）"""
+    g = 2 * math.pi / 365 * (doy - 1)
+    return 229.18 * (0.000075 + 0.001868 * math.cos(g) - 0.032077 * math.sin(g)
+                     - 0.014615 * math.cos(2 * g) - 0.040849 * math.sin(2 * g))
+
+
+# 下标 = 日序 - 1（闰年 12-31 为第 366 天）
+EOT_SECONDS = tuple(round(_eot_minutes(n) * 60) for n in range(1, 367))
+
+
+def check_tz(tz=None):
+    """校验并返回时区小时；缺省为北京时间"""
+    tz = BEIJING_TZ if tz is None or tz == "" else float(tz)
+    if not -12 <= tz <= 14:
+        raise ValueError(f"时区应在 UTC-12 到 UTC+14 之间：{tz}")
+    return tz
+
+
+def check_place(longitude, tz=None):
+    """校验并返回 (经度, 时区小时)；tz 缺省为北京时间"""
+    longitude = float(longitude)
+    if not -180 <= longitude <= 180:
+        raise ValueError(f"经度应在 -180 到 180 之间：{longitude}")
+    return longitude, check_tz(tz)
+
+
+def offset_seconds(y, m, d, longitude, tz=None):
+    """该日真太阳时与钟表时间之差（秒）"""
+    longitude, tz = check_place(longitude, tz)
+    doy = date(y, m, d).toordinal() - date(y, 1, 1).toordinal()
+    return round(longitude * 240 - tz * 3600) + EOT_SECONDS[doy]
+
+
+def beijing_time(y, m, d, hour, minute=0, tz=None):
+    """时区 tz 的钟表时间 -> 北京时间 (年, 月, 日, 时, 分)，用于查节气；时辰未知时原样返回"""
+    if hour is None or hour < 0:
+        return y, m, d, hour, minute
+    tz = check_tz(tz)
+    o = date(y, m, d).toordinal()
+    days, sec = divmod((hour * 60 + (minute or 0)) * 60 + round((BEIJING_TZ - tz) * 3600), 86400)
+    t = date.fromordinal(o + days)
+    return t.year, t.month, t.day, sec // 3600, sec % 3600 // 60
+
+
+def true_solar_time(y, m, d, hour, minute=0, longitude=120.0, tz=None):
+    """钟表时间 -> 真太阳时 (年, 月, 日, 时, 分)，秒向下取整；可能跨到前一天或后一天"""
+    o = date(y, m, d).toordinal()
+    days, sec = divmod((hour * 60 + (minute or 0)) * 60 + offset_seconds(y, m, d, longitude, tz), 86400)
+    t = date.fromordinal(o + days)
+    return t.year, t.month, t.day, sec // 3600, sec % 3600 // 60
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+持久化排盘缓存（SQLite，WAL 模式）：重启后、多个 worker 进程之间共享已算过的结果。
+
+同一天、同一时段、同样的模式参数，calc_bazi 的结果一定相同，分钟级输入每天至多落到
+14 个时段（时辰未知、早子 00:00-00:59、丑 …… 亥、晚子 23:00-23:59——晚子日柱归次日，须与早子分开），
+故以规范化的 (日期, 时段, 手动月支, prefer_sxtwl, 年月来源) 为键。
+不能缓存的输入：时段内恰有“节”交接（节气表来源时年柱 / 月柱随分钟变化），以及时分越界、
+非法月支等，key 返回 None，调用方直接计算（计入 bypass）。
+
+每行只存整数：四柱序号打包为一个整数、吉 / 凶 60 位掩码（默认规则集；其他规则集由四柱查
+rules 的表即得，不必分开存）、source 标签位。
+写入先进缓冲区，flush() 时一个事务写完；行数超过 max_rows 时按写入先后淘汰最旧的约 10%。
+读、写各用一个连接：WAL 下读不等写锁，flush() 等待其他进程的写锁（最长 timeout 秒）时，
+get() / put() 照常只读内存或读连接，不被阻塞。flush_every=None 时 put() 不自动 flush，
+由调用方定时写入（如 service 的后台任务）。
+
+  from bazi.store import open_store
+  store = open_store("charts.db")
+  store.prefetch(inputs)                 # 批量：一次查询把整块的命中读进内存
+  r = store.get(1990, 5, 17, 14, 30)     # 命中返回 dict（year/month/day/hour/source/ji_mask/xiong_mask），否则 None
+  store.put(1990, 5, 17, 14, 30, result=calc_bazi(1990, 5, 17, 14, 30))
+  store.flush()
+"""
+import os
+import sqlite3
+import threading
+from bisect import bisect_right
+from datetime import date
+
+from . import jieqi, metrics
+from .engine import chart_masks
+from .ganzhi import GZS_LIST, GZ_INDEX, dizhi
+
+SCHEMA_VERSION = 1
+DEFAULT_MAX_ROWS = 2_000_000  # 每行约 40 字节（含唯一索引）
+FLUSH_EVERY = 2000
+QUERY_CHUNK = 500  # 单条 SELECT ... IN (...) 的参数个数上限
+
+# source 标签（calc_bazi 依次输出年、月、时三段），按位存储
+SOURCE_TAGS = ("sxtwl_year", "jieqi_year", "approx_year",
+               "manual_month", "sxtwl_month", "jieqi_month", "approx_month",
+               "sxtwl_hour_used", "rule_hour_used")
+_TAG_BIT = {t: 1 << i for i, t in enumerate(SOURCE_TAGS)}
+
+N_SLOTS = 14  # 0 时辰未知；1 早子；2-12 丑-亥；13 晚子
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS charts (
+    seq INTEGER PRIMARY KEY,   -- 写入顺序，淘汰用
+    key INTEGER NOT NULL UNIQUE,
+    pillars INTEGER NOT NULL,  -- 年 | 月 << 6 | 日 << 12 | (时 + 1) << 18，时辰未知时时为 -1
+    ji INTEGER NOT NULL,
+    xiong INTEGER NOT NULL,
+    source INTEGER NOT NULL
+)
+"""
+
+
+def hour_slot(hour, minute=None):
+    """时分 -> 时段 0-13；时分越界返回 None"""
+    if hour is None or hour < 0:
+        return 0
+    minute = minute or 0
+    if hour > 23 or not 0 <= minute <= 59:
+        return None
+    if hour == 23:
+        return 13
+    return (hour * 60 + minute + 60) // 120 + 1
+
+
+def _slot_has_jie(o, slot):
+    """公历日（ordinal）的该时段内（不含起点）是否有“节”交接"""
+    if slot == 0:
+        return False  # 时辰未知按 00:00 计算，只有一个时刻
+    base = (o - jieqi._EPOCH_ORD) * 1440
+    start = base + (0 if slot == 1 else 1380 if slot == 13 else (slot - 1) * 120 - 60)
+    end = base + (60 if slot == 1 else 1440 if slot == 13 else (slot - 1) * 120 + 60)
+    k = bisect_right(jieqi.JIE_TABLE, start)
+    return k < len(jieqi.JIE_TABLE) and jieqi.JIE_TABLE[k] < end
+
+
+def chart_key(y, m, d, hour=None, minute=None, manual_month_branch=None, prefer_sxtwl=False, backend=0):
+    """
+    calc_bazi 参数 -> 整数键；不可缓存时返回 None。
+    backend 为年月来源（1 sxtwl，0 节气表），两种来源的结果不同，分开存。
+    """
+    slot = hour_slot(hour, minute)
+    if slot is None:
+        return None
+    mb = 0
+    if manual_month_branch:
+        if manual_month_branch not in dizhi:
+            return None
+        mb = dizhi.index(manual_month_branch) + 1
+    try:
+        o = date(int(y), int(m), int(d)).toordinal()
+    except (TypeError, ValueError):
+        return None
+    if _slot_has_jie(o, slot):
+        return None
+    return (((o * N_SLOTS + slot) * 13 + mb) * 2 + bool(prefer_sxtwl)) * 2 + backend
+
+
+def _pack(result):
+    """calc_bazi 结果 -> (pillars, ji, xiong, source)；无法编码时返回 None"""
+    try:
+        yi, mi, di = GZ_INDEX[result["year"]], GZ_INDEX[result["month"]], GZ_INDEX[result["day"]]
+        hi = -1 if result["hour"] == "不知道" else GZ_INDEX[result["hour"]]
+        src = 0
+        for tag in result["source"].split(";"):
+            if tag:
+                src |= _TAG_BIT[tag]
+    except (KeyError, TypeError, AttributeError):
+        return None
+    ji, xiong = chart_masks((yi, mi, di, hi))
+    return yi | mi << 6 | di << 12 | (hi + 1) << 18, ji, xiong, src
+
+
+def _unpack(pillars, ji, xiong, src):
+    hi = (pillars >> 18) - 1
+    return {"year": GZS_LIST[pillars & 63], "month": GZS_LIST[pillars >> 6 & 63],
+            "day": GZS_LIST[pillars >> 12 & 63], "hour": GZS_LIST[hi] if hi >= 0 else "不知道",
+            "source": "".join(t + ";" for t in SOURCE_TAGS if src & _TAG_BIT[t]),
+            "ji_mask": ji, "xiong_mask": xiong}
+
+
+def _detect_backend():
+    from . import core
+    from .sxtwl_adapter import get_adapter
+    return 1 if core.HAVE_SXTWL and get_adapter() is not None else 0
+
+
+class ChartStore:
+    """
+    一个进程一个连接（见 open_store）；方法带锁，可在线程间共用。
+    backend 缺省时按当前进程 sxtwl 是否可用判断（首次用到时才探测）；
+    查逐日柱表得到的结果应传 table.from_sxtwl。
+    """
+
+    def __init__(self, path, max_rows=DEFAULT_MAX_ROWS, backend=None, timeout=30.0, flush_every=FLUSH_EVERY):
+        self.path = path
+        self.max_rows = max_rows
+        self.flush_every = flush_every
+        self.pid = os.getpid()
+        self._backend = None if backend is None else int(bool(backend))
+        self._lock = threading.RLock()        # 只保护内存中的 _mem / _pending / _flushing，持有时间很短
+        self._write_lock = threading.Lock()   # 写连接：同一时间只有一个 flush 事务
+        self._read_lock = threading.Lock()    # 读连接：在线程间串行使用
+        self._db = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        if self._version() != SCHEMA_VERSION:
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                if self._version() != SCHEMA_VERSION:  # 其他进程可能刚建好
+                    self._db.execute("DROP TABLE IF EXISTS charts")
+                    self._db.execute(_SCHEMA)
+                    self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._rdb = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._mem = {}       # 键 -> 行（None 表示已确认未命中）；prefetch 的结果与待写入的行
+        self._pending = {}   # 键 -> 行，等待 flush
+        self._flushing = {}  # 键 -> 行，正在写入（事务提交前读连接还看不到）
+        self.hits = self.misses = self.bypass = self.writes = self.evicted = 0
+
+    def _version(self):
+        return self._db.execute("PRAGMA user_version").fetchone()[0]
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = _detect_backend()
+        return self._backend
+
+    def key(self, y, m, d, hour=None, minute=None, manual_month_branch=None, prefer_sxtwl=False):
+        return chart_key(y, m, d, hour, minute, manual_month_branch, prefer_sxtwl, self.backend)
+
+    def _select(self, keys):
+        rows = {}
+        with self._read_lock:
+            for i in range(0, len(keys), QUERY_CHUNK):
+                part = keys[i:i + QUERY_CHUNK]
+                sql = f"SELECT key, pillars, ji, xiong, source FROM charts WHERE key IN ({','.join('?' * len(part))})"
+                for k, *row in self._rdb.execute(sql, part):
+                    rows[k] = tuple(row)
+        return rows
+
+    def _buffered(self, k):
+        return self._pending.get(k) or self._flushing.get(k)
+
+    def prefetch(self, inputs):
+        """
+        inputs 为 calc_bazi 参数元组 (y, m, d[, hour, minute, manual_month_branch, prefer_sxtwl]) 的序列，
+        一次查询读入内存，随后的 get 不再访问数据库。内存中只保留最近一次 prefetch 的内容。
+        """
+        keys = {k for k in (self.key(*args) for args in inputs) if k is not None}
+        mem = dict.fromkeys(keys)
+        mem.update(self._select(list(keys)))
+        with self._lock:
+            mem.update(self._flushing)
+            mem.update(self._pending)
+            self._mem = mem
+
+    def get(self, y, m, d, hour=None, minute=None, manual_month_branch=None, prefer_sxtwl=False):
+        """命中返回结果 dict，未命中或不可缓存返回 None"""
+        k = self.key(y, m, d, hour, minute, manual_month_branch, prefer_sxtwl)
+        if k is None:
+            self.bypass += 1
+            return None
+        with self._lock:
+            row = self._mem[k] if k in self._mem else self._buffered(k)
+            found = row is not None or k in self._mem
+        if not found:
+            row = self._select([k]).get(k)
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _unpack(*row)
+
+    def put(self, y, m, d, hour=None, minute=None, manual_month_branch=None, prefer_sxtwl=False, *, result):
+        """登记 calc_bazi 的结果（只用 year/month/day/hour/source），攒够 flush_every 条自动 flush"""
+        k = self.key(y, m, d, hour, minute, manual_month_branch, prefer_sxtwl)
+        row = _pack(result) if k is not None else None
+        if row is None:
+            return
+        with self._lock:
+            self._pending[k] = row
+            if k in self._mem:
+                self._mem[k] = row
+            full = self.flush_every is not None and len(self._pending) >= self.flush_every
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+        把缓冲区一个事务写入（其他进程写过的同键行保留），必要时淘汰旧行。
+        缓冲区先整体换出，事务期间（可能要等其他进程的写锁）不持有内存锁；写入失败时放回缓冲区
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._flushing, self._pending = self._pending, {}
+            rows = [(k,) + row for k, row in self._flushing.items()]
+            try:
+                with self._db:
+                    self._db.execute("BEGIN IMMEDIATE")
+                    before = self._db.total_changes
+                    self._db.executemany("INSERT OR IGNORE INTO charts (key, pillars, ji, xiong, source) "
+                                         "VALUES (?, ?, ?, ?, ?)", rows)
+                    self.writes += self._db.total_changes - before
+                    self._evict()
+            except BaseException:
+                with self._lock:
+                    self._pending = {**self._flushing, **self._pending}
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+    def _evict(self):
+        lo, hi = self._db.execute("SELECT min(seq), max(seq) FROM charts").fetchone()
+        if lo is None or hi - lo + 1 <= self.max_rows:
+            return
+        cur = self._db.execute("DELETE FROM charts WHERE seq <= ?", (hi - self.max_rows + self.max_rows // 10,))
+        self.evicted += cur.rowcount
+
+    def __len__(self):
+        with self._read_lock:
+            return self._rdb.execute("SELECT count(*) FROM charts").fetchone()[0]
+
+    def clear(self):
+        with self._write_lock, self._lock:
+            self._pending.clear()
+            self._mem.clear()
+            self._db.execute("DELETE FROM charts")
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "bypass": self.bypass, "writes": self.writes,
+                "evicted": self.evicted, "pending": len(self._pending), "max_rows": self.max_rows,
+                "hit_rate": self.hits / total if total else 0.0}
+
+    def close(self):
+        self.flush()
+        with self._write_lock, self._read_lock:
+            self._db.close()
+            self._rdb.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_OPENED = {}
+
+
+def open_store(path, max_rows=DEFAULT_MAX_ROWS, backend=None):
+    """
+    同一进程内对同一路径只打开一次；fork 出的子进程不沿用父进程的连接。
+    返回的对象在进程内共用：由后台任务负责写入的调用方（service）把 flush_every 设为 None
+    """
+    key = (path, None if backend is None else int(bool(backend)))
+    s = _OPENED.get(key)
+    if s is None or s.pid != os.getpid():
+        s = _OPENED[key] = ChartStore(path, max_rows, backend)
+        metrics.register_collector("chart_store", s.stats)
+    return s
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+sxtwl 适配器：启动时探测一次已安装 sxtwl 的接口形态（fromSolar / Calendar().getDayBySolar …，
+干支返回对象 .tg/.dz 还是 tuple，时柱 getHourGZ 还是 getShiGz，fromLunar 参数个数，
+公历取 getSolar() 还是 getSolarYear() …），之后直接调用绑定好的函数，不再逐次 hasattr / try。
+按 (y, m, d) 缓存 dayobj 及提取出的年月日干支（有界 LRU，带命中 / 未命中计数）。
+sxtwl 在第一次 get_adapter() / load_sxtwl() 时才导入（导入 + 探测约 20ms），
+HAVE_SXTWL 只表示已安装（importlib 查找，不执行导入）。
+"""
+import importlib.util
+import threading
+from functools import lru_cache
+
+from .ganzhi import tiangan, dizhi
+
+HAVE_SXTWL = importlib.util.find_spec("sxtwl") is not None
+_sxtwl = None
+_load_lock = threading.RLock()
+
+DEFAULT_CACHE_SIZE = 8192
+_PROBE_DATE = (2000, 1, 1)
+
+
+def _gz_from_obj(val):
+    return tiangan[int(val.tg)] + dizhi[int(val.dz)]
+
+
+def _gz_from_seq(val):
+    return tiangan[int(val[0])] + dizhi[int(val[1])]
+
+
+def _gz_any(val):
+    if hasattr(val, "tg") and hasattr(val, "dz"):
+        return _gz_from_obj(val)
+    if isinstance(val, (list, tuple)) and len(val) >= 2:
+        return _gz_from_seq(val)
+    return None
+
+
+class SxtwlAdapter:
+    def __init__(self, module, cache_size=DEFAULT_CACHE_SIZE):
+        self.module = module
+        self.from_solar = self._detect_from_solar()
+        probe = self.from_solar(*_PROBE_DATE) if self.from_solar else None
+        self.available = probe is not None
+        self._gz = self._detect_gz(probe)
+        self._hour = self._detect_hour(probe)
+        self.from_lunar, self._solar_of = self._detect_lunar()
+        self.cache_size = cache_size
+        self.day = lru_cache(maxsize=cache_size)(self._day)
+
+    # ---------- 探测（只在构造时执行） ----------
+    def _detect_from_solar(self):
+        mod = self.module
+        if hasattr(mod, "fromSolar"):
+            try:
+                mod.fromSolar(*_PROBE_DATE)
+                return lambda y, m, d: mod.fromSolar(int(y), int(m), int(d))
+            except Exception:
+                pass
+        if hasattr(mod, "Calendar") and hasattr(mod, "Solar"):
+            try:
+                cal = mod.Calendar()
+            except Exception:
+                return None
+            for name in ("getDayBySolar", "getLunarBySolar"):
+                fn = getattr(cal, name, None)
+                if fn is None:
+                    continue
+                try:
+                    fn(mod.Solar(*_PROBE_DATE))
+                except Exception:
+                    continue
+                return lambda y, m, d, fn=fn: fn(mod.Solar(int(y), int(m), int(d)))
+        return None
+
+    def _detect_gz(self, probe):
+        if probe is None or not hasattr(probe, "getYearGZ"):
+            return None
+        try:
+            val = probe.getYearGZ()
+        except Exception:
+            return None
+        if hasattr(val, "tg") and hasattr(val, "dz"):
+            return _gz_from_obj
+        if isinstance(val, (list, tuple)) and len(val) >= 2:
+            return _gz_from_seq
+        return None
+
+    def _detect_hour(self, probe):
+        """返回 (dayobj, day_gz, hour) -> 时柱字符串 的函数，或 None"""
+        if probe is None:
+            return None
+        if hasattr(probe, "getHourGZ"):
+            try:
+                conv = _gz_from_obj if hasattr(probe.getHourGZ(0), "tg") else _gz_from_seq
+                return lambda dayobj, day_gz, hour: conv(dayobj.getHourGZ(int(hour)))
+            except Exception:
+                pass
+        get_shi = getattr(self.module, "getShiGz", None)
+        if get_shi is not None:
+            try:
+                conv = _gz_from_obj if hasattr(get_shi(0, 0), "tg") else _gz_from_seq
+            except Exception:
+                return None
+            return lambda dayobj, day_gz, hour: conv(get_shi(tiangan.index(day_gz[0]), int(hour))) if day_gz else None
+        return None
+
+    def _detect_lunar(self):
+        fn = getattr(self.module, "fromLunar", None)
+        if fn is None:
+            return None, None
+        try:
+            probe = fn(2000, 1, 1, False)
+            from_lunar = lambda y, m, d, leap: fn(int(y), int(m), int(d), bool(leap))  # noqa: E731
+        except TypeError:
+            try:
+                probe = fn(2000, 1, 1)
+            except Exception:
+                return None, None
+            # 旧接口不支持闰月参数：闰月无法表示，交给后备转换
+            from_lunar = lambda y, m, d, leap: None if leap else fn(int(y), int(m), int(d))  # noqa: E731
+        except Exception:
+            return None, None
+        # sxtwl 对不存在的农历日期（如非闰月标闰、小月三十）不报错而是顺延，需回读校验
+        if hasattr(probe, "getLunarMonth") and hasattr(probe, "getLunarDay"):
+            raw, leap_of = from_lunar, getattr(probe.__class__, "isLunarLeap", None)
+
+            def from_lunar(y, m, d, leap):
+                dayobj = raw(y, m, d, leap)
+                if dayobj is None or dayobj.getLunarMonth() != int(m) or dayobj.getLunarDay() != int(d):
+                    return None
+                if leap_of is not None and bool(leap_of(dayobj)) != bool(leap):
+                    return None
+                return dayobj
+        if callable(getattr(probe, "getSolar", None)):
+            def solar_of(dayobj):
+                s = dayobj.getSolar()
+                return s.getYear(), s.getMonth(), s.getDay()
+        elif hasattr(probe, "getSolarYear"):
+            def solar_of(dayobj):
+                return dayobj.getSolarYear(), dayobj.getSolarMonth(), dayobj.getSolarDay()
+        else:
+            return None, None
+        return from_lunar, solar_of
+
+    # ---------- 使用 ----------
+    def _day(self, y, m, d):
+        dayobj = self.from_solar(y, m, d) if self.from_solar else None
+        if dayobj is None or self._gz is None:
+            return dayobj, None, None, None
+        out = []
+        for name in ("getYearGZ", "getMonthGZ", "getDayGZ"):
+            try:
+                out.append(self._gz(getattr(dayobj, name)()))
+            except Exception:
+                out.append(None)
+        return (dayobj, *out)
+
+    def ganzhi(self, y, m, d):
+        """(年柱, 月柱, 日柱)（取不到的为 None），按日期缓存"""
+        return self.day(int(y), int(m), int(d))[1:]
+
+    def hour_ganzhi(self, y, m, d, hour):
+        if self._hour is None:
+            return None
+        dayobj, _, _, day_gz = self.day(int(y), int(m), int(d))
+        if dayobj is None:
+            return None
+        try:
+            return self._hour(dayobj, day_gz, hour)
+        except Exception:
+            return None
+
+    def gz_of(self, val):
+        """sxtwl 返回的干支值 -> 字符串"""
+        return self._gz(val) if self._gz else _gz_any(val)
+
+    def lunar_to_solar(self, ly, lm, ld, isleap=False):
+        """返回 (y, m, d)；该版本 sxtwl 不支持时返回 None"""
+        if self.from_lunar is None:
+            return None
+        dayobj = self.from_lunar(ly, lm, ld, isleap)
+        if dayobj is None:
+            return None
+        return self._solar_of(dayobj)
+
+    def cache_stats(self):
+        info = self.day.cache_info()
+        total = info.hits + info.misses
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize,
+                "maxsize": info.maxsize, "hit_rate": info.hits / total if total else 0.0}
+
+    def cache_clear(self):
+        self.day.cache_clear()
+
+
+_ADAPTER = None
+
+
+def load_sxtwl():
+    """导入 sxtwl（兼容不同实现，但不依赖于它的特定类名）；未安装或导入失败返回 None"""
+    global _sxtwl
+    if _sxtwl is None and HAVE_SXTWL:
+        with _load_lock:
+            if _sxtwl is None:
+                try:
+                    import sxtwl
+                    _sxtwl = sxtwl
+                except Exception:
+                    _sxtwl = False
+    return _sxtwl or None
+
+
+def get_adapter():
+    """进程内唯一的适配器（首次调用时导入 sxtwl 并探测接口）；sxtwl 不可用时返回 None"""
+    global _ADAPTER
+    if _ADAPTER is None and HAVE_SXTWL:
+        with _load_lock:
+            if _ADAPTER is None:
+                mod = load_sxtwl()
+                adapter = SxtwlAdapter(mod) if mod is not None else None
+                _ADAPTER = adapter if adapter is not None and adapter.available else False
+    return _ADAPTER or None
+
+
+def loaded_adapter():
+    """已创建的适配器（不触发导入）；尚未创建或不可用时返回 None"""
+    return _ADAPTER or None
+
+
+def __getattr__(name):
+    # 兼容旧用法 sxtwl_adapter.sxtwl：访问时才导入
+    if name == "sxtwl":
+        return load_sxtwl()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+NumPy 向量化批量排盘：输入整数数组（年、月、日、时、分），输出 0-59 干支序号数组。
+规则与 calc_bazi 的非 sxtwl 路径一致：
+- 日柱：锚点法（ANCHOR_DATE 起算），23:00 及以后归入次日
+- 年柱、月支：节气表（jieqi.JIE_TABLE，精确到分钟）一次 searchsorted；超出 1900-2100 时
+  退回立春 2/4 为界、近似节气分月（APPROX_JIEQI）
+- 月柱：月支 + 五虎遁，可逐行手动指定月支
+- 时柱：五鼠遁
+- 可选真太阳时（longitude / tz）：日柱换日与时柱按真太阳时（均时差查 solartime.EOT_SECONDS），
+  年柱、月柱按换算到北京时间的时刻
+另有农历 <-> 公历的数组版转换（lunar_to_solar_batch / solar_to_lunar_batch）。
+干支序号 idx 满足 idx % 10 == 天干序号、idx % 12 == 地支序号，可用 GZS_LIST[idx] 还原。
+"""
+import numpy as np
+
+from .core import GZS_LIST, ANCHOR_DATE, ANCHOR_INDEX, APPROX_JIEQI, APPROX_JIE_MD
+from . import jieqi
+from .engine import JI_MASK, XIONG_MASK
+from .rules import get_rules
+from .ganzhi import hour_pillar_index, month_pillar_index
+from .solartime import BEIJING_TZ, EOT_SECONDS
+
+# 时辰未知（hour 数组中的哨兵值；输出的时柱同样以 -1 表示未知）
+HOUR_UNKNOWN = -1
+# 不手动指定月支
+NO_MANUAL_BRANCH = -1
+
+_EPOCH_ORD = np.datetime64("1970-01-01", "D")
+_ANCHOR_DAYS = int((np.datetime64(ANCHOR_DATE, "D") - _EPOCH_ORD).astype(np.int64))
+_LICHUN_MD = APPROX_JIEQI["立春"][0] * 100 + APPROX_JIEQI["立春"][1]
+_APPROX_JIE_MD = np.array(APPROX_JIE_MD, dtype=np.int64)
+_JIE_TABLE = np.asarray(jieqi.JIE_TABLE, dtype=np.int64)
+_JIE_EPOCH_DAYS = int((np.datetime64(jieqi.EPOCH, "D") - _EPOCH_ORD).astype(np.int64))
+# 第 61 行（下标 -1）为全 0，时柱未知时查到空掩码
+_JI_MASK = np.array(JI_MASK + (0,), dtype=np.uint64)
+_XIONG_MASK = np.array(XIONG_MASK + (0,), dtype=np.uint64)
+_EOT_SECONDS = np.array(EOT_SECONDS, dtype=np.int64)
+
+
+def days_since_epoch(years, months, days):
+    """公历日期数组 -> 距 1970-01-01 的天数（int64）；非法日期抛 ValueError"""
+    ym = (years - 1970).astype("M8[Y]").astype("M8[M]") + (months - 1)
+    dd = ym.astype("M8[D]") + (days - 1)
+    bad = (months < 1) | (months > 12) | (days < 1) | (dd.astype("M8[M]") != ym)
+    if bad.any():
+        raise ValueError(f"非法日期 {int(bad.sum())} 条（首个位置 {int(np.argmax(bad))}）")
+    return (dd - _EPOCH_ORD).astype(np.int64)
+
+
+def day_index_batch(days_epoch, hours=None):
+    """日柱序号（锚点法）；hours >= 23 的行归入次日"""
+    delta = days_epoch - _ANCHOR_DAYS
+    if hours is not None:
+        delta = delta + (hours >= 23)
+    return (ANCHOR_INDEX + delta) % 60
+
+
+def hour_index_batch(day_idx, hours, minutes):
+    """时柱序号（五鼠遁）；hours == HOUR_UNKNOWN 的行输出 -1"""
+    unknown = hours < 0
+    return np.where(unknown, HOUR_UNKNOWN, hour_pillar_index(day_idx, np.where(unknown, 0, hours), minutes))
+
+
+def _shift_batch(days_epoch, hours, minutes, seconds, skip):
+    """(天数, 时, 分) 数组平移 seconds 秒，skip 的行不动"""
+    sec = (hours * 60 + minutes) * 60 + np.where(skip, 0, seconds)
+    shift, sec = np.divmod(sec, 86400)
+    return (np.where(skip, days_epoch, days_epoch + shift), np.where(skip, hours, sec // 3600),
+            np.where(skip, minutes, sec % 3600 // 60))
+
+
+def place_batch(days_epoch, years, hours, minutes, longitude, tz=None):
+    """
+    出生地钟表时间 -> (北京时间, 真太阳时)，各为 (距 1970-01-01 天数, 时, 分) 数组，与
+    solartime.beijing_time / true_solar_time 一致：前者查节气定年柱、月柱，后者定日柱、时柱。
+    时辰未知的行原样返回；longitude 为 NaN 的行真太阳时即钟表时间；经度、时区越界抛 ValueError
+    """
+    lon = np.broadcast_to(np.asarray(np.nan if longitude is None else longitude, dtype=np.float64),
+                          days_epoch.shape)
+    tz = np.broadcast_to(np.asarray(BEIJING_TZ if tz is None else tz, dtype=np.float64), days_epoch.shape)
+    tz = np.where(np.isnan(tz), BEIJING_TZ, tz)
+    unknown = hours < 0
+    skip = np.isnan(lon) | unknown
+    bad = ~unknown & ((tz < -12) | (tz > 14)) | ~skip & (np.abs(lon) > 180)
+    if bad.any():
+        raise ValueError(f"经度或时区越界 {int(bad.sum())} 条（首个位置 {int(np.argmax(bad))}）")
+    beijing = _shift_batch(days_epoch, hours, minutes, np.rint((BEIJING_TZ - tz) * 3600).astype(np.int64), unknown)
+    doy = days_epoch - (years - 1970).astype("M8[Y]").astype("M8[D]").astype(np.int64)
+    offset = np.rint(np.where(skip, 0, lon) * 240 - tz * 3600).astype(np.int64) + _EOT_SECONDS[doy]
+    return beijing, _shift_batch(days_epoch, hours, minutes, offset, skip)
+
+
+def year_month_batch(days_epoch, years, months, days, hours, minutes):
+    """
+    (年柱所属年份, 月支序号) 数组：节气表范围内一次 searchsorted（精确到分钟），
+    范围外退回立春 2/4 与近似节气月日
+    """
+    ts = (days_epoch - _JIE_EPOCH_DAYS) * 1440 + np.maximum(hours, 0) * 60 + np.where(hours < 0, 0, minutes)
+    in_table = (ts >= 0) & (ts < jieqi.END_MINUTE)
+    k = np.searchsorted(_JIE_TABLE, ts, side="right") - 1
+    j = k % 12
+    # j == 0 为小寒（丑月），仍属上一年；k == -1 为 1900 年首个小寒前（1899 年子月）
+    jq_year = jieqi.START_YEAR + k // 12 - (j == 0)
+    jq_branch = (j + 1) % 12
+    md = months * 100 + days
+    approx_year = years - (md < _LICHUN_MD)
+    # 小寒前为子月(0)，小寒起丑月(1)，立春起寅月(2) ... 大雪起子月
+    approx_branch = np.searchsorted(_APPROX_JIE_MD, md, side="right") % 12
+    return np.where(in_table, jq_year, approx_year), np.where(in_table, jq_branch, approx_branch)
+
+
+def month_index_batch(year_idx, branch, manual_branch=None):
+    """月柱序号：月支（或逐行手动月支）+ 五虎遁定月干"""
+    if manual_branch is not None:
+        branch = np.where(manual_branch >= 0, manual_branch, branch)
+    return month_pillar_index(year_idx, branch)
+
+
+def calc_bazi_batch(years, months, days, hours=None, minutes=None, manual_month_branch=None,
+                    longitude=None, tz=None):
+    """
+    向量化四柱。参数均为等长整数数组（或可广播的标量）：
+      hours 取 HOUR_UNKNOWN(-1) 表示时辰未知；minutes 缺省为 0
+      manual_month_branch 为地支序号 0-11，NO_MANUAL_BRANCH(-1) 表示不指定
+      longitude / tz 为出生地经度与时区（浮点数组或标量，NaN 同缺省；tz 缺省 8）：年柱、月柱按换算到
+        北京时间的时刻查节气，日柱、时柱有经度时按真太阳时，否则按当地钟表时间
+    返回 dict: {"year","month","day","hour"} -> int64 数组（时柱未知为 -1）
+    """
+    years = np.asarray(years, dtype=np.int64)
+    months = np.asarray(months, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    years, months, days = np.broadcast_arrays(years, months, days)
+    hours = np.full(years.shape, HOUR_UNKNOWN, dtype=np.int64) if hours is None \
+        else np.broadcast_to(np.asarray(hours, dtype=np.int64), years.shape)
+    minutes = np.zeros(years.shape, dtype=np.int64) if minutes is None \
+        else np.broadcast_to(np.asarray(minutes, dtype=np.int64), years.shape)
+    if manual_month_branch is not None:
+        manual_month_branch = np.broadcast_to(np.asarray(manual_month_branch, dtype=np.int64), years.shape)
+
+    ep = days_since_epoch(years, months, days)
+    if longitude is None and tz is None:
+        adj_year, branch = year_month_batch(ep, years, months, days, hours, minutes)
+    else:
+        (bj, bj_hours, bj_minutes), (ep, hours, minutes) = place_batch(ep, years, hours, minutes, longitude, tz)
+        adj_year, branch = year_month_batch(bj, *_split_days(bj), bj_hours, bj_minutes)
+    day_idx = day_index_batch(ep, hours)
+    year_idx = (adj_year - 1984) % 60
+    month_idx = month_index_batch(year_idx, branch, manual_month_branch)
+    hour_idx = hour_index_batch(day_idx, hours, minutes)
+    return {"year": year_idx, "month": month_idx, "day": day_idx, "hour": hour_idx}
+
+
+def to_ganzhi(idx):
+    """干支序号数组 -> 字符串列表（-1 -> "不知道"）"""
+    return ["不知道" if i < 0 else GZS_LIST[i] for i in np.asarray(idx).tolist()]
+
+
+_RULE_MASKS = {}  # CompiledRules -> (吉, 凶) 掩码数组，每个规则集只转换一次
+
+
+def _mask_arrays(rules):
+    if rules is None:
+        return _JI_MASK, _XIONG_MASK
+    r = get_rules(rules)
+    arrays = _RULE_MASKS.get(r)
+    if arrays is None:
+        arrays = _RULE_MASKS[r] = (np.array(r.ji_mask + (0,), dtype=np.uint64),
+                                   np.array(r.xiong_mask + (0,), dtype=np.uint64))
+    return arrays
+
+
+def chart_masks_batch(*pillars, rules=None):
+    """
+    若干柱序号数组（-1 跳过）-> (吉掩码, 凶掩码) uint64 数组，与 engine.chart_masks 一致；
+    rules 为规则集名称或 CompiledRules，缺省为默认规则
+    """
+    ji_t, xiong_t = _mask_arrays(rules)
+    ji = np.zeros(np.shape(pillars[0]), dtype=np.uint64)
+    xiong = np.zeros_like(ji)
+    for p in pillars:
+        p = np.asarray(p)
+        ji |= ji_t[p]
+        xiong |= xiong_t[p]
+    return ji, xiong
+
+
+# ---------- 农历 <-> 公历（内置表，仅覆盖农历 1900-2100） ----------
+_LUNAR = None
+_ORD_1970 = 719163  # date(1970, 1, 1).toordinal()
+
+
+def _lunar_tables():
+    from . import lunar
+    global _LUNAR
+    if _LUNAR is None:
+        _LUNAR = {
+            "start": np.asarray(lunar.MONTH_START, dtype=np.int64),
+            "year": np.asarray(lunar.MONTH_YEAR, dtype=np.int64),
+            "num": np.asarray(lunar.MONTH_NUM, dtype=np.int64),
+            "leap": np.asarray(lunar.MONTH_LEAP, dtype=bool),
+            "first": np.asarray(lunar.YEAR_FIRST, dtype=np.int64),
+            "leap_month": np.asarray(lunar.LEAP_MONTH, dtype=np.int64),
+        }
+    return _LUNAR
+
+
+def _split_days(days_epoch):
+    dd = days_epoch.astype("M8[D]")
+    y = dd.astype("M8[Y]")
+    m = dd.astype("M8[M]")
+    return (y.astype(np.int64) + 1970,
+            (m - y.astype("M8[M]")).astype(np.int64) + 1,
+            (dd - m.astype("M8[D]")).astype(np.int64) + 1)
+
+
+def lunar_to_solar_batch(lyears, lmonths, ldays, leaps=None):
+    """农历数组 -> (公历年, 月, 日) 数组；存在不合法日期时抛 ValueError"""
+    from . import lunar
+    t = _lunar_tables()
+    ly = np.asarray(lyears, dtype=np.int64)
+    lm = np.asarray(lmonths, dtype=np.int64)
+    ld = np.asarray(ldays, dtype=np.int64)
+    leap = np.zeros(ly.shape, dtype=bool) if leaps is None else np.asarray(leaps, dtype=bool)
+    yi = ly - lunar.START_YEAR
+    bad = (yi < 0) | (yi > lunar.END_YEAR - lunar.START_YEAR) | (lm < 1) | (lm > 12)
+    yi = np.where(bad, 0, yi)
+    lp = t["leap_month"][yi]
+    bad |= leap & (lm != lp)
+    k = t["first"][yi] + lm - 1 + ((lp > 0) & ((lm > lp) | leap))
+    k = np.where(bad, 0, k)
+    bad |= (ld < 1) | (ld > t["start"][k + 1] - t["start"][k])
+    if bad.any():
+        raise ValueError(f"农历日期不存在或超出 {lunar.START_YEAR}-{lunar.END_YEAR}：{int(bad.sum())} 条（首个位置 {int(np.argmax(bad))}）")
+    return _split_days(t["start"][k] + ld - 1 - _ORD_1970)
+
+
+def solar_to_lunar_batch(years, months, days):
+    """公历数组 -> (农历年, 月, 日, 是否闰月) 数组；超出表范围时抛 ValueError"""
+    from . import lunar
+    t = _lunar_tables()
+    o = days_since_epoch(np.asarray(years, dtype=np.int64), np.asarray(months, dtype=np.int64),
+                         np.asarray(days, dtype=np.int64)) + _ORD_1970
+    bad = (o < lunar.MONTH_START[0]) | (o >= lunar.END_ORDINAL)
+    if bad.any():
+        raise ValueError(f"公历日期超出农历表范围：{int(bad.sum())} 条（首个位置 {int(np.argmax(bad))}）")
+    k = np.searchsorted(t["start"], o, side="right") - 1
+    return t["year"][k], t["num"][k], o - t["start"][k] + 1, t["leap"][k]
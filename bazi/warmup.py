@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+预热：进程启动后在后台线程里做掉第一次排盘才会付出的开销——导入 sxtwl 并探测接口、
+sxtwl 计算当年节气、展开农历表——让首个请求不必等待。
+可附带导入按需模块（如 bazi.almanac 会连带导入 numpy）。
+
+  from bazi.warmup import warm_up
+  warm_up()                                  # 后台线程，立即返回
+  warm_up(modules=("bazi.almanac",))         # 顺带导入日历模块
+  warm_up(background=False)                  # 当前线程同步执行（如进程池 initializer）
+"""
+import importlib
+import threading
+import time
+from datetime import datetime
+
+_STATE = {"thread": None, "seconds": None, "error": None}
+_lock = threading.Lock()
+
+
+def _run(modules):
+    t0 = time.perf_counter()
+    try:
+        from .core import calc_bazi
+        from .lunar import solar_to_lunar
+        now = datetime.now()
+        calc_bazi(now.year, now.month, now.day, now.hour, now.minute)
+        solar_to_lunar(now.year, now.month, now.day)
+        for name in modules:
+            importlib.import_module(name)
+    except Exception as e:  # 预热失败不影响正常请求，首次使用时会再报错
+        _STATE["error"] = f"{type(e).__name__}: {e}"
+    _STATE["seconds"] = time.perf_counter() - t0
+
+
+def warm_up(background=True, modules=()):
+    """启动预热，重复调用只执行一次；background 时返回线程对象（守护线程），否则返回 None"""
+    with _lock:
+        if _STATE["thread"] is not None:
+            return (_STATE["thread"] or None) if background else None
+        if background:
+            t = threading.Thread(target=_run, args=(tuple(modules),), name="bazi-warmup", daemon=True)
+            _STATE["thread"] = t
+            t.start()
+            return t
+        _STATE["thread"] = False
+    _run(modules)
+    return None
+
+
+def status():
+    """{"started", "done", "seconds", "error"}"""
+    t = _STATE["thread"]
+    return {"started": t is not None,
+            "done": _STATE["seconds"] is not None,
+            "seconds": _STATE["seconds"], "error": _STATE["error"]}
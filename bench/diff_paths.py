@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+差分核对：各优化路径与标量 calc_bazi（参照）逐条比较四柱，按路径统计不一致次数，有不一致时退出码为 1。
+
+比较的路径：
+  vectorized  vectorized.calc_bazi_batch（整批一次，含手动月支、经度 / 时区）
+  daytable    DayTable.lookup（临时生成的逐日柱表，含经度 / 时区）
+  store       ChartStore：put + flush 后重新打开再 get（不可缓存的输入跳过），比较四柱与 source
+  batch       batch.process_record 带表与缓存各跑两遍（未命中、命中），含经度 / 时区
+  reverse     reverse.find_birth_times：结果须含原出生时刻，且各时段首尾分钟排出的四柱相同
+  true_solar  calc_bazi(..., longitude, tz) 与按定义拼出的结果：年柱、月柱取北京时间的 calc_bazi，
+              日柱、时柱取真太阳时（只给时区时为当地钟表时间）的 calc_bazi
+样本：一半为 1900-2100 随机时刻，一半为交节前后 3 小时内（最容易出错的地方）；约 10% 时辰未知、
+10% 手动月支、30% 带出生地经度与时区、10% 只带时区。
+
+默认按节气表路径（不用 sxtwl）；--sxtwl 时参照与表、缓存都用 sxtwl，只比较 daytable / store / batch
+（vectorized、reverse 只实现节气表规则）。
+
+用法（在仓库根目录）：
+  python -m bench.diff_paths                   20000 条
+  python -m bench.diff_paths -n 100000 --seed 7 --json diff_paths.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+
+from bazi import core, jieqi
+from bazi.core import calc_bazi, dizhi
+from bazi.solartime import beijing_time, true_solar_time
+
+PILLARS = ("year", "month", "day", "hour")
+PATHS = ("vectorized", "daytable", "store", "batch", "reverse", "true_solar")
+SXTWL_PATHS = ("daytable", "store", "batch")
+TZS = (8, 8, 9, 7, 5.5, 5.75, 0, 1, -5, -8, -12, 14)
+REVERSE_EVERY = 10  # 反查较慢，每 10 条取 1 条
+SAMPLES = 3
+
+
+def sample(n, seed=1):
+    """[(年, 月, 日, 时, 分, 手动月支序号或 None, 经度或 None, 时区或 None)]"""
+    rnd = random.Random(seed)
+    epoch = datetime(jieqi.START_YEAR, 1, 1)
+    lo, hi = datetime(1900, 1, 1), datetime(2101, 1, 1)
+    out = []
+    for i in range(n):
+        if i % 2:
+            t = epoch + timedelta(minutes=rnd.choice(jieqi.JIE_TABLE) + rnd.randint(-180, 180))
+        else:
+            t = lo + timedelta(minutes=rnd.randrange(int((hi - lo).total_seconds() // 60)))
+        hour, minute = (t.hour, t.minute) if rnd.random() >= 0.1 else (None, None)
+        mb = rnd.randrange(12) if rnd.random() < 0.1 else None
+        lon = tz = None
+        r = rnd.random()
+        if r < 0.4:
+            lon, tz = round(rnd.uniform(-180, 180), 2) if r < 0.3 else None, rnd.choice(TZS)
+        out.append((t.year, t.month, t.day, hour, minute, mb, lon, tz))
+    return out
+
+
+def _ref(y, m, d, hour, minute, mb, lon=None, tz=None):
+    return calc_bazi(y, m, d, hour, minute, manual_month_branch=dizhi[mb] if mb is not None else None,
+                     longitude=lon, tz=tz)
+
+
+def _pillars(r):
+    return tuple(r[p] for p in PILLARS)
+
+
+class Report:
+    def __init__(self):
+        self.checked, self.bad, self.skipped, self.samples = Counter(), Counter(), Counter(), {}
+
+    def check(self, path, case, mine, ref):
+        self.checked[path] += 1
+        if mine != ref:
+            self.bad[path] += 1
+            lst = self.samples.setdefault(path, [])
+            if len(lst) < SAMPLES:
+                lst.append(f"{case}: {mine} != {ref}")
+
+
+def check_vectorized(cases, refs, rep):
+    import numpy as np
+    from bazi.vectorized import calc_bazi_batch, to_ganzhi
+    col = list(zip(*cases))
+    nan = float("nan")
+    r = calc_bazi_batch(col[0], col[1], col[2], [-1 if h is None else h for h in col[3]],
+                        [0 if mi is None else mi for mi in col[4]], [-1 if b is None else b for b in col[5]],
+                        longitude=np.array([nan if v is None else v for v in col[6]]),
+                        tz=np.array([nan if v is None else v for v in col[7]]))
+    got = list(zip(*(to_ganzhi(r[p]) for p in PILLARS)))
+    for case, mine, ref in zip(cases, got, refs):
+        rep.check("vectorized", case, mine, _pillars(ref))
+
+
+def check_daytable(cases, refs, table, rep):
+    from bazi.ganzhi import GZS_LIST
+    for case, ref in zip(cases, refs):
+        try:
+            idx = table.lookup(*case)
+        except KeyError:
+            rep.skipped["daytable"] += 1  # 北京时间或真太阳时落到表外
+            continue
+        rep.check("daytable", case, tuple(GZS_LIST[i] if i >= 0 else "不知道" for i in idx), _pillars(ref))
+
+
+def check_store(cases, path, backend, rep):
+    from bazi.store import ChartStore
+    plain = [c[:5] + (dizhi[c[5]] if c[5] is not None else None,) for c in cases]
+    with ChartStore(path, backend=backend) as store:
+        for args in plain:
+            store.put(*args, result=calc_bazi(*args[:5], manual_month_branch=args[5]))
+    with ChartStore(path, backend=backend) as store:
+        store.prefetch(plain)
+        for case, args in zip(cases, plain):
+            got = store.get(*args)
+            if got is None:
+                rep.skipped["store"] += 1  # 时段内交节等不可缓存的输入
+                continue
+            ref = calc_bazi(*args[:5], manual_month_branch=args[5])
+            rep.check("store", case, _pillars(got) + (got["source"],), _pillars(ref) + (ref["source"],))
+
+
+def check_batch(cases, refs, table, path, backend, rep):
+    from bazi.batch import process_record
+    from bazi.store import ChartStore
+    recs = [{"year": y, "month": m, "day": d, "hour": "" if h is None else h, "minute": "" if mi is None else mi,
+             "manual_month_branch": dizhi[mb] if mb is not None else "",
+             "longitude": "" if lon is None else lon, "tz": "" if tz is None else tz}
+            for y, m, d, h, mi, mb, lon, tz in cases]
+    with ChartStore(path, backend=backend) as store:
+        for _ in range(2):
+            for case, rec, ref in zip(cases, recs, refs):
+                out = process_record(rec, table, store)
+                rep.check("batch", case, out.get("error") or _pillars(out), _pillars(ref))
+            store.flush()
+
+
+def check_reverse(cases, rep):
+    from bazi.reverse import find_birth_times
+    for case in cases[::REVERSE_EVERY]:
+        y, m, d, h, mi, mb, lon, tz = case
+        if h is None or mb is not None or tz is not None:
+            continue
+        ref = _pillars(_ref(y, m, d, h, mi, None))
+        t = datetime(y, m, d, h, mi)
+        slots = list(find_birth_times(*ref))
+        rep.check("reverse", case, any(s.start <= t < s.end for s in slots), True)
+        for s in slots:
+            for u in (s.start, s.end - timedelta(minutes=1)):
+                rep.check("reverse", f"{case} 时段 {u:%Y-%m-%d %H:%M}",
+                          _pillars(_ref(u.year, u.month, u.day, u.hour, u.minute, None)), ref)
+
+
+def check_true_solar(cases, refs, rep):
+    for case, ref in zip(cases, refs):
+        y, m, d, h, mi, mb, lon, tz = case
+        if tz is None or h is None:
+            continue
+        bj = _ref(*beijing_time(y, m, d, h, mi, tz), mb)
+        sy, sm, sd, sh, smin = true_solar_time(y, m, d, h, mi, lon, tz) if lon is not None else (y, m, d, h, mi)
+        solar = _ref(sy, sm, sd, sh, smin, None)
+        rep.check("true_solar", case, _pillars(ref), (bj["year"], bj["month"], solar["day"], solar["hour"]))
+        if lon is not None:
+            rep.check("true_solar", case, ref["true_solar"], f"{sy:04d}-{sm:02d}-{sd:02d} {sh:02d}:{smin:02d}")
+
+
+def run(n=20000, seed=1, use_sxtwl=False):
+    """返回 Report；sxtwl 不可用时 use_sxtwl 无效"""
+    from bazi.daytable import build, DayTable
+    saved = core.HAVE_SXTWL
+    core.HAVE_SXTWL = saved and use_sxtwl
+    rep = Report()
+    try:
+        backend = int(core.HAVE_SXTWL)
+        cases = sample(n, seed)
+        refs = [_ref(*c) for c in cases]
+        with tempfile.TemporaryDirectory() as tmp:
+            table_path = os.path.join(tmp, "daytable.bin")
+            build(table_path)
+            with DayTable(table_path) as table:
+                if not backend:
+                    check_vectorized(cases, refs, rep)
+                check_daytable(cases, refs, table, rep)
+                check_store(cases, os.path.join(tmp, "store.db"), backend, rep)
+                check_batch(cases, refs, table, os.path.join(tmp, "batch.db"), backend, rep)
+            if not backend:
+                check_reverse(cases, rep)
+                check_true_solar(cases, refs, rep)
+    finally:
+        core.HAVE_SXTWL = saved
+    return rep
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench.diff_paths", description="各优化路径 vs 标量 calc_bazi 差分核对")
+    ap.add_argument("-n", type=int, default=20000, help="样本条数")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--sxtwl", action="store_true", help="参照与表、缓存都用 sxtwl（较慢）")
+    ap.add_argument("--json", default=None, help="把汇总与样例写入此 JSON 文件")
+    args = ap.parse_args(argv)
+    if args.sxtwl and not core.HAVE_SXTWL:
+        print("未安装 sxtwl", file=sys.stderr)
+        return 2
+
+    rep = run(args.n, args.seed, args.sxtwl)
+    paths = SXTWL_PATHS if args.sxtwl else PATHS
+    print(f"{args.n} 条样本（seed={args.seed}，年月来源：{'sxtwl' if args.sxtwl else '节气表'}）")
+    print(f"{'路径':<12}{'比较':>10}{'不一致':>10}{'跳过':>8}")
+    for p in paths:
+        print(f"{p:<12}{rep.checked[p]:>10}{rep.bad[p]:>10}{rep.skipped[p]:>8}")
+    for p in paths:
+        for line in rep.samples.get(p, ()):
+            print(f"  {p}: {line}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"n": args.n, "seed": args.seed, "sxtwl": args.sxtwl,
+                       "summary": {p: {"checked": rep.checked[p], "mismatch": rep.bad[p], "skipped": rep.skipped[p]}
+                                   for p in paths},
+                       "samples": rep.samples}, f, ensure_ascii=False, indent=2)
+    return 1 if any(rep.bad[p] for p in paths) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
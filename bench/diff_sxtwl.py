@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+差分核对：逐日、逐时辰比较各规则路径与 sxtwl 的四柱，按柱统计不一致次数。
+优化前后各跑一次，数字不变即说明没有悄悄改变排盘结果。
+（各优化路径与标量 calc_bazi 的逐条一致性见 bench.diff_paths。）
+
+比较的路径：
+  anchor  日柱（锚点法，23:00 起归次日）
+  rule    时柱（五鼠遁，日干取锚点法日柱）
+  jieqi   年柱、月柱（节气表，精确到分钟）
+  approx  年柱、月柱（立春 2/4 定年 + 近似节气月支，节气表范围外的后备）
+每天取 13 个时刻：0:00（早子）、1:00、3:00 …… 21:00、23:00（晚子）。
+
+用法（在仓库根目录，需要 sxtwl）：
+  python -m bench.diff_sxtwl                  1900-2100 全量，进程数默认 CPU 核数
+  python -m bench.diff_sxtwl --start 1980 --end 1990 -w 4 --json diff.json
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+from bazi.core import (HAVE_SXTWL, GZS_LIST, day_ganzhi_by_anchor, get_month_branch_approx,
+                       month_stem_by_fihu_dun, time_ganzhi_by_rule)
+from bazi.jieqi import year_month_by_jieqi
+from bazi.ganzhi import dizhi
+from bazi.sxtwl_adapter import get_adapter
+
+HOURS = (0, 1, 3, 5, 7, 9, 11, 13, 15, 17, 19, 21, 23)
+CHECKS = (("anchor", "day"), ("rule", "hour"), ("jieqi", "year"), ("jieqi", "month"),
+          ("approx", "year"), ("approx", "month"))
+SAMPLES = 3  # 每项保留的不一致样例数
+
+
+def _approx_year_month(y, m, d):
+    year_p = GZS_LIST[((y if (m, d) >= (2, 4) else y - 1) - 1984) % 60]
+    return year_p, month_stem_by_fihu_dun(year_p[0], get_month_branch_approx(y, m, d))
+
+
+def sweep_year(year):
+    """一个公历年的 (比较次数, 不一致计数, 样例)；计数键为 (路径, 柱, 时段)，时段 late_zi 为 23:00"""
+    adapter = get_adapter()
+    total = Counter()
+    bad = Counter()
+    samples = {}
+    d = date(year, 1, 1)
+    while d.year == year:
+        y, m, dd = d.year, d.month, d.day
+        s_year, s_month, s_day = adapter.ganzhi(y, m, dd)
+        approx = _approx_year_month(y, m, dd)
+        for h in HOURS:
+            slot = "late_zi" if h == 23 else "other"
+            day_p = day_ganzhi_by_anchor(y, m, dd, h, 0)
+            jq = year_month_by_jieqi(y, m, dd, h, 0)  # 表外为 None，计为不一致
+            jyear = GZS_LIST[(jq[0] - 1984) % 60] if jq else None
+            got = {
+                ("anchor", "day"): (day_p, s_day),
+                ("rule", "hour"): (time_ganzhi_by_rule(day_p, h, 0), adapter.hour_ganzhi(y, m, dd, h)),
+                ("jieqi", "year"): (jyear, s_year),
+                ("jieqi", "month"): (month_stem_by_fihu_dun(jyear[0], dizhi[jq[1]]) if jq else None, s_month),
+                ("approx", "year"): (approx[0], s_year),
+                ("approx", "month"): (approx[1], s_month),
+            }
+            for key, (mine, ref) in got.items():
+                k = key + (slot,)
+                total[k] += 1
+                if mine != ref:
+                    bad[k] += 1
+                    lst = samples.setdefault(k, [])
+                    if len(lst) < SAMPLES:
+                        lst.append(f"{y:04d}-{m:02d}-{dd:02d} {h:02d}:00 {mine} != sxtwl {ref}")
+        d += timedelta(days=1)
+    return total, bad, samples
+
+
+def sweep(start=1900, end=2100, workers=None):
+    """并行跑完 [start, end] 各年并合并结果"""
+    total, bad, samples = Counter(), Counter(), {}
+    workers = workers or os.cpu_count() or 1
+    years = range(start, end + 1)
+    if workers <= 1:
+        parts = map(sweep_year, years)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        parts = pool.map(sweep_year, years)
+    try:
+        for t, b, s in parts:
+            total.update(t)
+            bad.update(b)
+            for k, lst in s.items():
+                cur = samples.setdefault(k, [])
+                cur.extend(lst[:SAMPLES - len(cur)])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return total, bad, samples
+
+
+def summarize(total, bad):
+    """按 (路径, 柱) 汇总：{"anchor.day": {"checked", "mismatch", "late_zi_mismatch"}}"""
+    out = {}
+    for method, pillar in CHECKS:
+        keys = [(method, pillar, s) for s in ("other", "late_zi")]
+        out[f"{method}.{pillar}"] = {
+            "checked": sum(total[k] for k in keys),
+            "mismatch": sum(bad[k] for k in keys),
+            "late_zi_mismatch": bad[keys[1]],
+        }
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench.diff_sxtwl", description="规则路径 vs sxtwl 差分核对")
+    ap.add_argument("--start", type=int, default=1900)
+    ap.add_argument("--end", type=int, default=2100)
+    ap.add_argument("-w", "--workers", type=int, default=None)
+    ap.add_argument("--json", default=None, help="把汇总与样例写入此 JSON 文件")
+    args = ap.parse_args(argv)
+    if not HAVE_SXTWL or get_adapter() is None:
+        print("需要 sxtwl 才能做差分核对", file=sys.stderr)
+        return 2
+
+    total, bad, samples = sweep(args.start, args.end, args.workers)
+    summary = summarize(total, bad)
+    print(f"{args.start}-{args.end}，每天 {len(HOURS)} 个时刻")
+    print(f"{'路径.柱':<14}{'比较':>10}{'不一致':>10}{'比例':>9}{'其中晚子时':>12}")
+    for name, r in summary.items():
+        rate = r["mismatch"] / r["checked"] if r["checked"] else 0.0
+        print(f"{name:<14}{r['checked']:>10}{r['mismatch']:>10}{rate:>9.3%}{r['late_zi_mismatch']:>12}")
+    for k in sorted(samples):
+        for line in samples[k]:
+            print(f"  {'.'.join(k)}: {line}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"range": [args.start, args.end], "summary": summary,
+                       "samples": {".".join(k): v for k, v in sorted(samples.items())}},
+                      f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+导入耗时预算：在全新子进程中导入各入口模块，检查
+  1. 耗时（取多次中位数）不超过预算
+  2. 不会连带导入重依赖（sxtwl、lunarcalendar、numpy、streamlit 应在首次使用时才导入）
+计时前先导入宿主进程本来就会加载的模块（如 ASGI 服务器已导入 asyncio），只计本包新增的部分。
+
+用法（在仓库根目录）：
+  python -m bench.importtime              超预算或导入了不该导入的模块时退出码为 1
+  python -m bench.importtime --scale 2    预算放宽为 2 倍（慢机器 / CI）
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY = ("sxtwl", "lunarcalendar", "numpy", "streamlit")
+# 模块 -> (预算毫秒, 不应连带导入的模块, 计时前预先导入的模块)
+BUDGETS = {
+    "bazi": (30, HEAVY, ()),
+    "bazi.batch": (35, HEAVY, ()),
+    "bazi.service": (40, HEAVY, ("asyncio",)),
+}
+RUNS = 5
+
+_PROBE = """
+import json, sys, time
+{preload}
+t = time.perf_counter()
+import {mod}
+dt = (time.perf_counter() - t) * 1000
+print(json.dumps({{"ms": dt, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(mod, heavy, preload=(), runs=RUNS):
+    """返回 (中位数毫秒, 被连带导入的重依赖列表)"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    times, loaded = [], set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(mod=mod, heavy=tuple(heavy),
+                                                                    preload="\n".join(f"import {p}" for p in preload))],
+                             capture_output=True, text=True, env=env, check=True).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        times.append(r["ms"])
+        loaded.update(r["loaded"])
+    return statistics.median(times), sorted(loaded)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench.importtime", description="导入耗时预算检查")
+    ap.add_argument("--scale", type=float, default=1.0, help="预算倍数")
+    args = ap.parse_args(argv)
+    failed = False
+    print(f"{'模块':<16}{'耗时':>10}{'预算':>10}  连带导入")
+    for mod, (budget, heavy, preload) in BUDGETS.items():
+        ms, loaded = measure(mod, heavy, preload)
+        limit = budget * args.scale
+        ok = ms <= limit and not loaded
+        failed |= not ok
+        print(f"{mod:<16}{ms:>8.1f}ms{limit:>8.0f}ms  {', '.join(loaded) or '-'}{'' if ok else '  ← 超预算'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试：各排盘路径的吞吐（ops/s）与峰值内存，并与保存的基线比较。
+
+用法（在仓库根目录）：
+  python -m bench.run                 运行并与 bench/baseline.json 比较，退步超过阈值时退出码为 1
+  python -m bench.run --save          运行并覆盖基线
+  python -m bench.run -k calc_bazi    只跑名称包含 calc_bazi 的用例
+
+阈值：ops/s 低于基线 (1 - tolerance) 或峰值内存高于基线 (1 + tolerance) 判为退步；
+tolerance 默认取基线文件中的 "tolerance"（缺省 0.25），单个用例可在基线中另设。
+基线与机器相关，换机器后请先 --save。
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import date
+
+from bazi import core
+from bazi.core import (analyze_bazi, calc_bazi, day_ganzhi_by_anchor, ganzhi_years,
+                       get_month_branch_approx, time_ganzhi_by_rule)
+from bazi.lunar import lunar_to_solar, solar_to_lunar
+from bazi.sxtwl_adapter import loaded_adapter
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+N_INPUTS = 2000      # 每个用例的输入条数（固定随机种子）
+N_COLD = 200         # 不走缓存的 calc_bazi 每条需按年重算节气（毫秒级），取前 N_COLD 条
+MIN_TIME = 0.2       # 每轮至少运行的秒数
+REPEAT = 5           # 取最快一轮
+
+
+@contextmanager
+def sxtwl_disabled():
+    """临时让 calc_bazi 走节气表 / 近似路径"""
+    saved = core.HAVE_SXTWL
+    core.HAVE_SXTWL = False
+    try:
+        yield
+    finally:
+        core.HAVE_SXTWL = saved
+
+
+def _dates(n, seed=1):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        d = date.fromordinal(rnd.randint(date(1900, 1, 1).toordinal(), date(2100, 12, 31).toordinal()))
+        out.append((d.year, d.month, d.day, rnd.randint(0, 23), rnd.randint(0, 59)))
+    return out
+
+
+def _clear_sxtwl_cache():
+    adapter = loaded_adapter()
+    if adapter is not None:
+        adapter.cache_clear()
+
+
+def _cases():
+    """
+    名称 -> (输入列表, 单次操作函数[, 重置函数])；操作函数每次处理其中一条，
+    重置函数（须很便宜）在每遍处理输入之前调用，用来清掉会让后续轮次只测到缓存命中的状态
+    """
+    dates = _dates(N_INPUTS)
+    charts = [calc_bazi(y, m, d, h, mi) for y, m, d, h, mi in dates]
+    pillars = [(c["year"], c["month"], c["day"], c["hour"]) for c in charts]
+    lunar = [solar_to_lunar(y, m, d) for y, m, d, _, _ in dates]
+    jixiong = [analyze_bazi(*p) for p in pillars]
+    cur = date.today().year
+
+    def year_mapping(jx):
+        # 与 app._show_years 相同：每个干支的 1900-2100 年份 + 二分找未来年份
+        for gz in jx[0] + jx[1]:
+            years = ganzhi_years(gz, 1900, 2100)
+            bisect_left(years, cur)
+
+    def calc_no_sxtwl(a):
+        with sxtwl_disabled():
+            calc_bazi(*a)
+
+    # sxtwl 结果按日期缓存（LRU 8192 条，装得下全部输入）：calc_bazi 每遍前清缓存，测未命中时
+    # 逐日取 sxtwl（含按年重算节气）的路径；calc_bazi_warm 不清，测缓存命中后的路径
+    return {
+        "day_ganzhi_by_anchor": (dates, lambda a: day_ganzhi_by_anchor(a[0], a[1], a[2], a[3], a[4])),
+        "get_month_branch_approx": (dates, lambda a: get_month_branch_approx(a[0], a[1], a[2])),
+        "time_ganzhi_by_rule": (list(zip(pillars, dates)), lambda a: time_ganzhi_by_rule(a[0][2], a[1][3], a[1][4])),
+        "calc_bazi": (dates[:N_COLD], lambda a: calc_bazi(*a), _clear_sxtwl_cache),
+        "calc_bazi_warm": (dates, lambda a: calc_bazi(*a)),
+        "calc_bazi_no_sxtwl": (dates, calc_no_sxtwl),
+        "analyze_bazi": (pillars, lambda a: analyze_bazi(*a)),
+        "year_mapping": (jixiong, year_mapping),
+        "lunar_to_solar": (lunar, lambda a: lunar_to_solar(*a)),
+        "solar_to_lunar": (dates, lambda a: solar_to_lunar(a[0], a[1], a[2])),
+    }
+
+
+def measure(inputs, op, reset=None):
+    """返回 (ops/s, 处理一遍输入的峰值内存字节)；reset 在每遍处理输入之前调用（计入耗时）"""
+    for a in inputs[:50]:  # 预热（导入 sxtwl、各种缓存）
+        op(a)
+    best = 0.0
+    for _ in range(REPEAT):
+        n = 0
+        t0 = time.perf_counter()
+        while True:
+            if reset is not None:
+                reset()
+            for a in inputs:
+                op(a)
+            n += len(inputs)
+            dt = time.perf_counter() - t0
+            if dt >= MIN_TIME:
+                break
+        best = max(best, n / dt)
+    if reset is not None:
+        reset()
+    tracemalloc.start()
+    for a in inputs:
+        op(a)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def compare(results, baseline):
+    """返回 [(名称, 说明)] 退步列表"""
+    tol_all = baseline.get("tolerance", DEFAULT_TOLERANCE)
+    bad = []
+    for name, r in results.items():
+        b = baseline.get("cases", {}).get(name)
+        if not b:
+            continue
+        tol = b.get("tolerance", tol_all)
+        if r["ops_per_sec"] < b["ops_per_sec"] * (1 - tol):
+            bad.append((name, f"ops/s {r['ops_per_sec']:.0f} < 基线 {b['ops_per_sec']:.0f} x {1 - tol:.2f}"))
+        if r["peak_bytes"] > b["peak_bytes"] * (1 + tol) + 4096:
+            bad.append((name, f"峰值内存 {r['peak_bytes']} > 基线 {b['peak_bytes']} x {1 + tol:.2f}"))
+    return bad
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench.run", description="排盘基准测试")
+    ap.add_argument("-k", "--filter", default="", help="只运行名称包含该子串的用例")
+    ap.add_argument("--save", action="store_true", help="把结果写为新基线")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--json", default=None, help="另把结果写入此 JSON 文件")
+    args = ap.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    results = {}
+    print(f"{'用例':<26}{'ops/s':>14}{'峰值内存':>12}{'基线 ops/s':>14}{'变化':>9}")
+    for name, (inputs, op, *reset) in _cases().items():
+        if args.filter not in name:
+            continue
+        ops, peak = measure(inputs, op, *reset)
+        results[name] = {"ops_per_sec": round(ops, 1), "peak_bytes": peak}
+        b = baseline.get("cases", {}).get(name)
+        ref = f"{b['ops_per_sec']:>14.0f}{ops / b['ops_per_sec'] - 1:>+9.1%}" if b else f"{'-':>14}{'':>9}"
+        print(f"{name:<26}{ops:>14.0f}{peak / 1024:>10.1f}KB{ref}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.save:
+        cases = dict(baseline.get("cases", {}))
+        cases.update(results)
+        out = {"tolerance": baseline.get("tolerance", DEFAULT_TOLERANCE),
+               "machine": f"{platform.machine()} {platform.python_implementation()} {platform.python_version()}",
+               "cases": cases}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"已写入基线 {args.baseline}")
+        return 0
+    bad = compare(results, baseline)
+    for name, why in bad:
+        print(f"退步：{name}：{why}", file=sys.stderr)
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
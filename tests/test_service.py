@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""bazi.service：直接以 ASGI 调用（不起服务器）"""
+import asyncio
+import json
+import sqlite3
+import time
+
+import pytest
+
+from bazi import core
+from bazi.service import BaziService
+
+
+@pytest.fixture(autouse=True)
+def _no_sxtwl(monkeypatch):
+    monkeypatch.setattr(core, "HAVE_SXTWL", False)  # 走节气表，结果确定且快
+
+
+async def call(app, method, path, body=None):
+    raw = json.dumps(body).encode() if body is not None else b""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": raw}
+
+    async def send(msg):
+        sent.append(msg)
+
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def _rec(i):
+    return {"year": 1950 + i % 100, "month": 1 + i % 12, "day": 1 + i % 28, "hour": i % 24, "minute": i % 60}
+
+
+def test_chart_not_blocked_by_store_write_lock(tmp_path):
+    """其他连接持有写锁时，单条请求（含攒满 2000 条以上的待写入）仍立即返回"""
+    path = str(tmp_path / "charts.db")
+    app = BaziService(workers=1, store=path)
+
+    async def main():
+        await call(app, "POST", "/chart", _rec(0))  # 建表
+        app._get_store().flush()
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            slowest = 0.0
+            for i in range(1, 2500):
+                t0 = time.perf_counter()
+                status, body = await call(app, "POST", "/chart", _rec(i))
+                slowest = max(slowest, time.perf_counter() - t0)
+                assert status == 200 and "error" not in body
+            await asyncio.sleep(1.5)  # 让后台写入开始等锁
+            t0 = time.perf_counter()
+            status, _ = await call(app, "POST", "/chart", _rec(3000))
+            slowest = max(slowest, time.perf_counter() - t0)
+            assert status == 200
+            assert slowest < 0.5
+            assert app._get_store().stats()["pending"] > 0
+        finally:
+            other.rollback()
+            other.close()
+        await asyncio.sleep(1.5)
+        app.close()
+
+    asyncio.run(main())
+    store = app._get_store()
+    assert store.stats()["pending"] == 0
+    assert len(store) == store.writes > 2000  # 锁释放后全部写入（时段内交节等不可缓存的除外）
+
+
+def test_chart_joins_inflight_batch():
+    app = BaziService(workers=1)
+
+    async def main():
+        task = asyncio.create_task(call(app, "POST", "/batch", [_rec(1), _rec(2)]))
+        while not app._inflight:
+            await asyncio.sleep(0)
+        status, body = await call(app, "POST", "/chart", dict(_rec(1), id="x"))
+        _, batch = await task
+        return status, body, batch
+
+    status, body, batch = asyncio.run(main())
+    assert status == 200 and body["id"] == "x"
+    assert app.coalesced == 1
+    assert {k: v for k, v in body.items() if k != "id"} == {k: v for k, v in batch["results"][0].items() if k != "id"}
+
+
+def test_cached_batch_skips_compute():
+    app = BaziService(workers=1)
+    calls = []
+    compute = app._compute
+
+    async def counting(recs):
+        calls.append(len(recs))
+        return await compute(recs)
+
+    app._compute = counting
+
+    async def main():
+        first = await call(app, "POST", "/batch", [_rec(1), _rec(2)])
+        second = await call(app, "POST", "/batch", [_rec(2), _rec(1)])
+        return first, second
+
+    (_, first), (_, second) = asyncio.run(main())
+    assert calls == [2]
+    assert second["results"] == first["results"][::-1]
+
+
+def test_unexpected_error_returns_500():
+    app = BaziService(workers=1)
+
+    async def boom(body):
+        raise RuntimeError("x")
+
+    app.routes[("GET", "/boom")] = boom
+    status, body = asyncio.run(call(app, "GET", "/boom"))
+    assert status == 500 and "RuntimeError" in body["error"]